@@ -1,8 +1,10 @@
 """Абстракции для расчета статистики."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 from typing import Any
 
+from src.models.log_batch import LogBatch
 from src.models.log_entry import LogEntry
 
 
@@ -17,3 +19,12 @@ class IStatisticsCalculator(ABC):
             Dict[str, Any]: Статистика в соответствии с JSON-схемой ТЗ
 
         """
+
+    @abstractmethod
+    def calculate_batches(self, batches: Iterable[LogBatch]) -> dict[str, Any]:
+        """Рассчитывает статистику по потоку колоночных пакетов.
+
+        Returns:
+            Dict[str, Any]: Статистика в соответствии с JSON-схемой ТЗ
+
+        """
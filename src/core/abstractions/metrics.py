@@ -0,0 +1,87 @@
+"""Абстракции для подключаемых метрик."""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, ClassVar
+
+if TYPE_CHECKING:
+    from src.domain.accumulators.batch_view import BatchView
+    from src.domain.calculators.size_statistics_calculator import (
+        SizeStatisticsCalculator,
+    )
+    from src.domain.services.bot_classifier import BotClassifier
+    from src.domain.services.ip_network_index import IpNetworkIndex
+    from src.domain.services.uri_normalizer import UriNormalizer
+
+
+@dataclass(frozen=True, slots=True)
+class MetricOptions:
+    """Настройки метрик из CLI (None - значение метрики по умолчанию)."""
+
+    size_calculator: "SizeStatisticsCalculator | None" = None
+    time_series_granularity: str | None = None
+    distinct_precision: int | None = None
+    group_by: str | None = None
+    group_aggregates: str | None = None
+    group_limit: int | None = None
+    top_clients_capacity: int | None = None
+    client_prefix: bool = False
+    resource_bytes_capacity: int | None = None
+    timings_capacity: int | None = None
+    session_timeout: int | None = None
+    anomaly_window: int | None = None
+    anomaly_threshold: float | None = None
+    resource_window: int | None = None
+    resource_window_capacity: int | None = None
+    uri_normalizer: "UriNormalizer | None" = None
+    ip_index: "IpNetworkIndex | None" = None
+    bot_classifier: "BotClassifier | None" = None
+
+
+class IMetric(ABC):
+    """Плагин метрики: собственное состояние, слияние и раздел отчета.
+
+    Экземпляр создается на каждый расчет и накапливает состояние по
+    пакетам; части потока объединяются merge().
+    """
+
+    # Имя метрики для --metrics
+    name: ClassVar[str] = "unknown"
+
+    # Колонки LogBatch, которые читает метрика
+    fields: ClassVar[tuple[str, ...]] = ()
+
+    # Ключ состояния в результате DataAccumulator
+    state_key: ClassVar[str] = ""
+
+    @classmethod
+    def create(cls, options: MetricOptions) -> "IMetric":  # noqa: ARG003
+        """Создает метрику с пустым состоянием по настройкам."""
+        return cls()
+
+    @classmethod
+    def required_fields(cls, options: MetricOptions) -> tuple[str, ...]:  # noqa: ARG003
+        """Колонки LogBatch, которые читает метрика с данными настройками."""
+        return cls.fields
+
+    @abstractmethod
+    def add_batch(self, view: "BatchView") -> None:
+        """Добавляет пакет в состояние метрики."""
+
+    @abstractmethod
+    def merge(self, other: "IMetric") -> "IMetric":
+        """Объединяет состояние другой части потока с текущим (на месте)."""
+
+    @property
+    @abstractmethod
+    def state(self) -> object:
+        """Накопленное состояние метрики."""
+
+    @abstractmethod
+    def compose(self, total_requests: int) -> dict[str, Any]:
+        """Компонует раздел(ы) отчета из состояния.
+
+        Returns:
+            Dict[str, Any]: Ключи верхнего уровня JSON-отчета
+
+        """
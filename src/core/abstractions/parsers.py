@@ -2,13 +2,41 @@
 
 from abc import ABC, abstractmethod
 from collections.abc import Iterator
+from itertools import islice
+from typing import TYPE_CHECKING
 
+from src.models.log_batch import LogBatch
 from src.models.log_entry import LogEntry
 
+if TYPE_CHECKING:
+    from src.domain.services.string_interner import StringInterner
+
+
+class MalformedLineError(ValueError):
+    """Строка лога не соответствует ожидаемому формату.
+
+    reason - короткий машиночитаемый код причины для агрегированной статистики.
+    """
+
+    def __init__(self, message: str, reason: str) -> None:
+        super().__init__(message)
+        self.reason = reason
+
 
 class ILogParser(ABC):
     """Базовый интерфейс для всех парсеров логов."""
 
+    default_batch_size = 4096
+
+    # Имя формата для автоопределения и CLI (--log-format)
+    format_name = "unknown"
+
+    # Применимы ли фильтры LineFilterService к сырым строкам формата
+    raw_line_filters = True
+
+    # Словарное кодирование повторяющихся строк (None - выключено)
+    interner: "StringInterner | None" = None
+
     @abstractmethod
     def parse_lines(self, lines: Iterator[str]) -> list[LogEntry]:
         """Парсит итератор строк в список LogEntry."""
@@ -16,3 +44,27 @@ class ILogParser(ABC):
     @abstractmethod
     def parse_line(self, line: str) -> LogEntry:
         """Парсит одну строку лога."""
+
+    @abstractmethod
+    def matches(self, line: str) -> bool:
+        """Дешево проверяет, подходит ли строка под формат парсера."""
+
+    @abstractmethod
+    def parse_batch(self, lines: list[str]) -> LogBatch:
+        """Парсит блок строк в колоночный пакет.
+
+        Не бросает исключений на некорректных строках: они отмечаются нулем
+        в маске LogBatch.valid.
+        """
+
+    def parse_batches(
+        self, lines: Iterator[str], batch_size: int = default_batch_size
+    ) -> Iterator[LogBatch]:
+        """Лениво парсит итератор строк блоками по batch_size строк."""
+        lines = iter(lines)
+        interner = self.interner
+        while chunk := list(islice(lines, batch_size)):
+            batch = self.parse_batch(chunk)
+            if interner is not None:
+                interner.intern_batch(batch)
+            yield batch
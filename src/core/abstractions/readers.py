@@ -23,3 +23,12 @@ class IFileReader(ABC):
             requests.RequestException: Если ошибка загрузки по URL
 
         """
+
+    def read_sources(self, path_pattern: str) -> Iterator[tuple[str, Iterator[str]]]:
+        """Читает источники по отдельности: пары (имя источника, итератор строк).
+
+        По умолчанию весь путь считается одним источником. Реализации,
+        читающие несколько файлов, возвращают каждый файл отдельно, чтобы
+        для него можно было выбрать собственный парсер.
+        """
+        yield path_pattern, self.read_files(path_pattern)
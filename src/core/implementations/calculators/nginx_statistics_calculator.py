@@ -9,13 +9,17 @@
 """
 
 import logging
+from collections.abc import Iterable
+from dataclasses import replace
 from typing import Any
 
 from src.core.abstractions.calculators import IStatisticsCalculator
+from src.core.abstractions.metrics import MetricOptions
 from src.domain.accumulators.data_accumulator import DataAccumulator
 from src.domain.calculators.size_statistics_calculator import SizeStatisticsCalculator
 from src.domain.composers.statistics_composer import StatisticsComposer
 from src.domain.services.request_parser_service import RequestParserService
+from src.models.log_batch import LogBatch
 from src.models.log_entry import LogEntry
 
 logger = logging.getLogger(__name__)
@@ -32,16 +36,31 @@ class NginxStatisticsCalculator(IStatisticsCalculator):
 
     Не знает о:
     - Алгоритмах сбора данных (знает DataAccumulator)
-    - Математике расчетов (знает SizeStatisticsCalculator)
+    - Наборе метрик и их математике (знают MetricRegistry и метрики)
     - Структуре JSON результата (знает StatisticsComposer)
     """
 
-    def __init__(self) -> None:
-        """Инициализация компонентов системы."""
+    def __init__(
+        self,
+        size_calculator: SizeStatisticsCalculator | None = None,
+        options: MetricOptions | None = None,
+        metrics: tuple[str, ...] | None = None,
+    ) -> None:
+        """Инициализация компонентов системы.
+
+        Args:
+            size_calculator: Калькулятор размеров с выбранным методом перцентиля
+            options: Настройки метрик (временной ряд, уникальные, группировка)
+            metrics: Имена метрик из --metrics (None - отчет по ТЗ)
+
+        """
         self.request_parser = RequestParserService()
-        self.size_calculator = SizeStatisticsCalculator()
-        self.data_accumulator = DataAccumulator(self.request_parser)
-        self.statistics_composer = StatisticsComposer(self.size_calculator)
+        self.size_calculator = size_calculator or SizeStatisticsCalculator()
+        options = replace(
+            options or MetricOptions(), size_calculator=self.size_calculator
+        )
+        self.data_accumulator = DataAccumulator(self.request_parser, options, metrics)
+        self.statistics_composer = StatisticsComposer()
 
     def calculate(self, entries: list[LogEntry]) -> dict[str, Any]:
         """Рассчитывает полную статистику по логам NGINX.
@@ -74,13 +93,33 @@ class NginxStatisticsCalculator(IStatisticsCalculator):
 
         logger.info(f"Запуск расчета статистики по {len(entries):,} записям")
 
+        return self.calculate_batches([LogBatch.from_entries(entries)])
+
+    def calculate_batches(self, batches: Iterable[LogBatch]) -> dict[str, Any]:
+        """Рассчитывает полную статистику по потоку колоночных пакетов.
+
+        Пакеты потребляются лениво: парсинг, фильтрация и агрегация идут
+        одним проходом без материализации всех записей в памяти.
+
+        Args:
+            batches: Итерируемый поток пакетов от парсера
+
+        Returns:
+            Dict[str, Any]: Полная статистика согласно JSON-схеме ТЗ
+
+        """
         try:
             # Фаза 1: Сбор данных (однопроходная агрегация)
-            accumulated_data = self.data_accumulator.accumulate(entries)
+            accumulated_data = self.data_accumulator.accumulate_batches(batches)
+            total_requests = accumulated_data["total_requests"]
+
+            if not total_requests:
+                logger.info("Нет данных для расчета статистики")
+                return self._get_empty_stats()
 
             # Фаза 2: Компоновка финальной статистики
             statistics = self.statistics_composer.compose(
-                accumulated_data, len(entries)
+                accumulated_data, total_requests
             )
 
         except Exception:
@@ -88,7 +127,7 @@ class NginxStatisticsCalculator(IStatisticsCalculator):
             # Fail-fast: пробрасываем исключение дальше
             raise
         else:
-            logger.info("Статистика успешно рассчитана")
+            logger.info(f"Статистика успешно рассчитана по {total_requests:,} записям")
             return statistics
 
     def _get_empty_stats(self) -> dict[str, Any]:
@@ -98,14 +137,10 @@ class NginxStatisticsCalculator(IStatisticsCalculator):
             Dict[str, Any]: Статистика с нулевыми значениями согласно JSON-схеме
 
         Notes:
-            Гарантирует согласованность API даже при отсутствии данных
+            Разделы компонуют выбранные метрики с пустым состоянием, поэтому
+            набор ключей совпадает с отчетом по тем же --metrics и флагам
 
         """
-        return {
-            "totalRequestsCount": 0,
-            "responseSizeInBytes": {"average": 0, "max": 0, "p95": 0},
-            "resources": [],
-            "responseCodes": [],
-            "requestsPerDate": [],
-            "uniqueProtocols": [],
-        }
+        return self.statistics_composer.compose(
+            self.data_accumulator.accumulate_batches(()), 0
+        )
@@ -52,8 +52,55 @@ class AdocFormatter(IReportFormatter):
                 self._format_unique_protocols(statistics["uniqueProtocols"])
             )
 
+        # 6-13. Опциональные разделы метрик
+        sections.extend(self._format_metric_sections(statistics))
+
+        # 14. Некорректные строки
+        if statistics.get("malformedLines"):
+            sections.append(self._format_malformed_lines(statistics["malformedLines"]))
+
         return "\n\n".join(sections)
 
+    def _format_metric_sections(self, statistics: dict[str, Any]) -> list[str]:
+        """Форматирует разделы опциональных метрик, которые есть в статистике."""
+        sections = []
+
+        # 6. Уникальные значения
+        if statistics.get("uniqueCounts"):
+            sections.append(self._format_unique_counts(statistics["uniqueCounts"]))
+
+        # 7. Группировка
+        if statistics.get("groupBy"):
+            sections.append(self._format_group_by(statistics["groupBy"]))
+
+        # 8. Топ клиентов
+        if statistics.get("topClients"):
+            sections.append(self._format_top_clients(statistics["topClients"]))
+
+        # 9. Трафик по ресурсам
+        if statistics.get("resourceBytes"):
+            sections.append(self._format_resource_bytes(statistics["resourceBytes"]))
+
+        # 10. Время ответа
+        if statistics.get("timings"):
+            sections.append(self._format_timings(statistics["timings"]))
+
+        # 11. Сессии
+        if statistics.get("sessions"):
+            sections.append(self._format_sessions(statistics["sessions"]))
+
+        # 12. Аномалии
+        if statistics.get("anomalies"):
+            sections.append(self._format_anomalies(statistics["anomalies"]))
+
+        # 13. Топ ресурсов по окнам
+        if statistics.get("windowedResources"):
+            sections.append(
+                self._format_windowed_resources(statistics["windowedResources"])
+            )
+
+        return sections
+
     def _format_general_info(self, stats: dict[str, Any]) -> str:
         """Форматирует раздел общей информации."""
         size_info = stats.get("responseSizeInBytes", {})
@@ -73,6 +120,7 @@ class AdocFormatter(IReportFormatter):
                 f"{self._format_number(size_info.get('max', 0))}b",
             ),
             ("95p размера ответа", f"{self._format_number(size_info.get('p95', 0))}b"),
+            ("Метод 95p", self._format_percentile_method(size_info)),
         ]
 
         return "==== Общая информация\n\n" + self._create_table(
@@ -134,6 +182,296 @@ class AdocFormatter(IReportFormatter):
         protocols_text = ", ".join(f"`{proto}`" for proto in protocols)
         return f"==== Уникальные протоколы\n\n{protocols_text}"
 
+    def _format_unique_counts(self, unique_counts: dict[str, Any]) -> str:
+        """Форматирует оценки числа уникальных значений."""
+        names = {
+            "clients": "Клиенты",
+            "resources": "Ресурсы",
+            "userAgents": "User agent",
+        }
+        table_data = [
+            (
+                names.get(field, field),
+                f"~{self._format_number(item['estimate'])}",
+                f"±{item['relativeStandardError']:.2%}",
+            )
+            for field, item in unique_counts.items()
+        ]
+
+        return "==== Уникальные значения\n\n" + self._create_table(
+            headers=["Поле", "Оценка", "Ошибка"],
+            data=table_data,
+            alignments=["<", ">", ">"],
+        )
+
+    def _format_group_by(self, group_by: dict[str, Any]) -> str:
+        """Форматирует таблицу группировки: измерения и агрегаты."""
+        dimensions = group_by["dimensions"]
+        groups = group_by["groups"]
+        if not groups:
+            return "==== Группировка\n\n*Нет данных*"
+
+        aggregates = [label for label in groups[0] if label != "key"]
+        table_data = [
+            (
+                *(str(group["key"][name]) for name in dimensions),
+                *(self._format_number(group[label]) for label in aggregates),
+            )
+            for group in groups
+        ]
+
+        return "==== Группировка\n\n" + self._create_table(
+            headers=[*dimensions, *aggregates],
+            data=table_data,
+            alignments=["<"] * len(dimensions) + [">"] * len(aggregates),
+        )
+
+    def _format_top_clients(self, top_clients: dict[str, Any]) -> str:
+        """Форматирует топ клиентов по запросам и по байтам с ошибкой оценки."""
+        title = "==== Топ клиентов"
+        if top_clients["prefix"]:
+            title += f" (подсети {top_clients['prefix']})"
+        if not top_clients["byRequests"]:
+            return f"{title}\n\n*Нет данных*"
+
+        tables = []
+        for key, value, caption in (
+            ("byRequests", "totalRequestsCount", "По числу запросов"),
+            ("byBytes", "totalBytes", "По объему ответов (байт)"),
+        ):
+            table_data = [
+                (
+                    f"`{item['client']}`",
+                    self._format_number(item[value]),
+                    f"±{self._format_number(item['error'])}",
+                )
+                for item in top_clients[key]
+            ]
+            tables.append(
+                f"{caption}:\n\n"
+                + self._create_table(
+                    headers=["Клиент", "Значение", "Ошибка"],
+                    data=table_data,
+                    alignments=["<", ">", ">"],
+                )
+            )
+
+        return f"{title}\n\n" + "\n\n".join(tables)
+
+    def _format_resource_bytes(self, resource_bytes: dict[str, Any]) -> str:
+        """Форматирует топ ресурсов по объему ответов."""
+        title = "==== Трафик по ресурсам"
+        if not resource_bytes["resources"]:
+            return f"{title}\n\n*Нет данных*"
+
+        table_data = [
+            (
+                f"`{item['resource']}`",
+                self._format_number(item["totalBytes"]),
+                f"±{self._format_number(item['error'])}",
+                self._format_number(item["totalRequestsCount"]),
+                f"{self._format_number(item['averageBytes'])}b",
+                f"{self._format_number(item['p95Bytes'])}b",
+            )
+            for item in resource_bytes["resources"]
+        ]
+
+        total = self._format_number(resource_bytes["totalBytes"])
+        return f"{title}\n\nВсего отправлено байт: {total}\n\n" + self._create_table(
+            headers=["Ресурс", "Байт", "Ошибка", "Запросы", "Средний", "95p"],
+            data=table_data,
+            alignments=["<"] + [">"] * 5,
+        )
+
+    def _format_timings(self, timings: dict[str, Any]) -> str:
+        """Форматирует перцентили времени ответа, общие и по ресурсам."""
+        title = "==== Время ответа"
+        percentiles = ["p50", "p90", "p99", "p99.9"]
+        if not timings["requestTime"]["count"]:
+            return f"{title}\n\n*Нет данных*"
+
+        unit = timings["unit"]
+        table_data = [
+            (
+                caption,
+                self._format_number(summary["count"]),
+                f"{self._format_number(summary['mean'])}{unit}",
+                *(f"{self._format_number(summary[key])}{unit}" for key in percentiles),
+                f"{self._format_number(summary['max'])}{unit}",
+            )
+            for caption, summary in (
+                ("request_time", timings["requestTime"]),
+                ("upstream_response_time", timings["upstreamResponseTime"]),
+            )
+            if summary["count"]
+        ]
+        sections = [
+            self._create_table(
+                headers=["Метрика", "Запросы", "Среднее", *percentiles, "Максимум"],
+                data=table_data,
+                alignments=["<"] + [">"] * 7,
+            )
+        ]
+
+        resource_data = [
+            (
+                f"`{item['resource']}`",
+                self._format_number(item["totalRequestsCount"]),
+                f"±{self._format_number(item['error'])}",
+                *(f"{self._format_number(item[key])}{unit}" for key in percentiles),
+            )
+            for item in timings["resources"]
+        ]
+        if resource_data:
+            sections.append(
+                "request_time по ресурсам:\n\n"
+                + self._create_table(
+                    headers=["Ресурс", "Запросы", "Ошибка", *percentiles],
+                    data=resource_data,
+                    alignments=["<"] + [">"] * 6,
+                )
+            )
+
+        return f"{title}\n\n" + "\n\n".join(sections)
+
+    def _format_sessions(self, sessions: dict[str, Any]) -> str:
+        """Форматирует статистику сессий и их число по дням."""
+        title = "==== Сессии"
+        if not sessions["totalSessions"]:
+            return f"{title}\n\n*Нет данных*"
+
+        timeout = round(sessions["idleTimeoutSeconds"] / 60, 2)
+        header = (
+            f"Таймаут неактивности: {timeout:g} мин, "
+            f"всего сессий: {self._format_number(sessions['totalSessions'])}, "
+            f"максимум активных: {self._format_number(sessions['peakActiveSessions'])}"
+        )
+        if sessions["lateRequests"]:
+            late = self._format_number(sessions["lateRequests"])
+            header += f", запросов вне порядка времени: {late}"
+        stats_data = [
+            (
+                caption,
+                *(
+                    self._format_number(stats[key])
+                    for key in ("mean", "p50", "p90", "p99", "max")
+                ),
+            )
+            for caption, stats in (
+                ("Длительность, с", sessions["durationSeconds"]),
+                ("Запросов на сессию", sessions["requestsPerSession"]),
+            )
+        ]
+        date_data = [
+            (item["date"], self._format_number(item["totalSessions"]))
+            for item in sessions["sessionsPerDate"]
+        ]
+
+        return f"{title}\n\n{header}\n\n" + "\n\n".join(
+            (
+                self._create_table(
+                    headers=["Метрика", "Среднее", "p50", "p90", "p99", "Максимум"],
+                    data=stats_data,
+                    alignments=["<"] + [">"] * 5,
+                ),
+                self._create_table(
+                    headers=["Дата", "Сессии"],
+                    data=date_data,
+                    alignments=["<", ">"],
+                ),
+            )
+        )
+
+    def _format_anomalies(self, anomalies: dict[str, Any]) -> str:
+        """Форматирует интервалы аномального числа запросов и доли 5xx."""
+        title = "==== Аномалии"
+        header = (
+            f"Окно базы: {anomalies['window']} мин, "
+            f"порог z-оценки: {anomalies['threshold']:g}"
+        )
+        if anomalies["lateRequests"]:
+            late = self._format_number(anomalies["lateRequests"])
+            header += f", запросов вне порядка времени: {late}"
+        if not anomalies["intervals"]:
+            return f"{title}\n\n{header}\n\n*Нет аномалий*"
+
+        series_names = {"requests": "Запросы в минуту", "errorRate": "Доля 5xx"}
+        directions = {"high": "рост", "low": "спад"}
+        table_data = [
+            (
+                series_names[item["series"]],
+                directions[item["direction"]],
+                item["start"],
+                item["end"],
+                self._format_number(item["minutes"]),
+                self._format_anomaly_value(item["series"], item["peakValue"]),
+                self._format_anomaly_value(item["series"], item["baseline"]),
+                f"{item['maxZScore']:g}",
+            )
+            for item in anomalies["intervals"]
+        ]
+
+        return f"{title}\n\n{header}\n\n" + self._create_table(
+            headers=[
+                "Ряд",
+                "Направление",
+                "Начало",
+                "Конец",
+                "Минут",
+                "Пик",
+                "База",
+                "z-оценка",
+            ],
+            data=table_data,
+            alignments=["<"] * 4 + [">"] * 4,
+        )
+
+    def _format_windowed_resources(self, windowed: dict[str, Any]) -> str:
+        """Форматирует топ ресурсов в каждом окне времени."""
+        title = "==== Топ ресурсов по окнам"
+        header = f"Окно: {windowed['windowMinutes']} мин"
+        if windowed["lateRequests"]:
+            late = self._format_number(windowed["lateRequests"])
+            header += f", запросов вне порядка времени: {late}"
+        if not windowed["windows"]:
+            return f"{title}\n\n{header}\n\n*Нет данных*"
+
+        table_data = [
+            (
+                window["start"] if index == 0 else "",
+                self._format_number(window["totalRequestsCount"]) if index == 0 else "",
+                f"`{item['resource']}`",
+                self._format_number(item["totalRequestsCount"]),
+                f"±{self._format_number(item['error'])}",
+            )
+            for window in windowed["windows"]
+            for index, item in enumerate(window["resources"])
+        ]
+
+        return f"{title}\n\n{header}\n\n" + self._create_table(
+            headers=["Начало окна", "Запросов в окне", "Ресурс", "Запросы", "Ошибка"],
+            data=table_data,
+            alignments=["<", ">", "<", ">", ">"],
+        )
+
+    def _format_anomaly_value(self, series: str, value: float) -> str:
+        """Доля 5xx - в процентах, число запросов - как есть."""
+        if series == "errorRate":
+            return f"{value:.2%}"
+        return self._format_number(round(value, 1))
+
+    def _format_malformed_lines(self, malformed: dict[str, Any]) -> str:
+        """Форматирует сводку по некорректным строкам."""
+        table_data = [
+            (item["reason"], self._format_number(item["totalLinesCount"]))
+            for item in malformed["reasons"]
+        ]
+        table_data.append(("Всего", self._format_number(malformed["totalLinesCount"])))
+
+        return "==== Некорректные строки\n\n" + self._create_table(
+            headers=["Причина", "Количество"], data=table_data, alignments=["<", ">"]
+        )
+
     def _create_table(
         self, headers: list[str], data: list[tuple], alignments: list[str]
     ) -> str:
@@ -220,6 +558,18 @@ class AdocFormatter(IReportFormatter):
 
         return "|" + line
 
+    def _format_percentile_method(self, size_info: dict[str, Any]) -> str:
+        """Форматирует метод расчета 95p и границу его ошибки."""
+        estimate = size_info.get("p95Estimate")
+        if not estimate:
+            return "точный"
+        if estimate["method"] == "sketch":
+            return f"скетч, ±{estimate['relativeError']:.2%} значения"
+        return (
+            f"выборка {self._format_number(estimate['sampleSize'])}, "
+            f"±{estimate['rankError']:.2%} ранга"
+        )
+
     def _format_number(self, number: int) -> str:
         """Форматирует число с разделителями тысяч."""
         return f"{number:,}".replace(",", "_")
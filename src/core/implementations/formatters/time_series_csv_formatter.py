@@ -0,0 +1,65 @@
+import csv
+import io
+from typing import Any
+
+from src.core.abstractions.formatters import IReportFormatter
+from src.domain.accumulators.time_series_accumulator import TimeSeriesAccumulator
+
+
+class TimeSeriesCsvFormatter(IReportFormatter):
+    """Форматирует временной ряд статистики в CSV.
+
+    Ответственность:
+    - Преобразование раздела timeSeries в таблицу: одна строка на корзину
+    - Плоские колонки классов статусов для загрузки в таблицы и БД
+
+    Не знает о:
+    - Остальных разделах статистики
+    - Логике расчета временного ряда
+    """
+
+    columns = (
+        "start",
+        "totalRequestsCount",
+        "totalBytes",
+        *TimeSeriesAccumulator.status_classes,
+    )
+
+    def format(self, statistics: dict[str, Any]) -> str:
+        """Форматирует корзины временного ряда в CSV с заголовком.
+
+        Args:
+            statistics: Статистика с разделом timeSeries
+
+        Returns:
+            str: CSV-таблица (только заголовок, если ряда нет)
+
+        """
+        output = io.StringIO()
+        writer = csv.writer(output, lineterminator="\n")
+        writer.writerow(self.columns)
+
+        time_series = statistics.get("timeSeries") or {}
+        for bucket in time_series.get("buckets", []):
+            writer.writerow(
+                [
+                    bucket["start"],
+                    bucket["totalRequestsCount"],
+                    bucket["totalBytes"],
+                    *(
+                        bucket["statusClasses"][status_class]
+                        for status_class in TimeSeriesAccumulator.status_classes
+                    ),
+                ]
+            )
+
+        return output.getvalue()
+
+    def get_file_extension(self) -> str:
+        """Возвращает расширение для CSV файлов.
+
+        Returns:
+            str: Расширение '.csv'
+
+        """
+        return ".csv"
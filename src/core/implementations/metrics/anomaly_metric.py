@@ -0,0 +1,44 @@
+from typing import Any
+
+from src.core.abstractions.metrics import IMetric, MetricOptions
+from src.domain.accumulators.anomaly_accumulator import AnomalyAccumulator
+from src.domain.accumulators.batch_view import BatchView
+
+
+class AnomalyMetric(IMetric):
+    """Интервалы аномального поминутного числа запросов и доли 5xx."""
+
+    name = "anomalies"
+    fields = ("time_local", "status")
+    state_key = "anomalies"
+
+    def __init__(self, anomalies: AnomalyAccumulator) -> None:
+        self.anomalies = anomalies
+
+    @classmethod
+    def create(cls, options: MetricOptions) -> "AnomalyMetric":
+        """Создает метрику с окном --anomaly-window и порогом --anomaly-threshold."""
+        return cls(
+            AnomalyAccumulator(
+                options.anomaly_window or AnomalyAccumulator.default_window,
+                options.anomaly_threshold or AnomalyAccumulator.default_threshold,
+            )
+        )
+
+    def add_batch(self, view: BatchView) -> None:
+        """Добавляет минуты пакета в детекторы."""
+        self.anomalies.add_batch(view)
+
+    def merge(self, other: "AnomalyMetric") -> "AnomalyMetric":
+        """Объединяет интервалы следующей по времени части потока."""
+        self.anomalies.merge(other.anomalies)
+        return self
+
+    @property
+    def state(self) -> AnomalyAccumulator:
+        """Базы детекторов, открытые минуты и найденные интервалы."""
+        return self.anomalies
+
+    def compose(self, total_requests: int) -> dict[str, Any]:  # noqa: ARG002
+        """Компонует интервалы, закрывая еще открытые минуты."""
+        return {"anomalies": self.anomalies.summary()}
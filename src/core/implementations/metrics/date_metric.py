@@ -0,0 +1,54 @@
+from collections import Counter
+from datetime import date
+from typing import Any
+
+from src.core.abstractions.metrics import IMetric
+from src.domain.accumulators.batch_view import BatchView
+
+
+class DateMetric(IMetric):
+    """Распределение запросов по датам.
+
+    Даты считаются по целому порядковому номеру дня (date.toordinal)
+    без построения строк - они формируются один раз на день в compose().
+    """
+
+    name = "dates"
+    fields = ("time_local",)
+    state_key = "date_distribution"
+
+    def __init__(self) -> None:
+        self.date_counter: Counter[int] = Counter()
+
+    def add_batch(self, view: BatchView) -> None:
+        """Добавляет колонку времени пакета."""
+        self.date_counter.update(map(date.toordinal, view.batch.time_local))
+
+    def merge(self, other: "DateMetric") -> "DateMetric":
+        """Объединяет распределение другой части потока с текущим."""
+        self.date_counter.update(other.date_counter)
+        return self
+
+    @property
+    def state(self) -> Counter[int]:
+        """Частоты порядковых номеров дней."""
+        return self.date_counter
+
+    def compose(self, total_requests: int) -> dict[str, Any]:
+        """Компонует распределение запросов по датам."""
+        result = []
+        for ordinal, count in sorted(self.date_counter.items()):
+            date_obj = date.fromordinal(ordinal)
+
+            result.append(
+                {
+                    "date": date_obj.isoformat(),  # ISO8601 формат
+                    "weekday": date_obj.strftime("%A"),  # Локализованное имя дня недели
+                    "totalRequestsCount": count,
+                    "totalRequestsPercentage": round(
+                        (count / total_requests) * 100, 2
+                    ),  # Точность 2 знака
+                }
+            )
+
+        return {"requestsPerDate": result}
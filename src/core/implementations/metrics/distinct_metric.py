@@ -0,0 +1,40 @@
+from typing import Any
+
+from src.core.abstractions.metrics import IMetric, MetricOptions
+from src.domain.accumulators.batch_view import BatchView
+from src.domain.accumulators.distinct_accumulator import DistinctAccumulator
+from src.domain.calculators.hyperloglog import HyperLogLog
+
+
+class DistinctMetric(IMetric):
+    """Оценки числа уникальных клиентов, ресурсов и user agent."""
+
+    name = "distinct"
+    fields = ("remote_addr", "request", "http_user_agent")
+    state_key = "distinct"
+
+    def __init__(self, precision: int = HyperLogLog.default_precision) -> None:
+        self.distinct = DistinctAccumulator(precision)
+
+    @classmethod
+    def create(cls, options: MetricOptions) -> "DistinctMetric":
+        """Создает метрику с точностью из --distinct-precision."""
+        return cls(options.distinct_precision or HyperLogLog.default_precision)
+
+    def add_batch(self, view: BatchView) -> None:
+        """Ресурсы берутся из общей производной колонки пакета."""
+        self.distinct.add_batch(view.batch, view.resources)
+
+    def merge(self, other: "DistinctMetric") -> "DistinctMetric":
+        """Объединяет счетчики другой части потока с текущими."""
+        self.distinct.merge(other.distinct)
+        return self
+
+    @property
+    def state(self) -> DistinctAccumulator:
+        """Счетчики HyperLogLog по полям."""
+        return self.distinct
+
+    def compose(self, total_requests: int) -> dict[str, Any]:  # noqa: ARG002
+        """Компонует оценки с относительной стандартной ошибкой."""
+        return {"uniqueCounts": self.distinct.summary()}
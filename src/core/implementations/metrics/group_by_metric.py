@@ -0,0 +1,66 @@
+from typing import Any
+
+from src.core.abstractions.metrics import IMetric, MetricOptions
+from src.domain.accumulators.batch_view import BatchView
+from src.domain.accumulators.group_by_accumulator import GroupByAccumulator
+
+
+class GroupByMetric(IMetric):
+    """Группировка по измерениям --group-by с агрегатами --aggregate."""
+
+    name = "group-by"
+    state_key = "group_by"
+
+    def __init__(self, group_by: GroupByAccumulator) -> None:
+        self.group_by = group_by
+
+    @classmethod
+    def create(cls, options: MetricOptions) -> "GroupByMetric":
+        """Создает метрику по измерениям, агрегатам и лимиту групп."""
+        return cls(cls._accumulator(options))
+
+    @classmethod
+    def required_fields(cls, options: MetricOptions) -> tuple[str, ...]:
+        """Колонки зависят от выбранных измерений и агрегатов."""
+        return tuple(cls._accumulator(options).source_fields)
+
+    def add_batch(self, view: BatchView) -> None:
+        """Добавляет пакет в таблицу групп."""
+        self.group_by.add_batch(view)
+
+    def merge(self, other: "GroupByMetric") -> "GroupByMetric":
+        """Объединяет группы другой части потока с текущими."""
+        self.group_by.merge(other.group_by)
+        return self
+
+    @property
+    def state(self) -> GroupByAccumulator:
+        """Таблица групп."""
+        return self.group_by
+
+    def compose(self, total_requests: int) -> dict[str, Any]:  # noqa: ARG002
+        """Компонует таблицу групп."""
+        return {
+            "groupBy": {
+                "dimensions": list(self.group_by.dimensions),
+                "maxGroups": self.group_by.max_groups,
+                "groups": self.group_by.rows(),
+            }
+        }
+
+    @staticmethod
+    def _accumulator(options: MetricOptions) -> GroupByAccumulator:
+        """Создает пустую таблицу групп по настройкам."""
+        if not options.group_by:
+            msg = "Метрика group-by требует --group-by"
+            raise ValueError(msg)
+
+        dimensions = GroupByAccumulator.parse_dimensions(options.group_by)
+        if options.ip_index is None:
+            GroupByAccumulator.require_network_index(dimensions)
+
+        return GroupByAccumulator(
+            dimensions,
+            GroupByAccumulator.parse_aggregates(options.group_aggregates),
+            options.group_limit or GroupByAccumulator.default_max_groups,
+        )
@@ -0,0 +1,35 @@
+from typing import Any
+
+from src.core.abstractions.metrics import IMetric
+from src.domain.accumulators.batch_view import BatchView
+
+
+class ProtocolMetric(IMetric):
+    """Список уникальных протоколов."""
+
+    name = "protocols"
+    fields = ("request",)
+    state_key = "unique_protocols"
+
+    def __init__(self) -> None:
+        self.protocol_set: set[str] = set()
+
+    def add_batch(self, view: BatchView) -> None:
+        """Протокол извлекается один раз на уникальную строку запроса."""
+        self.protocol_set.update(
+            map(view.request_parser.extract_protocol, view.request_counts)
+        )
+
+    def merge(self, other: "ProtocolMetric") -> "ProtocolMetric":
+        """Объединяет протоколы другой части потока с текущими."""
+        self.protocol_set |= other.protocol_set
+        return self
+
+    @property
+    def state(self) -> set[str]:
+        """Множество протоколов."""
+        return self.protocol_set
+
+    def compose(self, total_requests: int) -> dict[str, Any]:  # noqa: ARG002
+        """Компонует список уникальных протоколов."""
+        return {"uniqueProtocols": sorted(self.protocol_set)}
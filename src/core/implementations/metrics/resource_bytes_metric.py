@@ -0,0 +1,52 @@
+from typing import Any
+
+from src.core.abstractions.metrics import IMetric, MetricOptions
+from src.domain.accumulators.batch_view import BatchView
+from src.domain.accumulators.resource_bytes_accumulator import ResourceBytesAccumulator
+
+
+class ResourceBytesMetric(IMetric):
+    """Топ-10 ресурсов по объему ответов со средним и 95p размера."""
+
+    name = "resource-bytes"
+    fields = ("request", "body_bytes_sent")
+    state_key = "resource_bytes"
+
+    top_size = 10
+
+    def __init__(self, resource_bytes: ResourceBytesAccumulator) -> None:
+        self.resource_bytes = resource_bytes
+
+    @classmethod
+    def create(cls, options: MetricOptions) -> "ResourceBytesMetric":
+        """Создает метрику с размером сводки --resource-bytes-capacity."""
+        return cls(
+            ResourceBytesAccumulator(
+                options.resource_bytes_capacity
+                or ResourceBytesAccumulator.default_capacity
+            )
+        )
+
+    def add_batch(self, view: BatchView) -> None:
+        """Ресурсы берутся из общей производной колонки пакета."""
+        self.resource_bytes.add_batch(view)
+
+    def merge(self, other: "ResourceBytesMetric") -> "ResourceBytesMetric":
+        """Объединяет сводки другой части потока с текущими."""
+        self.resource_bytes.merge(other.resource_bytes)
+        return self
+
+    @property
+    def state(self) -> ResourceBytesAccumulator:
+        """Сводка байт и состояния ресурсов."""
+        return self.resource_bytes
+
+    def compose(self, total_requests: int) -> dict[str, Any]:  # noqa: ARG002
+        """Компонует общий объем и топ ресурсов по байтам."""
+        return {
+            "resourceBytes": {
+                "totalBytes": self.resource_bytes.bytes.total,
+                "capacity": self.resource_bytes.capacity,
+                "resources": self.resource_bytes.top(self.top_size),
+            }
+        }
@@ -0,0 +1,45 @@
+from collections import Counter
+from typing import Any
+
+from src.core.abstractions.metrics import IMetric
+from src.domain.accumulators.batch_view import BatchView
+
+
+class ResourceMetric(IMetric):
+    """Топ-10 запрашиваемых ресурсов."""
+
+    name = "resources"
+    fields = ("request",)
+    state_key = "resource_frequency"
+
+    top_size = 10
+
+    def __init__(self) -> None:
+        self.resource_counter: Counter[str] = Counter()
+
+    def add_batch(self, view: BatchView) -> None:
+        """Каждая уникальная строка запроса разбирается один раз на пакет."""
+        counter = self.resource_counter
+        for resource, count in zip(
+            view.resources, view.request_counts.values(), strict=True
+        ):
+            counter[resource] += count
+
+    def merge(self, other: "ResourceMetric") -> "ResourceMetric":
+        """Объединяет частоты ресурсов другой части потока с текущими."""
+        self.resource_counter.update(other.resource_counter)
+        return self
+
+    @property
+    def state(self) -> Counter[str]:
+        """Частоты ресурсов."""
+        return self.resource_counter
+
+    def compose(self, total_requests: int) -> dict[str, Any]:  # noqa: ARG002
+        """Компонует топ-10 ресурсов."""
+        return {
+            "resources": [
+                {"resource": resource, "totalRequestsCount": count}
+                for resource, count in self.resource_counter.most_common(self.top_size)
+            ]
+        }
@@ -0,0 +1,43 @@
+from typing import Any
+
+from src.core.abstractions.metrics import IMetric, MetricOptions
+from src.domain.accumulators.batch_view import BatchView
+from src.domain.accumulators.session_accumulator import SessionAccumulator
+
+
+class SessionMetric(IMetric):
+    """Сессии клиентов: число по дням, длительность и запросы на сессию."""
+
+    name = "sessions"
+    fields = ("remote_addr", "http_user_agent", "time_local")
+    state_key = "sessions"
+
+    def __init__(self, sessions: SessionAccumulator) -> None:
+        self.sessions = sessions
+
+    @classmethod
+    def create(cls, options: MetricOptions) -> "SessionMetric":
+        """Создает метрику с таймаутом неактивности --session-timeout."""
+        return cls(
+            SessionAccumulator(
+                options.session_timeout or SessionAccumulator.default_timeout
+            )
+        )
+
+    def add_batch(self, view: BatchView) -> None:
+        """Продлевает сессии строками пакета."""
+        self.sessions.add_batch(view)
+
+    def merge(self, other: "SessionMetric") -> "SessionMetric":
+        """Объединяет сессии следующей по времени части потока."""
+        self.sessions.merge(other.sessions)
+        return self
+
+    @property
+    def state(self) -> SessionAccumulator:
+        """Таблица активных сессий и статистика закрытых."""
+        return self.sessions
+
+    def compose(self, total_requests: int) -> dict[str, Any]:  # noqa: ARG002
+        """Компонует статистику сессий, считая активные в конце закрытыми."""
+        return {"sessions": self.sessions.summary()}
@@ -0,0 +1,42 @@
+from typing import Any
+
+from src.core.abstractions.metrics import IMetric, MetricOptions
+from src.domain.accumulators.batch_view import BatchView
+from src.domain.accumulators.size_accumulator import SizeAccumulator
+from src.domain.calculators.size_statistics_calculator import SizeStatisticsCalculator
+
+
+class SizeMetric(IMetric):
+    """Статистика размеров ответов: среднее, максимум и 95p."""
+
+    name = "sizes"
+    fields = ("body_bytes_sent",)
+    state_key = "response_sizes"
+
+    def __init__(self, size_calculator: SizeStatisticsCalculator | None = None) -> None:
+        self.size_calculator = size_calculator or SizeStatisticsCalculator()
+        # Размеры собираются так, как нужно выбранному методу перцентиля
+        self.sizes = self.size_calculator.create_accumulator()
+
+    @classmethod
+    def create(cls, options: MetricOptions) -> "SizeMetric":
+        """Создает метрику с калькулятором выбранного метода перцентиля."""
+        return cls(options.size_calculator)
+
+    def add_batch(self, view: BatchView) -> None:
+        """Добавляет колонку размеров пакета."""
+        self.sizes.extend(view.batch.body_bytes_sent)
+
+    def merge(self, other: "SizeMetric") -> "SizeMetric":
+        """Объединяет размеры другой части потока с текущими."""
+        self.sizes.merge(other.sizes)
+        return self
+
+    @property
+    def state(self) -> SizeAccumulator:
+        """Аккумулятор размеров."""
+        return self.sizes
+
+    def compose(self, total_requests: int) -> dict[str, Any]:  # noqa: ARG002
+        """Компонует статистику размеров ответов."""
+        return {"responseSizeInBytes": self.size_calculator.calculate(self.sizes)}
@@ -0,0 +1,39 @@
+from collections import Counter
+from typing import Any
+
+from src.core.abstractions.metrics import IMetric
+from src.domain.accumulators.batch_view import BatchView
+
+
+class StatusMetric(IMetric):
+    """Распределение HTTP-кодов ответов."""
+
+    name = "codes"
+    fields = ("status",)
+    state_key = "status_frequency"
+
+    def __init__(self) -> None:
+        self.status_counter: Counter[int] = Counter()
+
+    def add_batch(self, view: BatchView) -> None:
+        """Добавляет колонку статусов пакета."""
+        self.status_counter.update(view.batch.status)
+
+    def merge(self, other: "StatusMetric") -> "StatusMetric":
+        """Объединяет частоты статусов другой части потока с текущими."""
+        self.status_counter.update(other.status_counter)
+        return self
+
+    @property
+    def state(self) -> Counter[int]:
+        """Частоты статусов."""
+        return self.status_counter
+
+    def compose(self, total_requests: int) -> dict[str, Any]:  # noqa: ARG002
+        """Компонует статистику HTTP-кодов ответов."""
+        return {
+            "responseCodes": [
+                {"code": code, "totalResponsesCount": count}
+                for code, count in sorted(self.status_counter.items())
+            ]
+        }
@@ -0,0 +1,49 @@
+from typing import Any
+
+from src.core.abstractions.metrics import IMetric, MetricOptions
+from src.domain.accumulators.batch_view import BatchView
+from src.domain.accumulators.time_series_accumulator import TimeSeriesAccumulator
+
+
+class TimeSeriesMetric(IMetric):
+    """Временной ряд запросов, байт и классов статусов по корзинам."""
+
+    name = "time-series"
+    fields = ("time_local", "status", "body_bytes_sent")
+    state_key = "time_series"
+
+    def __init__(
+        self, granularity: str = TimeSeriesAccumulator.default_granularity
+    ) -> None:
+        self.time_series = TimeSeriesAccumulator(granularity)
+
+    @classmethod
+    def create(cls, options: MetricOptions) -> "TimeSeriesMetric":
+        """Создает метрику с гранулярностью из --time-series."""
+        return cls(
+            options.time_series_granularity or TimeSeriesAccumulator.default_granularity
+        )
+
+    def add_batch(self, view: BatchView) -> None:
+        """Добавляет пакет в корзины."""
+        self.time_series.add_batch(view.batch)
+
+    def merge(self, other: "TimeSeriesMetric") -> "TimeSeriesMetric":
+        """Объединяет ряд другой части потока с текущим."""
+        self.time_series.merge(other.time_series)
+        return self
+
+    @property
+    def state(self) -> TimeSeriesAccumulator:
+        """Аккумулятор временного ряда."""
+        return self.time_series
+
+    def compose(self, total_requests: int) -> dict[str, Any]:  # noqa: ARG002
+        """Компонует временной ряд по корзинам."""
+        return {
+            "timeSeries": {
+                "granularity": self.time_series.granularity,
+                "bucketSeconds": self.time_series.bucket_seconds,
+                "buckets": self.time_series.buckets(),
+            }
+        }
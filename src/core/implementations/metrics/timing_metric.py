@@ -0,0 +1,55 @@
+from typing import Any
+
+from src.core.abstractions.metrics import IMetric, MetricOptions
+from src.domain.accumulators.batch_view import BatchView
+from src.domain.accumulators.timing_accumulator import TimingAccumulator
+
+
+class TimingMetric(IMetric):
+    """Перцентили времени ответа: общие и для топ-10 ресурсов."""
+
+    name = "timings"
+    fields = ("request", "request_time", "upstream_response_time")
+    state_key = "timings"
+
+    top_size = 10
+
+    def __init__(self, timings: TimingAccumulator) -> None:
+        self.timings = timings
+
+    @classmethod
+    def create(cls, options: MetricOptions) -> "TimingMetric":
+        """Создает метрику с размером сводки --timings-capacity."""
+        return cls(
+            TimingAccumulator(
+                options.timings_capacity or TimingAccumulator.default_capacity
+            )
+        )
+
+    def add_batch(self, view: BatchView) -> None:
+        """Ресурсы берутся из общей производной колонки пакета."""
+        self.timings.add_batch(view)
+
+    def merge(self, other: "TimingMetric") -> "TimingMetric":
+        """Объединяет гистограммы другой части потока с текущими."""
+        self.timings.merge(other.timings)
+        return self
+
+    @property
+    def state(self) -> TimingAccumulator:
+        """Гистограммы времени ответа."""
+        return self.timings
+
+    def compose(self, total_requests: int) -> dict[str, Any]:  # noqa: ARG002
+        """Компонует перцентили в миллисекундах."""
+        return {
+            "timings": {
+                "unit": "ms",
+                "requestTime": self.timings.summary(self.timings.request_time),
+                "upstreamResponseTime": self.timings.summary(
+                    self.timings.upstream_response_time
+                ),
+                "capacity": self.timings.capacity,
+                "resources": self.timings.top(self.top_size),
+            }
+        }
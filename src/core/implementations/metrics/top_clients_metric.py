@@ -0,0 +1,58 @@
+from typing import Any
+
+from src.core.abstractions.metrics import IMetric, MetricOptions
+from src.domain.accumulators.batch_view import BatchView
+from src.domain.accumulators.top_clients_accumulator import TopClientsAccumulator
+
+
+class TopClientsMetric(IMetric):
+    """Топ-10 клиентов (адресов или подсетей) по запросам и по байтам."""
+
+    name = "top-clients"
+    fields = ("remote_addr", "body_bytes_sent")
+    state_key = "top_clients"
+
+    top_size = 10
+
+    def __init__(self, top_clients: TopClientsAccumulator) -> None:
+        self.top_clients = top_clients
+
+    @classmethod
+    def create(cls, options: MetricOptions) -> "TopClientsMetric":
+        """Создает метрику с размером сводки --top-clients-capacity."""
+        return cls(
+            TopClientsAccumulator(
+                options.top_clients_capacity or TopClientsAccumulator.default_capacity,
+                rollup=options.client_prefix,
+            )
+        )
+
+    def add_batch(self, view: BatchView) -> None:
+        """Добавляет адреса и размеры ответов пакета."""
+        self.top_clients.add_batch(view.batch)
+
+    def merge(self, other: "TopClientsMetric") -> "TopClientsMetric":
+        """Объединяет сводки другой части потока с текущими."""
+        self.top_clients.merge(other.top_clients)
+        return self
+
+    @property
+    def state(self) -> TopClientsAccumulator:
+        """Сводки по запросам и по байтам."""
+        return self.top_clients
+
+    def compose(self, total_requests: int) -> dict[str, Any]:  # noqa: ARG002
+        """Компонует топ клиентов с максимальной ошибкой оценок."""
+        return {
+            "topClients": {
+                "prefix": (
+                    f"/{TopClientsAccumulator.ipv4_prefix},"
+                    f"/{TopClientsAccumulator.ipv6_prefix}"
+                    if self.top_clients.rollup
+                    else None
+                ),
+                "capacity": self.top_clients.capacity,
+                "invalidAddresses": self.top_clients.invalid,
+                **self.top_clients.top(self.top_size),
+            }
+        }
@@ -0,0 +1,55 @@
+from typing import Any
+
+from src.core.abstractions.metrics import IMetric, MetricOptions
+from src.domain.accumulators.batch_view import BatchView
+from src.domain.accumulators.windowed_top_accumulator import WindowedTopAccumulator
+
+
+class WindowedResourceMetric(IMetric):
+    """Топ-10 ресурсов по числу запросов в каждом окне времени."""
+
+    name = "windowed-resources"
+    fields = ("request", "time_local")
+    state_key = "windowed_resources"
+
+    top_size = 10
+
+    def __init__(self, windows: WindowedTopAccumulator) -> None:
+        self.windows = windows
+
+    @classmethod
+    def create(cls, options: MetricOptions) -> "WindowedResourceMetric":
+        """Создает метрику с окном --resource-window и сводкой окна."""
+        return cls(
+            WindowedTopAccumulator(
+                options.resource_window or WindowedTopAccumulator.default_window,
+                options.resource_window_capacity
+                or WindowedTopAccumulator.default_capacity,
+                cls.top_size,
+            )
+        )
+
+    def add_batch(self, view: BatchView) -> None:
+        """Ресурсы берутся из общей производной колонки пакета."""
+        self.windows.add_batch(view)
+
+    def merge(self, other: "WindowedResourceMetric") -> "WindowedResourceMetric":
+        """Объединяет окна другой части потока с текущими."""
+        self.windows.merge(other.windows)
+        return self
+
+    @property
+    def state(self) -> WindowedTopAccumulator:
+        """Сводки открытых и закрытых окон."""
+        return self.windows
+
+    def compose(self, total_requests: int) -> dict[str, Any]:  # noqa: ARG002
+        """Компонует топ ресурсов по окнам, включая еще открытые."""
+        return {
+            "windowedResources": {
+                "windowMinutes": self.windows.window // 60,
+                "capacity": self.windows.capacity,
+                "lateRequests": self.windows.late_requests,
+                "windows": self.windows.summary(),
+            }
+        }
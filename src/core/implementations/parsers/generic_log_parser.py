@@ -0,0 +1,43 @@
+"""Реализация нестрогого парсера для логов в стиле NGINX/Apache."""
+
+import re
+
+from src.core.implementations.parsers.log_parser import NginxLogParser
+
+
+class GenericLogParser(NginxLogParser):
+    """Медленный запасной парсер для вариаций формата combined.
+
+    Допускает:
+    - формат common (без $http_referer и $http_user_agent)
+    - произвольное поле ident вместо "-"
+    - "-" вместо $body_bytes_sent
+    - экранированные кавычки внутри полей
+    - дополнительные поля в конце строки
+
+    Используется, только если ни один строгий парсер не подошел.
+    """
+
+    LOG_PATTERN = re.compile(
+        r"^(?P<remote_addr>\S+) \S+ (?P<remote_user>\S+) \[(?P<time_local>[^\]]+)\] "
+        r'"(?P<request>(?:[^"\\]|\\.)*)" (?P<status>\d{3}) (?P<body_bytes_sent>\d+|-)'
+        r'(?: "(?P<http_referer>(?:[^"\\]|\\.)*)")?'
+        r'(?: "(?P<http_user_agent>(?:[^"\\]|\\.)*)")?'
+    )
+
+    format_name = "generic"
+
+    @staticmethod
+    def _normalize_groups(groups: tuple) -> tuple:
+        """Подставляет значения по умолчанию для необязательных полей."""
+        addr, user, time_str, request, status, size, referer, agent = groups
+        return (
+            addr,
+            user,
+            time_str,
+            request,
+            status,
+            "0" if size == "-" else size,
+            "-" if referer is None else referer,
+            "-" if agent is None else agent,
+        )
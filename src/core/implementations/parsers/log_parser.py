@@ -2,10 +2,13 @@
 
 import logging
 import re
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 from datetime import datetime
 
-from src.core.abstractions.parsers import ILogParser
+from src.core.abstractions.parsers import ILogParser, MalformedLineError
+from src.domain.services.malformed_line_reporter import MalformedLineReporter
+from src.domain.services.string_interner import StringInterner
+from src.models.log_batch import LogBatch
 from src.models.log_entry import LogEntry
 
 logger = logging.getLogger(__name__)
@@ -15,6 +18,8 @@ class NginxLogParser(ILogParser):
     """Реализация ILogParser для логов NGINX.
 
     Компромисс между SOLID и требованиями ТЗ: минимальное необходимое логирование.
+    Некорректные строки учитываются в MalformedLineReporter: WARN пишется только
+    для первых примеров, остальное попадает в итоговую сводку.
     """
 
     LOG_PATTERN = re.compile(
@@ -25,30 +30,114 @@ class NginxLogParser(ILogParser):
 
     TIME_FORMAT = "%d/%b/%Y:%H:%M:%S %z"
 
+    format_name = "combined"
+
+    # Время повторяется в пределах секунды - кэшируем результат strptime
+    time_cache_size = 65536
+
+    # Приведение групп LOG_PATTERN к 8 полям combined (для нестрогих форматов)
+    _normalize_groups: Callable[[tuple], tuple] | None = None
+
+    # Содержит ли LOG_PATTERN после 8 полей combined еще две группы:
+    # $request_time и $upstream_response_time (шаблоны SECONDS_PATTERN
+    # и UPSTREAM_SECONDS_PATTERN, поэтому их значения всегда числа или "-")
+    timed = False
+    SECONDS_PATTERN = r"\d+(?:\.\d+)?|-"
+    UPSTREAM_SECONDS_PATTERN = (
+        rf"(?:{SECONDS_PATTERN})(?:(?:, | : )(?:{SECONDS_PATTERN}))*"
+    )
+
+    def __init__(
+        self,
+        malformed_reporter: MalformedLineReporter | None = None,
+        interner: StringInterner | None = None,
+    ) -> None:
+        self.malformed_reporter = malformed_reporter or MalformedLineReporter()
+        self.interner = interner
+        self._time_cache: dict[str, datetime] = {}
+
     def parse_lines(self, lines: Iterator[str]) -> list[LogEntry]:
         """Парсит итератор строк в список LogEntry.
 
-        Соответствует ТЗ: логирует WARN для некорректных строк.
+        Соответствует ТЗ: логирует WARN для некорректных строк (с ограничением).
         """
         entries = []
 
+        try:
+            for batch in self.parse_batches(lines):
+                entries.extend(batch.to_entries())
+        except Exception:
+            # Критическая ошибка - fail-fast!
+            logger.exception("Критическая ошибка парсинга")
+            raise
+
+        return entries
+
+    def matches(self, line: str) -> bool:
+        """Проверяет, подходит ли строка под формат combined."""
+        return self.LOG_PATTERN.match(line) is not None
+
+    def parse_batch(self, lines: list[str]) -> LogBatch:
+        """Парсит блок строк в колоночный пакет без исключений на строку.
+
+        Горячий цикл: атрибуты и методы связаны с локальными переменными,
+        LogEntry не создаются, некорректные строки отмечаются в маске valid
+        и передаются в MalformedLineReporter (пустые строки - без учета).
+        Тайминги копятся строками и переводятся в секунды после цикла.
+        """
+        batch = LogBatch()
+        mark = batch.valid.append
+        add_addr = batch.remote_addr.append
+        add_user = batch.remote_user.append
+        add_time = batch.time_local.append
+        add_request = batch.request.append
+        add_status = batch.status.append
+        add_size = batch.body_bytes_sent.append
+        add_referer = batch.http_referer.append
+        add_agent = batch.http_user_agent.append
+        add_request_time = batch.request_time.append
+        add_upstream_time = batch.upstream_response_time.append
+
+        match = self.LOG_PATTERN.match
+        normalize = self._normalize_groups
+        parse_time = self._parse_time_cached
+        record = self.malformed_reporter.record
+        timed = self.timed
+
         for line in lines:
-            if not line.strip():
+            found = match(line)
+            if found is None:
+                mark(0)
+                if line and not line.isspace():
+                    record(line, "format_mismatch")
                 continue
 
+            groups = found.groups()
+            if normalize is not None:
+                groups = normalize(groups)
+            addr, user, time_str, request, status, size, referer, agent = groups[:8]
             try:
-                entry = self.parse_line(line)
-                entries.append(entry)
-            except ValueError as e:
-                logger.warning(
-                    f"Строка не соответствует формату NGINX и будет пропущена: {e}"
-                )
-            except Exception:
-                # Критическая ошибка - fail-fast!
-                logger.exception("Критическая ошибка парсинга")
-                raise
+                time_local = parse_time(time_str)
+            except ValueError:
+                mark(0)
+                record(line, "invalid_time")
+                continue
 
-        return entries
+            add_addr(addr)
+            add_user(None if user == "-" else user)
+            add_time(time_local)
+            add_request(request)
+            add_status(int(status))
+            add_size(int(size))
+            add_referer(referer)
+            add_agent(agent)
+            if timed:
+                add_request_time(groups[8])
+                add_upstream_time(groups[9])
+            mark(1)
+
+        self._convert_timings(batch)
+        return batch
 
     def parse_line(self, line: str) -> LogEntry:
         """Чистый парсинг одной строки.
@@ -57,31 +146,108 @@ class NginxLogParser(ILogParser):
         """
         if not line or line.isspace():
             msg = "Пустая строка"
-            raise ValueError(msg)
+            raise MalformedLineError(msg, "empty_line")
 
         match = self.LOG_PATTERN.match(line)
         if not match:
             msg = "Не соответствует формату NGINX"
-            raise ValueError(msg)
-
-        groups = match.groupdict()
+            raise MalformedLineError(msg, "format_mismatch")
+
+        groups = match.groups()
+        if self._normalize_groups is not None:
+            groups = self._normalize_groups(groups)
+        timings: tuple[float | None, float | None] = (None, None)
+        if self.timed:
+            timings = (
+                self._parse_seconds(groups[8]),
+                self._parse_upstream_seconds(groups[9]),
+            )
+            groups = groups[:8]
+        addr, user, time_str, request, status, size, referer, agent = groups
+
+        try:
+            time_local = self._parse_time(time_str)
+        except ValueError as e:
+            msg = f"Некорректное время: {time_str}"
+            raise MalformedLineError(msg, "invalid_time") from e
 
-        # Все преобразования могут бросить ValueError - это нормально
         return LogEntry(
-            remote_addr=groups["remote_addr"],
-            remote_user=self._parse_remote_user(groups["remote_user"]),
-            time_local=self._parse_time(groups["time_local"]),
-            request=groups["request"],
-            status=int(groups["status"]),
-            body_bytes_sent=int(groups["body_bytes_sent"]),
-            http_referer=groups["http_referer"],
-            http_user_agent=groups["http_user_agent"],
+            remote_addr=addr,
+            remote_user=self._parse_remote_user(user),
+            time_local=time_local,
+            request=request,
+            status=int(status),
+            body_bytes_sent=int(size),
+            http_referer=referer,
+            http_user_agent=agent,
+            request_time=timings[0],
+            upstream_response_time=timings[1],
+        )
+
+    def _convert_timings(self, batch: LogBatch) -> None:
+        """Переводит строки таймингов пакета в секунды (None без таймингов)."""
+        if not self.timed:
+            batch.request_time = [None] * len(batch)
+            batch.upstream_response_time = [None] * len(batch)
+            return
+
+        # Шаблон гарантирует число или "-", поэтому без _parse_seconds на строку
+        batch.request_time = [
+            None if raw == "-" else float(raw) for raw in batch.request_time
+        ]
+        batch.upstream_response_time = list(
+            map(self._parse_upstream_seconds, batch.upstream_response_time)
         )
 
-    def _parse_remote_user(self, raw_user: str) -> None | str:
+    @staticmethod
+    def _parse_seconds(raw: str | float | None) -> float | None:
+        """Разбирает $request_time: "0.012" → 0.012, "-" и пусто → None.
+
+        Raises:
+            ValueError: Если значение не число
+
+        """
+        if raw is None or raw in {"", "-"}:
+            return None
+        return float(raw)
+
+    @staticmethod
+    def _parse_upstream_seconds(raw: str | float | None) -> float | None:
+        """Разбирает $upstream_response_time в суммарное время upstream.
+
+        При нескольких upstream (через ", ") и внутренних перенаправлениях
+        (через " : ") времена складываются; "-" пропускаются.
+
+        Raises:
+            ValueError: Если значение не число
+
+        """
+        if raw is None or raw in {"", "-"}:
+            return None
+        if not isinstance(raw, str):
+            return float(raw)
+        if "," not in raw and ":" not in raw:
+            return float(raw)
+
+        parts = [part.strip() for part in raw.replace(":", ",").split(",")]
+        values = [float(part) for part in parts if part not in {"", "-"}]
+        return sum(values) if values else None
+
+    def _parse_remote_user(self, raw_user: str) -> str | None:
         """Преобразует remote_user. '-' → None."""
         return None if raw_user == "-" else raw_user
 
     def _parse_time(self, time_str: str) -> datetime:
         """Парсит время из формата NGINX."""
         return datetime.strptime(time_str, self.TIME_FORMAT)
+
+    def _parse_time_cached(self, time_str: str) -> datetime:
+        """Парсит время с ограниченным кэшем по строке времени."""
+        cache = self._time_cache
+        parsed = cache.get(time_str)
+        if parsed is None:
+            parsed = self._parse_time(time_str)
+            if len(cache) >= self.time_cache_size:
+                cache.clear()
+            cache[time_str] = parsed
+        return parsed
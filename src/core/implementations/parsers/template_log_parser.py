@@ -0,0 +1,141 @@
+"""Реализация парсера для логов NGINX по строке log_format."""
+
+import re
+from datetime import datetime
+from operator import itemgetter
+from typing import ClassVar
+
+from src.core.implementations.parsers.log_parser import NginxLogParser
+from src.domain.services.malformed_line_reporter import MalformedLineReporter
+from src.domain.services.string_interner import StringInterner
+from src.models.log_batch import LogBatch
+
+
+class NginxTemplateLogParser(NginxLogParser):
+    """Парсер по строке log_format из конфигурации NGINX.
+
+    Пример:
+        '$remote_addr - $remote_user [$time_local] "$request" $status '
+        '$body_bytes_sent "$http_referer" "$http_user_agent" '
+        'rt=$request_time urt=$upstream_response_time'
+
+    Шаблон один раз компилируется в регулярное выражение: известные
+    переменные становятся группами, неизвестные ($host, $ssl_protocol...)
+    пропускаются. Значение переменной - все символы до первого символа
+    следующего за ней литерала. Обязательны $remote_addr, $time_local
+    (или $time_iso8601), $request и $status; остальные поля получают
+    значения по умолчанию формата combined.
+    """
+
+    format_name = "custom"
+    timed = True
+
+    # Позиционные фильтры по сырой строке рассчитаны на формат combined
+    raw_line_filters = False
+
+    # Переменная NGINX → колонка LogBatch
+    variables: ClassVar[dict[str, str]] = {
+        **{name: name for name in LogBatch.column_names()},
+        "time_iso8601": "time_local",
+    }
+
+    # Шаблоны значений, которые дальше приводятся к числам
+    value_patterns: ClassVar[dict[str, str]] = {
+        "status": r"\d{3}",
+        "body_bytes_sent": r"\d+",
+        "request_time": NginxLogParser.SECONDS_PATTERN,
+        "upstream_response_time": NginxLogParser.UPSTREAM_SECONDS_PATTERN,
+    }
+
+    required_fields = ("remote_addr", "time_local", "request", "status")
+
+    defaults: ClassVar[dict[str, str]] = {
+        "remote_user": "-",
+        "body_bytes_sent": "0",
+        "http_referer": "-",
+        "http_user_agent": "-",
+        "request_time": "-",
+        "upstream_response_time": "-",
+    }
+
+    variable_pattern = re.compile(r"\$(?:\{(\w+)\}|(\w+))")
+
+    def __init__(
+        self,
+        template: str,
+        malformed_reporter: MalformedLineReporter | None = None,
+        interner: StringInterner | None = None,
+    ) -> None:
+        super().__init__(malformed_reporter, interner)
+        self.template = template
+        self.LOG_PATTERN, fields = self.compile(template)
+
+        # Группы шаблона + значения по умолчанию → 10 полей в порядке LogBatch
+        names = LogBatch.column_names()
+        default_values = tuple(self.defaults.get(name, "") for name in names)
+        positions = [
+            fields.index(name) if name in fields else len(fields) + index
+            for index, name in enumerate(names)
+        ]
+        getter = itemgetter(*positions)
+        self._normalize_groups = lambda groups: getter(groups + default_values)
+
+    @classmethod
+    def compile(cls, template: str) -> tuple[re.Pattern[str], list[str]]:
+        """Компилирует log_format в выражение и список полей его групп.
+
+        Raises:
+            ValueError: Если в шаблоне нет обязательных переменных
+
+        """
+        tokens: list[tuple[bool, str]] = []
+        position = 0
+        for found in cls.variable_pattern.finditer(template):
+            if found.start() > position:
+                tokens.append((False, template[position : found.start()]))
+            tokens.append((True, found.group(1) or found.group(2)))
+            position = found.end()
+        if position < len(template):
+            tokens.append((False, template[position:]))
+
+        parts = []
+        fields: list[str] = []
+        for index, (is_variable, value) in enumerate(tokens):
+            if not is_variable:
+                parts.append(re.escape(value))
+                continue
+
+            following = tokens[index + 1] if index + 1 < len(tokens) else None
+            if following is None:
+                value_pattern = ".*"
+            elif following[0]:
+                value_pattern = ".*?"
+            else:
+                value_pattern = f"[^{re.escape(following[1][0])}]*"
+
+            field = cls.variables.get(value)
+            if field is None or field in fields:
+                parts.append(f"(?:{value_pattern})")
+                continue
+            fields.append(field)
+            parts.append(f"({cls.value_patterns.get(field, value_pattern)})")
+
+        missing = [name for name in cls.required_fields if name not in fields]
+        if missing:
+            msg = (
+                "В log_format нет обязательных переменных: "
+                f"{', '.join(f'${name}' for name in missing)}"
+            )
+            raise ValueError(msg)
+
+        return re.compile(f"^{''.join(parts)}$"), fields
+
+    def _parse_time(self, time_str: str) -> datetime:
+        """Парсит $time_local или $time_iso8601."""
+        if time_str[4:5] == "-":
+            parsed = datetime.fromisoformat(time_str)
+            if parsed.tzinfo is None:
+                msg = f"Время без часового пояса: {time_str}"
+                raise ValueError(msg)
+            return parsed
+        return super()._parse_time(time_str)
@@ -0,0 +1,24 @@
+"""Реализация парсера для логов NGINX в формате combined с таймингами."""
+
+import re
+
+from src.core.implementations.parsers.log_parser import NginxLogParser
+
+
+class NginxTimedLogParser(NginxLogParser):
+    """Парсер формата combined с суффиксом $request_time $upstream_response_time.
+
+    Пример хвоста строки: ... "Mozilla/5.0" 0.012 0.010
+    Тайминги попадают в колонки request_time и upstream_response_time.
+    """
+
+    LOG_PATTERN = re.compile(
+        r"^(?P<remote_addr>\S+) - (?P<remote_user>\S+) \[(?P<time_local>[^\]]+)\] "
+        r'"(?P<request>[^"]*)" (?P<status>\d+) (?P<body_bytes_sent>\d+) '
+        r'"(?P<http_referer>[^"]*)" "(?P<http_user_agent>[^"]*)" '
+        rf"(?P<request_time>{NginxLogParser.SECONDS_PATTERN}) "
+        rf"(?P<upstream_response_time>{NginxLogParser.UPSTREAM_SECONDS_PATTERN})$"
+    )
+
+    format_name = "combined_timing"
+    timed = True
@@ -1,21 +1,38 @@
 """Реализация читателя локальных файлов."""
 
 import glob
+import logging
 from collections.abc import Iterator
 from pathlib import Path
 
 from src.core.abstractions.readers import IFileReader
+from src.domain.services.time_index_service import TimeIndexService
 from src.domain.validators.file_format_validator import FileFormatValidator
+from src.models.time_index import TimeIndex
+
+logger = logging.getLogger(__name__)
 
 
 class LocalFileReader(IFileReader):
-    """Реализация IFileReader для чтения локальных файлов."""
+    """Реализация IFileReader для чтения локальных файлов.
+
+    Если задан диапазон времени и рядом с файлом лежит актуальный индекс
+    (см. TimeIndexService), читаются только пересекающиеся участки файла,
+    а файлы вне диапазона пропускаются целиком.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, time_range: tuple[int | None, int | None] | None = None) -> None:
         self.format_validator = FileFormatValidator()
+        self.index_service = TimeIndexService()
+        self.time_range = time_range
 
     def read_files(self, path_pattern: str) -> Iterator[str]:
         """Читает файлы по конкретному пути или шаблону glob."""
+        for _, lines in self.read_sources(path_pattern):
+            yield from lines
+
+    def read_sources(self, path_pattern: str) -> Iterator[tuple[str, Iterator[str]]]:
+        """Возвращает каждый файл по шаблону glob как отдельный источник."""
         # Оставляем glob.glob для совместимости
         file_paths = glob.glob(path_pattern)
 
@@ -24,6 +41,10 @@ class LocalFileReader(IFileReader):
             raise FileNotFoundError(msg)
 
         for file_path in file_paths:
+            # Sidecar-индексы лежат рядом с логами и не являются логами
+            if TimeIndexService.is_sidecar(file_path):
+                continue
+
             file_path_obj = Path(file_path)
 
             # Проверка что это файл через Path
@@ -34,7 +55,17 @@ class LocalFileReader(IFileReader):
             # Валидация формата через FileFormatValidator
             self.format_validator.validate_extension(file_path)
 
-            yield from self._read_single_file(file_path_obj)
+            index = self._load_index(file_path_obj)
+            if index is None:
+                yield file_path, self._read_single_file(file_path_obj)
+            else:
+                yield file_path, self._read_indexed_file(file_path_obj, index)
+
+    def _load_index(self, file_path: Path) -> TimeIndex | None:
+        """Загружает индекс, только если он может сократить чтение."""
+        if self.time_range is None or self.time_range == (None, None):
+            return None
+        return self.index_service.load(file_path)
 
     def _read_single_file(self, file_path: Path) -> Iterator[str]:
         """Читает один файл построчно."""
@@ -49,3 +80,42 @@ class LocalFileReader(IFileReader):
         except PermissionError as e:
             msg = f"Нет прав для чтения файла {file_path}"
             raise PermissionError(msg) from e
+
+    def _read_indexed_file(self, file_path: Path, index: TimeIndex) -> Iterator[str]:
+        """Читает только участки файла, пересекающиеся с диапазоном времени."""
+        ranges = self._merge_ranges(index, *self.time_range)
+        if not ranges:
+            logger.info(f"Файл {file_path.name} пропущен по индексу времени")
+            return
+
+        try:
+            with file_path.open("rb") as file:
+                for offset, length in ranges:
+                    file.seek(offset)
+                    chunk = file.read(length)
+                    try:
+                        text = chunk.decode("utf-8")
+                    except UnicodeDecodeError:
+                        text = chunk.decode("latin-1")
+                    lines = text.split("\n")
+                    if lines and not lines[-1]:
+                        lines.pop()
+                    for line in lines:
+                        yield line.strip()
+        except PermissionError as e:
+            msg = f"Нет прав для чтения файла {file_path}"
+            raise PermissionError(msg) from e
+
+    @staticmethod
+    def _merge_ranges(
+        index: TimeIndex, start: int | None, end: int | None
+    ) -> list[tuple[int, int]]:
+        """Склеивает соседние выбранные участки в непрерывные диапазоны байт."""
+        ranges: list[tuple[int, int]] = []
+        for segment in index.select(start, end):
+            if ranges and ranges[-1][0] + ranges[-1][1] == segment.offset:
+                last_offset, last_length = ranges[-1]
+                ranges[-1] = (last_offset, last_length + segment.length)
+            else:
+                ranges.append((segment.offset, segment.length))
+        return ranges
@@ -0,0 +1,209 @@
+"""Аккумулятор аномалий поминутных рядов.
+
+Отвечает ТОЛЬКО за поиск минут, в которых число запросов или доля 5xx
+выбивается из скользящей базы.
+"""
+
+import copy
+from typing import Any, ClassVar
+
+import numpy as np
+
+from src.domain.accumulators.batch_view import BatchView
+from src.domain.accumulators.time_series_accumulator import TimeSeriesAccumulator
+from src.domain.calculators.ewma_detector import EwmaDetector
+
+
+class AnomalyAccumulator:
+    """Потоковый детектор аномалий по минутам.
+
+    Строки пакета раскладываются по минутам настенного времени в небольшую
+    таблицу открытых минут. Минута закрывается, когда поток уходит от нее
+    дальше чем на lateness минут, и ее значения - число запросов и доля
+    5xx - передаются детекторам EWMA (EwmaDetector) в порядке времени.
+    Пустые минуты между закрытыми передаются как нули; после разрыва
+    длиннее window минут базы обучаются заново. Строки закрытых минут
+    не учитываются (lateRequests): поток должен быть упорядочен по
+    времени с точностью до lateness.
+
+    Доля 5xx оценивается только для минут с min_requests запросами и
+    больше, чтобы единичная ошибка в пустую минуту не считалась всплеском.
+    Подряд идущие минуты-выбросы одного ряда и направления сливаются
+    в интервал. Память - O(1) на ряд плюс найденные интервалы.
+    """
+
+    default_window = 30
+    default_threshold = 3.0
+    lateness = 5
+    min_requests = 10
+    server_error = 500
+
+    # Ряд → минимальное стандартное отклонение базы
+    series_min_std: ClassVar[dict[str, float]] = {"requests": 1.0, "errorRate": 0.01}
+
+    def __init__(
+        self, window: int = default_window, threshold: float = default_threshold
+    ) -> None:
+        self.window = window
+        self.threshold = threshold
+        self.detectors = {
+            series: EwmaDetector(window, threshold, min_std)
+            for series, min_std in self.series_min_std.items()
+        }
+        self.pending: dict[int, list[int]] = {}
+        self.next_minute: int | None = None
+        self.watermark: int | None = None
+        self.late_requests = 0
+        self.intervals: list[dict[str, Any]] = []
+        self.open_intervals: dict[str, dict[str, Any]] = {}
+
+    def add_batch(self, view: BatchView) -> None:
+        """Раскладывает пакет по минутам и закрывает минуты, от которых ушел поток."""
+        batch = view.batch
+        if not len(batch):
+            return
+
+        times = dict.fromkeys(batch.time_local)
+        starts = TimeSeriesAccumulator.wall_clock_minutes(list(times)) // 60
+        minutes = dict(zip(times, starts.tolist(), strict=True))
+        rows = np.fromiter(map(minutes.__getitem__, batch.time_local), np.int64)
+        errors = np.asarray(batch.status, dtype=np.int64) >= self.server_error
+
+        low = int(rows.min())
+        offsets = rows - low
+        requests = np.bincount(offsets)
+        failures = np.bincount(offsets[errors], minlength=len(requests))
+        for offset in np.flatnonzero(requests).tolist():
+            minute = low + offset
+            if self.next_minute is not None and minute < self.next_minute:
+                self.late_requests += int(requests[offset])
+                continue
+            counts = self.pending.setdefault(minute, [0, 0])
+            counts[0] += int(requests[offset])
+            counts[1] += int(failures[offset])
+
+        high = low + len(requests) - 1
+        self.watermark = high if self.watermark is None else max(self.watermark, high)
+        self._close_until(self.watermark - self.lateness)
+
+    def merge(self, other: "AnomalyAccumulator") -> "AnomalyAccumulator":
+        """Объединяет следующую по времени часть потока (на месте).
+
+        Базы детекторов не складываются: минуты other, закрытые в своей
+        части, передать детекторам повторно нельзя. Поэтому, если other
+        уже закрыл минуты, берутся его интервалы и базы (база other
+        обучалась только на своей части), а открытые минуты частей
+        объединяются.
+        """
+        if (other.window, other.threshold) != (self.window, self.threshold):
+            msg = "Нельзя объединить детекторы с разными окном или порогом"
+            raise ValueError(msg)
+
+        self.late_requests += other.late_requests
+        if other.next_minute is not None:
+            self.finish()
+            self.intervals.extend(other.intervals)
+            self.detectors = other.detectors
+            self.open_intervals = other.open_intervals
+            self.next_minute = other.next_minute
+        for minute, (requests, failures) in other.pending.items():
+            if self.next_minute is not None and minute < self.next_minute:
+                self.late_requests += requests
+                continue
+            counts = self.pending.setdefault(minute, [0, 0])
+            counts[0] += requests
+            counts[1] += failures
+        if other.watermark is not None:
+            self.watermark = max(self.watermark or other.watermark, other.watermark)
+        return self
+
+    def summary(self) -> dict[str, Any]:
+        """Интервалы аномалий с учетом еще открытых минут (состояние не меняется)."""
+        final = copy.deepcopy(self)
+        final.finish()
+        return {
+            "window": self.window,
+            "threshold": self.threshold,
+            "lateRequests": self.late_requests,
+            "intervals": [
+                self._describe(interval)
+                for interval in sorted(
+                    final.intervals, key=lambda item: (item["start"], item["series"])
+                )
+            ],
+        }
+
+    def finish(self) -> None:
+        """Закрывает все открытые минуты и интервалы (конец потока)."""
+        self._close_until(None)
+        self._finish_intervals()
+
+    @staticmethod
+    def _describe(interval: dict[str, Any]) -> dict[str, Any]:
+        """Интервал с границами в ISO-формате настенного времени."""
+        return {
+            **interval,
+            "start": TimeSeriesAccumulator.bucket_start(interval["start"], 60),
+            "end": TimeSeriesAccumulator.bucket_start(interval["end"], 60),
+            "minutes": interval["end"] - interval["start"] + 1,
+        }
+
+    def _close_until(self, limit: int | None) -> None:
+        """Закрывает открытые минуты до limit включительно (None - все)."""
+        ready = sorted(
+            minute for minute in self.pending if limit is None or minute <= limit
+        )
+        for minute in ready:
+            requests, failures = self.pending.pop(minute)
+            if self.next_minute is not None:
+                gap = minute - self.next_minute
+                if gap > self.window:
+                    for detector in self.detectors.values():
+                        detector.reset()
+                    self._finish_intervals()
+                else:
+                    for empty in range(self.next_minute, minute):
+                        self._observe(empty, 0, 0)
+            self._observe(minute, requests, failures)
+            self.next_minute = minute + 1
+
+    def _observe(self, minute: int, requests: int, failures: int) -> None:
+        """Передает значения минуты детекторам и обновляет интервалы."""
+        self._check("requests", minute, requests)
+        if requests >= self.min_requests:
+            self._check("errorRate", minute, failures / requests)
+
+    def _check(self, series: str, minute: int, value: float) -> None:
+        """Продлевает, начинает или закрывает интервал ряда по z-оценке."""
+        detector = self.detectors[series]
+        score = detector.update(value)
+        current = self.open_intervals.get(series)
+        direction = None if score is None else ("high" if score > 0 else "low")
+        if current is not None and (
+            current["direction"] != direction or current["end"] != minute - 1
+        ):
+            self.intervals.append(self.open_intervals.pop(series))
+            current = None
+        if direction is None:
+            return
+
+        if current is None:
+            current = self.open_intervals[series] = {
+                "series": series,
+                "direction": direction,
+                "start": minute,
+                "end": minute,
+                "peakValue": round(value, 4),
+                "baseline": round(detector.baseline, 4),
+                "maxZScore": round(score, 2),
+            }
+        current["end"] = minute
+        if abs(score) > abs(current["maxZScore"]):
+            current["peakValue"] = round(value, 4)
+            current["baseline"] = round(detector.baseline, 4)
+            current["maxZScore"] = round(score, 2)
+
+    def _finish_intervals(self) -> None:
+        """Закрывает все открытые интервалы."""
+        self.intervals.extend(self.open_intervals.values())
+        self.open_intervals.clear()
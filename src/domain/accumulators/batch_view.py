@@ -0,0 +1,152 @@
+"""Пакет с ленивыми производными колонками.
+
+Отвечает ТОЛЬКО за однократный расчет колонок, общих для нескольких метрик.
+"""
+
+from collections import Counter
+from datetime import datetime
+from functools import cached_property
+from typing import Any, ClassVar
+
+from src.domain.services.bot_classifier import BotClassifier
+from src.domain.services.ip_network_index import IpNetworkIndex
+from src.domain.services.request_parser_service import RequestParserService
+from src.domain.services.uri_normalizer import UriNormalizer
+from src.models.log_batch import LogBatch
+
+
+class BatchView:
+    """Обертка пакета для метрик.
+
+    Производные колонки считаются при первом обращении и только если
+    их читает хотя бы одна выбранная метрика: ресурсы нужны топу ресурсов
+    и уникальным значениям, но разбираются один раз на пакет.
+
+    Производные колонки вычисляются по уникальным значениям исходной
+    колонки (строкам запроса, статусам, времени) и разворачиваются
+    по строкам через словарь. С UriNormalizer ресурсы - шаблоны путей,
+    с IpNetworkIndex доступны измерения asn и country по remote_addr.
+    Измерение client_type (bot/human) считает BotClassifier по user agent.
+    """
+
+    # Производная колонка → исходная колонка LogBatch
+    derived_columns: ClassVar[dict[str, str]] = {
+        "resource": "request",
+        "method": "request",
+        "protocol": "request",
+        "status_class": "status",
+        "date": "time_local",
+        "hour": "time_local",
+        "minute": "time_local",
+        "asn": "remote_addr",
+        "country": "remote_addr",
+        "client_type": "http_user_agent",
+    }
+
+    # Производные колонки, требующие справочника сетей (--ip-db)
+    network_columns: ClassVar[tuple[str, ...]] = ("asn", "country")
+
+    def __init__(
+        self,
+        batch: LogBatch,
+        request_parser: RequestParserService,
+        uri_normalizer: UriNormalizer | None = None,
+        ip_index: IpNetworkIndex | None = None,
+        bot_classifier: BotClassifier | None = None,
+    ) -> None:
+        self.batch = batch
+        self.request_parser = request_parser
+        self.uri_normalizer = uri_normalizer
+        self.ip_index = ip_index
+        self.bot_classifier = bot_classifier or BotClassifier.default()
+        self._columns: dict[str, list[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.batch)
+
+    @classmethod
+    def column_names(cls) -> tuple[str, ...]:
+        """Имена исходных и производных колонок."""
+        return (*LogBatch.column_names(), *cls.derived_columns)
+
+    @classmethod
+    def source_column(cls, name: str) -> str:
+        """Исходная колонка LogBatch для колонки name."""
+        return cls.derived_columns.get(name, name)
+
+    @cached_property
+    def request_counts(self) -> Counter[str]:
+        """Частоты уникальных строк запроса в пакете."""
+        return Counter(self.batch.request)
+
+    @cached_property
+    def resources(self) -> list[str]:
+        """Ресурсы в порядке ключей request_counts."""
+        resources = map(self.request_parser.extract_resource, self.request_counts)
+        if self.uri_normalizer is not None:
+            resources = map(self.uri_normalizer.normalize, resources)
+        return list(resources)
+
+    def column(self, name: str) -> list[Any]:
+        """Колонка по имени: исходная или производная (с кэшем на пакет)."""
+        if name not in self.derived_columns:
+            return getattr(self.batch, name)
+
+        column = self._columns.get(name)
+        if column is None:
+            column = self._columns[name] = self._derive(name)
+        return column
+
+    def _derive(self, name: str) -> list[Any]:
+        """Считает производную колонку по уникальным значениям исходной."""
+        if name == "resource":
+            mapping = dict(zip(self.request_counts, self.resources, strict=True))
+            return list(map(mapping.__getitem__, self.batch.request))
+
+        converters = {
+            "method": self.request_parser.extract_method,
+            "protocol": self.request_parser.extract_protocol,
+            "status_class": self._status_class,
+            "date": self._date,
+            "hour": self._hour,
+            "minute": self._minute,
+            "asn": self._asn,
+            "country": self._country,
+            "client_type": self.bot_classifier.classify,
+        }
+        source = getattr(self.batch, self.derived_columns[name])
+        mapping = dict.fromkeys(source)
+        convert = converters[name]
+        for value in mapping:
+            mapping[value] = convert(value)
+        return list(map(mapping.__getitem__, source))
+
+    def _network(self, address: str) -> tuple[str, str]:
+        """Метка (asn, страна) адреса по справочнику сетей."""
+        if self.ip_index is None:
+            msg = "Измерения asn и country требуют справочник сетей --ip-db"
+            raise ValueError(msg)
+        label = self.ip_index.lookup(address)
+        return (IpNetworkIndex.unknown,) * 2 if label is None else label
+
+    def _asn(self, address: str) -> str:
+        return self._network(address)[0]
+
+    def _country(self, address: str) -> str:
+        return self._network(address)[1]
+
+    @staticmethod
+    def _status_class(status: int) -> str:
+        return f"{status // 100}xx"
+
+    @staticmethod
+    def _date(time_local: datetime) -> str:
+        return time_local.date().isoformat()
+
+    @staticmethod
+    def _hour(time_local: datetime) -> str:
+        return time_local.strftime("%Y-%m-%dT%H:00")
+
+    @staticmethod
+    def _minute(time_local: datetime) -> str:
+        return time_local.strftime("%Y-%m-%dT%H:%M")
@@ -3,10 +3,14 @@
 Отвечает ТОЛЬКО за однопроходный сбор и агрегацию данных.
 """
 
-from collections import Counter, defaultdict
+from collections.abc import Iterable
 from typing import Any
 
+from src.core.abstractions.metrics import MetricOptions
+from src.domain.accumulators.batch_view import BatchView
+from src.domain.services.metric_registry import MetricRegistry
 from src.domain.services.request_parser_service import RequestParserService
+from src.models.log_batch import LogBatch
 from src.models.log_entry import LogEntry
 
 
@@ -14,18 +18,28 @@ class DataAccumulator:
     """Однопроходный аккумулятор данных для статистики логов NGINX.
 
     Ответственность:
-    - Сбор всех необходимых метрик за один проход по данным
-    - Агрегация счетчиков и множеств
+    - Сбор метрик, выбранных в MetricRegistry, за один проход по данным
+    - Создание свежего состояния метрик на каждый расчет
     - Эффективное использование памяти
 
     Не знает о:
     - Как данные будут использоваться
     - JSON-структуре результата
     - Логировании процесса
+    - Конкретных метриках (знает MetricRegistry)
     """
 
-    def __init__(self, request_parser: RequestParserService) -> None:
+    def __init__(
+        self,
+        request_parser: RequestParserService,
+        options: MetricOptions | None = None,
+        metrics: tuple[str, ...] | None = None,
+    ) -> None:
         self.request_parser = request_parser
+        self.options = options or MetricOptions()
+        self.metric_names = MetricRegistry.select(metrics, self.options)
+        # Проверка имен метрик до чтения данных
+        self.metric_classes = MetricRegistry.resolve(self.metric_names)
 
     def accumulate(self, entries: list[LogEntry]) -> dict[str, Any]:
         """Собирает все необходимые данные за один проход.
@@ -41,35 +55,41 @@ class DataAccumulator:
             Space: O(1) - константная дополнительная память
 
         """
-        sizes = []
-        resource_counter = Counter()
-        status_counter = Counter()
-        date_counter = defaultdict(int)
-        protocol_set = set()
+        return self.accumulate_batches([LogBatch.from_entries(entries)])
 
-        for entry in entries:
-            # 1. Размеры ответов (нужны все значения для перцентиля)
-            sizes.append(entry.body_bytes_sent)
+    def accumulate_batches(self, batches: Iterable[LogBatch]) -> dict[str, Any]:
+        """Собирает данные по потоку колоночных пакетов за один проход.
 
-            # 2. Частота ресурсов
-            resource = self.request_parser.extract_resource(entry.request)
-            resource_counter[resource] += 1
+        В горячем цикле работают только выбранные метрики; производные
+        колонки (ресурсы из строк запроса) BatchView считает один раз
+        на пакет и только если их читает какая-либо метрика.
 
-            # 3. Статистика HTTP-статусов
-            status_counter[entry.status] += 1
+        Args:
+            batches: Итерируемый поток пакетов от парсера
 
-            # 4. Распределение по датам
-            date_str = entry.time_local.date().isoformat()
-            date_counter[date_str] += 1
+        Returns:
+            Dict с агрегированными данными: total_requests, список метрик
+            metrics и состояние каждой метрики по ее state_key
 
-            # 5. Уникальные протоколы
-            protocol = self.request_parser.extract_protocol(entry.request)
-            protocol_set.add(protocol)
+        """
+        metrics = [metric.create(self.options) for metric in self.metric_classes]
+        add_batches = [metric.add_batch for metric in metrics]
+        request_parser = self.request_parser
+        uri_normalizer = self.options.uri_normalizer
+        ip_index = self.options.ip_index
+        bot_classifier = self.options.bot_classifier
+        total_requests = 0
+
+        for batch in batches:
+            total_requests += len(batch)
+            view = BatchView(
+                batch, request_parser, uri_normalizer, ip_index, bot_classifier
+            )
+            for add_batch in add_batches:
+                add_batch(view)
 
         return {
-            "response_sizes": sizes,
-            "resource_frequency": resource_counter,
-            "status_frequency": status_counter,
-            "date_distribution": date_counter,
-            "unique_protocols": protocol_set,
+            "total_requests": total_requests,
+            "metrics": metrics,
+            **{metric.state_key: metric.state for metric in metrics},
         }
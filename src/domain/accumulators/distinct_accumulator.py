@@ -0,0 +1,63 @@
+"""Аккумулятор уникальных значений.
+
+Отвечает ТОЛЬКО за приближенный подсчет уникальных клиентов, ресурсов и user agent.
+"""
+
+from collections.abc import Iterable
+from typing import Any
+
+from src.domain.calculators.hyperloglog import HyperLogLog
+from src.models.log_batch import LogBatch
+
+
+class DistinctAccumulator:
+    """Счетчики HyperLogLog по нескольким полям.
+
+    Вместо множеств значений (как для протоколов) хранится
+    2^precision байт на поле, поэтому память не растет с числом
+    уникальных значений. Состояние объединяется merge() и переносится
+    между процессами через to_bytes()/from_bytes().
+    """
+
+    fields = ("clients", "resources", "userAgents")
+
+    def __init__(self, precision: int = HyperLogLog.default_precision) -> None:
+        self.precision = precision
+        self.counters = {field: HyperLogLog(precision) for field in self.fields}
+
+    def add_batch(self, batch: LogBatch, resources: Iterable[str]) -> None:
+        """Добавляет пакет; ресурсы уже извлечены из строк запросов."""
+        self.counters["clients"].extend(batch.remote_addr)
+        self.counters["resources"].extend(resources)
+        self.counters["userAgents"].extend(batch.http_user_agent)
+
+    def merge(self, other: "DistinctAccumulator") -> "DistinctAccumulator":
+        """Объединяет счетчики другой части потока с текущими (на месте)."""
+        for field, counter in self.counters.items():
+            counter.merge(other.counters[field])
+        return self
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Оценки по полям с относительной стандартной ошибкой."""
+        return {
+            field: {
+                "estimate": counter.estimate(),
+                "relativeStandardError": round(counter.standard_error, 4),
+            }
+            for field, counter in self.counters.items()
+        }
+
+    def to_bytes(self) -> bytes:
+        """Сериализует счетчики всех полей в порядке fields."""
+        return b"".join(self.counters[field].to_bytes() for field in self.fields)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "DistinctAccumulator":
+        """Восстанавливает аккумулятор из to_bytes()."""
+        accumulator = cls(data[0])
+        size = len(data) // len(cls.fields)
+        for index, field in enumerate(cls.fields):
+            accumulator.counters[field] = HyperLogLog.from_bytes(
+                data[index * size : (index + 1) * size]
+            )
+        return accumulator
@@ -0,0 +1,276 @@
+"""Аккумулятор группировки по произвольным измерениям.
+
+Отвечает ТОЛЬКО за хеш-агрегацию строк по ключу из нескольких колонок.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, ClassVar
+
+import numpy as np
+
+from src.domain.accumulators.batch_view import BatchView
+from src.domain.calculators.quantile_sketch import QuantileSketch
+
+
+@dataclass(frozen=True, slots=True)
+class Aggregate:
+    """Агрегатная функция над числовой колонкой: sum, max или перцентиль."""
+
+    function: str
+    field: str | None = None
+
+    @property
+    def label(self) -> str:
+        """Имя колонки результата: count, sum(body_bytes_sent), p95(...)."""
+        return self.function if self.field is None else f"{self.function}({self.field})"
+
+    @property
+    def percentile(self) -> int | None:
+        """Номер перцентиля для функций p50, p95 и т.п."""
+        return int(self.function[1:]) if self.function.startswith("p") else None
+
+
+class GroupByAccumulator:
+    """Группировка строк по ключу из колонок BatchView.
+
+    Каждый пакет сначала агрегируется локально: ключам присваиваются
+    целые коды, а count, sum и max считаются через np.bincount и
+    np.maximum.at. Затем локальные группы добавляются в общую таблицу.
+
+    Число групп ограничено max_groups: когда таблица заполнена, строки
+    новых ключей попадают в общую группу other_key. Группы, уже попавшие
+    в таблицу, считаются точно. Слияние частей потока подчиняется тому же
+    ограничению.
+    """
+
+    default_max_groups = 1000
+    other_value = "(other)"
+
+    functions = ("count", "sum", "max")
+    percentiles = (50, 75, 90, 95, 99)
+
+    # Колонки, по которым можно считать sum, max и перцентили
+    numeric_fields: ClassVar[tuple[str, ...]] = ("status", "body_bytes_sent")
+
+    def __init__(
+        self,
+        dimensions: tuple[str, ...],
+        aggregates: tuple[Aggregate, ...] = (),
+        max_groups: int = default_max_groups,
+    ) -> None:
+        if not dimensions:
+            msg = "Для группировки нужно хотя бы одно измерение"
+            raise ValueError(msg)
+        if max_groups <= 0:
+            msg = "Лимит числа групп должен быть положительным"
+            raise ValueError(msg)
+
+        self.dimensions = dimensions
+        self.aggregates = tuple(item for item in aggregates if item.field is not None)
+        self.max_groups = max_groups
+        self.other_key = (self.other_value,) * len(dimensions)
+        # Ключ → [count, значение каждого агрегата]
+        self.groups: dict[tuple, list[Any]] = {}
+        self.other: list[Any] | None = None
+
+    @classmethod
+    def parse_dimensions(cls, raw: str) -> tuple[str, ...]:
+        """Разбирает --group-by: "resource,status" → ("resource", "status").
+
+        Raises:
+            ValueError: Если измерение неизвестно или список пуст
+
+        """
+        dimensions = tuple(
+            dict.fromkeys(name.strip() for name in raw.split(",") if name.strip())
+        )
+        if not dimensions:
+            msg = "Список измерений --group-by пуст"
+            raise ValueError(msg)
+
+        unknown = [name for name in dimensions if name not in BatchView.column_names()]
+        if unknown:
+            msg = (
+                f"Неизвестные измерения: {', '.join(unknown)}. "
+                f"Поддерживаемые: {', '.join(BatchView.column_names())}"
+            )
+            raise ValueError(msg)
+        return dimensions
+
+    @staticmethod
+    def require_network_index(dimensions: tuple[str, ...]) -> None:
+        """Проверяет измерения, когда справочник сетей не задан.
+
+        Raises:
+            ValueError: Если среди измерений есть asn или country
+
+        """
+        network = [name for name in dimensions if name in BatchView.network_columns]
+        if network:
+            msg = f"Измерения {', '.join(network)} требуют справочник сетей --ip-db"
+            raise ValueError(msg)
+
+    @classmethod
+    def parse_aggregates(cls, raw: str | None) -> tuple[Aggregate, ...]:
+        """Разбирает --aggregate: "count,sum:body_bytes_sent,p95:body_bytes_sent".
+
+        Raises:
+            ValueError: Если функция или колонка не поддерживается
+
+        """
+        aggregates = []
+        for item in (raw or "count").split(","):
+            function, _, field = item.strip().partition(":")
+            aggregate = Aggregate(function, field or None)
+            supported = function in cls.functions or function in {
+                f"p{percentile}" for percentile in cls.percentiles
+            }
+            if not supported:
+                msg = (
+                    f"Неизвестная агрегатная функция: '{function}'. "
+                    "Поддерживаемые: count, sum, max, "
+                    f"{', '.join(f'p{value}' for value in cls.percentiles)}"
+                )
+                raise ValueError(msg)
+            if (function == "count") != (aggregate.field is None):
+                msg = f"Агрегат '{item.strip()}': колонка нужна всем, кроме count"
+                raise ValueError(msg)
+            if (
+                aggregate.field is not None
+                and aggregate.field not in cls.numeric_fields
+            ):
+                msg = (
+                    f"Агрегат '{item.strip()}': колонка должна быть числовой "
+                    f"({', '.join(cls.numeric_fields)})"
+                )
+                raise ValueError(msg)
+            aggregates.append(aggregate)
+        return tuple(dict.fromkeys(aggregates))
+
+    @property
+    def source_fields(self) -> set[str]:
+        """Колонки LogBatch, нужные измерениям и агрегатам."""
+        return {BatchView.source_column(name) for name in self.dimensions} | {
+            aggregate.field for aggregate in self.aggregates
+        }
+
+    def add_batch(self, view: BatchView) -> None:
+        """Агрегирует пакет локально и добавляет группы в таблицу."""
+        if not len(view):
+            return
+
+        codes_by_key: dict[tuple, int] = {}
+        assign = codes_by_key.setdefault
+        keys = zip(*(view.column(name) for name in self.dimensions), strict=True)
+        codes = np.fromiter(
+            (assign(key, len(codes_by_key)) for key in keys), np.intp, len(view)
+        )
+        group_count = len(codes_by_key)
+
+        counts = np.bincount(codes, minlength=group_count)
+        columns = [
+            self._aggregate_batch(aggregate, codes, group_count, view)
+            for aggregate in self.aggregates
+        ]
+
+        for code, key in enumerate(codes_by_key):
+            self._add_group(
+                key, int(counts[code]), [column[code] for column in columns]
+            )
+
+    def merge(self, other: "GroupByAccumulator") -> "GroupByAccumulator":
+        """Объединяет группы другой части потока с текущими (на месте)."""
+        if (other.dimensions, other.aggregates) != (self.dimensions, self.aggregates):
+            msg = "Нельзя объединить группировки с разными измерениями или агрегатами"
+            raise ValueError(msg)
+
+        for key, (count, *values) in other.groups.items():
+            self._add_group(key, count, values)
+        if other.other is not None:
+            count, *values = other.other
+            self._add_group(self.other_key, count, values)
+        return self
+
+    def rows(self) -> list[dict[str, Any]]:
+        """Группы по убыванию числа строк; группа other - последней."""
+        ordered = sorted(self.groups.items(), key=lambda item: -item[1][0])
+        if self.other is not None:
+            ordered.append((self.other_key, self.other))
+        return [self._row(key, state) for key, state in ordered]
+
+    def _aggregate_batch(
+        self, aggregate: Aggregate, codes: np.ndarray, group_count: int, view: BatchView
+    ) -> list[Any]:
+        """Значения агрегата по локальным группам пакета."""
+        values = np.asarray(view.column(aggregate.field), dtype=np.int64)
+        if aggregate.function == "sum":
+            return (
+                np.bincount(codes, weights=values, minlength=group_count)
+                .astype(np.int64)
+                .tolist()
+            )
+        if aggregate.function == "max":
+            maxima = np.full(group_count, np.iinfo(np.int64).min, dtype=np.int64)
+            np.maximum.at(maxima, codes, values)
+            return maxima.tolist()
+
+        # Перцентиль: значения группы - непрерывный отрезок после сортировки кодов
+        order = np.argsort(codes, kind="stable")
+        bounds = np.cumsum(np.bincount(codes, minlength=group_count))[:-1]
+        return np.split(values[order], bounds)
+
+    def _add_group(self, key: tuple, count: int, values: list[Any]) -> None:
+        """Добавляет частичный результат группы с учетом лимита групп."""
+        state = self.groups.get(key)
+        if state is None:
+            if key != self.other_key and len(self.groups) < self.max_groups:
+                state = self.groups[key] = self._empty_state()
+            else:
+                if self.other is None:
+                    self.other = self._empty_state()
+                state = self.other
+
+        state[0] += count
+        for index, (aggregate, value) in enumerate(
+            zip(self.aggregates, values, strict=True), start=1
+        ):
+            if aggregate.function == "sum":
+                state[index] += value
+            elif aggregate.function == "max":
+                state[index] = max(state[index], value)
+            elif isinstance(value, QuantileSketch):
+                state[index].merge(value)
+            else:
+                state[index].extend(value)
+
+    def _empty_state(self) -> list[Any]:
+        """Пустое состояние группы: count и начальные значения агрегатов."""
+        state: list[Any] = [0]
+        for aggregate in self.aggregates:
+            if aggregate.function == "sum":
+                state.append(0)
+            elif aggregate.function == "max":
+                state.append(np.iinfo(np.int64).min)
+            else:
+                state.append(QuantileSketch())
+        return state
+
+    def _row(self, key: tuple, state: list[Any]) -> dict[str, Any]:
+        """Строка отчета: значения измерений, count и агрегаты.
+
+        Время (измерение time_local) выводится в ISO-формате, как в JSON.
+        """
+        row: dict[str, Any] = {
+            "key": {
+                dimension: value.isoformat() if isinstance(value, datetime) else value
+                for dimension, value in zip(self.dimensions, key, strict=True)
+            },
+            "count": state[0],
+        }
+        for aggregate, value in zip(self.aggregates, state[1:], strict=True):
+            percentile = aggregate.percentile
+            row[aggregate.label] = (
+                round(value.quantile(percentile), 2) if percentile else value
+            )
+        return row
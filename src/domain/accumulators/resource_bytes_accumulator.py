@@ -0,0 +1,141 @@
+"""Аккумулятор трафика по ресурсам.
+
+Отвечает ТОЛЬКО за топ ресурсов по body_bytes_sent со средним и 95p размера.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.domain.accumulators.batch_view import BatchView
+from src.domain.calculators.quantile_sketch import QuantileSketch
+from src.domain.calculators.space_saving import SpaceSaving
+
+
+@dataclass(slots=True)
+class ResourceBytesState:
+    """Размеры ответов ресурса с момента попадания в сводку.
+
+    Размеры копятся в буфере и добавляются в скетч блоками, чтобы
+    не вызывать numpy на каждый ресурс каждого пакета. Скетч создается
+    при первом переносе буфера: редкие ключи хвоста, ненадолго
+    попадающие в сводку, обходятся без него.
+    """
+
+    requests: int = 0
+    bytes: int = 0
+    sketch: QuantileSketch | None = None
+    buffer: list[int] = field(default_factory=list)
+
+    def add(self, sizes: list[int], total: int, flush_size: int) -> None:
+        """Добавляет размеры ответов пакета и их сумму."""
+        self.requests += len(sizes)
+        self.bytes += total
+        self.buffer.extend(sizes)
+        if len(self.buffer) >= flush_size:
+            self.flush()
+
+    def flush(self) -> QuantileSketch:
+        """Переносит буфер в скетч."""
+        if self.sketch is None:
+            self.sketch = QuantileSketch()
+        if self.buffer:
+            self.sketch.extend(self.buffer)
+            self.buffer.clear()
+        return self.sketch
+
+    def merge(self, other: "ResourceBytesState") -> "ResourceBytesState":
+        """Объединяет состояние другой части потока с текущим (на месте)."""
+        self.requests += other.requests
+        self.bytes += other.bytes
+        self.flush().merge(other.flush())
+        return self
+
+
+class ResourceBytesAccumulator:
+    """Топ ресурсов по сумме body_bytes_sent.
+
+    Суммы байт по ресурсам идут в сводку SpaceSaving на capacity ключей,
+    поэтому память не растет с числом уникальных URI. Число запросов,
+    средний размер и скетч квантилей размера хранятся только для ключей,
+    которые сейчас в сводке, и удаляются вместе с вытесненным ключом.
+    Для ключа, попавшего в сводку позже начала потока, они считаются
+    с момента попадания; оценка байт при этом завышена не более чем
+    на error.
+
+    Ресурсы берутся из общей производной колонки BatchView, поэтому
+    строки запроса повторно не разбираются.
+    """
+
+    default_capacity = SpaceSaving.default_capacity
+    flush_size = 256
+
+    def __init__(self, capacity: int = default_capacity) -> None:
+        self.capacity = capacity
+        self.bytes = SpaceSaving(capacity)
+        self.stats: dict[str, ResourceBytesState] = {}
+
+    def add_batch(self, view: BatchView) -> None:
+        """Группирует размеры пакета по ресурсам и обновляет сводку."""
+        if not len(view):
+            return
+
+        sizes_by_resource: dict[str, list[int]] = {}
+        get = sizes_by_resource.get
+        for resource, size in zip(
+            view.column("resource"), view.batch.body_bytes_sent, strict=True
+        ):
+            sizes = get(resource)
+            if sizes is None:
+                sizes_by_resource[resource] = [size]
+            else:
+                sizes.append(size)
+
+        totals = {resource: sum(sizes) for resource, sizes in sizes_by_resource.items()}
+        self.bytes.update(totals)
+        self._drop_evicted()
+
+        tracked, stats = self.bytes.counts, self.stats
+        for resource, sizes in sizes_by_resource.items():
+            if resource in tracked:
+                state = stats.get(resource)
+                if state is None:
+                    state = stats[resource] = ResourceBytesState()
+                state.add(sizes, totals[resource], self.flush_size)
+
+    def merge(self, other: "ResourceBytesAccumulator") -> "ResourceBytesAccumulator":
+        """Объединяет сводку и состояния ресурсов другой части потока (на месте)."""
+        self.bytes.merge(other.bytes)
+        self._drop_evicted()
+        for resource, state in other.stats.items():
+            if resource not in self.bytes.counts:
+                continue
+            own = self.stats.get(resource)
+            if own is None:
+                self.stats[resource] = state
+            else:
+                own.merge(state)
+        return self
+
+    def top(self, limit: int) -> list[dict[str, Any]]:
+        """Ресурсы по убыванию байт: сумма, ошибка, запросы, среднее и 95p."""
+        rows = []
+        for resource, total, error in self.bytes.top(limit):
+            state = self.stats.get(resource, ResourceBytesState())
+            rows.append(
+                {
+                    "resource": resource,
+                    "totalBytes": total,
+                    "error": error,
+                    "totalRequestsCount": state.requests,
+                    "averageBytes": (
+                        round(state.bytes / state.requests, 2) if state.requests else 0
+                    ),
+                    "p95Bytes": round(state.flush().quantile(95), 2),
+                }
+            )
+        return rows
+
+    def _drop_evicted(self) -> None:
+        """Удаляет состояния ресурсов, вытесненных из сводки."""
+        for resource in self.stats.keys() - self.bytes.counts.keys():
+            del self.stats[resource]
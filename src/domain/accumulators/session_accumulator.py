@@ -0,0 +1,213 @@
+"""Аккумулятор сессий клиентов.
+
+Отвечает ТОЛЬКО за разбиение запросов клиентов на сессии по таймауту
+неактивности и статистику закрытых сессий.
+"""
+
+import heapq
+from collections import Counter
+from datetime import date
+from typing import Any
+
+from src.domain.accumulators.batch_view import BatchView
+from src.domain.calculators.hdr_histogram import HdrHistogram
+
+# Поля активной сессии (список, а не объект - он дешевле в горячем цикле)
+START, FIRST_SEEN, LAST_SEEN, REQUESTS, SEQUENCE = range(5)
+
+
+class SessionAccumulator:
+    """Потоковые сессии по ключу (remote_addr, http_user_agent).
+
+    Запрос продолжает сессию клиента, если с его предыдущего запроса
+    прошло не больше timeout секунд, иначе открывает новую. Активные
+    сессии лежат в таблице по ключу, а в куче - записи (время последнего
+    запроса, номер сессии, ключ) для вытеснения по времени: после
+    каждого пакета сессии, неактивные дольше timeout относительно
+    самого позднего времени потока, закрываются и удаляются из таблицы.
+    Запись кучи проверяется при извлечении: устаревшая (сессия уже
+    закрыта или продлена) отбрасывается или перекладывается с новым
+    временем, поэтому куча не обновляется на каждый запрос. Память
+    пропорциональна числу клиентов, активных за последние timeout
+    секунд, а не числу всех клиентов.
+
+    Запрос раньше начала активной сессии клиента продлевает ее назад,
+    если он не дальше timeout от ее первого запроса. Более ранний запрос
+    (строки не по порядку времени) не учитывается (lateRequests), чтобы
+    не растягивать сессию на разрыв больше таймаута.
+
+    Закрытые сессии сразу сворачиваются в счетчики по дням начала
+    и гистограммы длительности (секунды) и числа запросов.
+    """
+
+    default_timeout = 30 * 60
+
+    def __init__(self, timeout: int = default_timeout) -> None:
+        self.timeout = timeout
+        self.active: dict[tuple[str, str], list[Any]] = {}
+        self.heap: list[tuple[float, int, tuple[str, str]]] = []
+        self.sessions_per_day: Counter[int] = Counter()
+        self.durations = HdrHistogram()
+        self.requests = HdrHistogram()
+        self.peak_active = 0
+        self.watermark = float("-inf")
+        self.late_requests = 0
+        self._sequence = 0
+        self._closed_durations: list[int] = []
+        self._closed_requests: list[int] = []
+
+    def add_batch(self, view: BatchView) -> None:
+        """Продлевает или открывает сессии по строкам пакета и вытесняет старые."""
+        batch = view.batch
+        if not len(batch):
+            return
+
+        stamps = {value: value.timestamp() for value in dict.fromkeys(batch.time_local)}
+        active, heap, timeout = self.active, self.heap, self.timeout
+        get = active.get
+        close = self._close
+        push = heapq.heappush
+        sequence = self._sequence
+        late = 0
+
+        for key, time_local in zip(
+            zip(batch.remote_addr, batch.http_user_agent, strict=True),
+            batch.time_local,
+            strict=True,
+        ):
+            stamp = stamps[time_local]
+            session = get(key)
+            if session is not None:
+                if stamp < session[FIRST_SEEN] - timeout:
+                    late += 1
+                    continue
+                if stamp <= session[LAST_SEEN] + timeout:
+                    if stamp > session[LAST_SEEN]:
+                        session[LAST_SEEN] = stamp
+                    elif stamp < session[FIRST_SEEN]:
+                        session[START] = time_local
+                        session[FIRST_SEEN] = stamp
+                    session[REQUESTS] += 1
+                    continue
+                close(session)
+
+            sequence += 1
+            active[key] = [time_local, stamp, stamp, 1, sequence]
+            push(heap, (stamp, sequence, key))
+
+        self._sequence = sequence
+        self.late_requests += late
+        self.peak_active = max(self.peak_active, len(active))
+        self.watermark = max(self.watermark, *stamps.values())
+        self._evict()
+        self._flush()
+
+    def merge(self, other: "SessionAccumulator") -> "SessionAccumulator":
+        """Объединяет сессии следующей по времени части потока (на месте).
+
+        Активные сессии клиента из двух частей склеиваются, если разрыв
+        между ними (в любую сторону) не больше timeout; сессии, закрытые
+        внутри частей, не склеиваются.
+        """
+        if other.timeout != self.timeout:
+            msg = "Нельзя объединить сессии с разным таймаутом"
+            raise ValueError(msg)
+
+        self.sessions_per_day.update(other.sessions_per_day)
+        self.durations.merge(other.durations)
+        self.requests.merge(other.requests)
+        self.peak_active = max(self.peak_active, other.peak_active)
+        self.late_requests += other.late_requests
+
+        for key, session in other.active.items():
+            own = self.active.get(key)
+            if own is not None:
+                if (
+                    session[FIRST_SEEN] <= own[LAST_SEEN] + self.timeout
+                    and session[LAST_SEEN] >= own[FIRST_SEEN] - self.timeout
+                ):
+                    if session[FIRST_SEEN] < own[FIRST_SEEN]:
+                        own[START] = session[START]
+                        own[FIRST_SEEN] = session[FIRST_SEEN]
+                    own[LAST_SEEN] = max(own[LAST_SEEN], session[LAST_SEEN])
+                    own[REQUESTS] += session[REQUESTS]
+                    continue
+                if session[LAST_SEEN] < own[FIRST_SEEN]:
+                    # Более ранняя сессия other не прерывает текущую
+                    self._close(session)
+                    continue
+                self._close(own)
+            self._sequence += 1
+            self.active[key] = [*session[:SEQUENCE], self._sequence]
+            heapq.heappush(self.heap, (session[LAST_SEEN], self._sequence, key))
+
+        self.watermark = max(self.watermark, other.watermark)
+        self._evict()
+        self._flush()
+        return self
+
+    def summary(self) -> dict[str, Any]:
+        """Статистика всех сессий: закрытых и еще активных в конце потока."""
+        sessions_per_day = self.sessions_per_day.copy()
+        durations = HdrHistogram().merge(self.durations)
+        requests = HdrHistogram().merge(self.requests)
+        sessions_per_day.update(
+            date.toordinal(session[START]) for session in self.active.values()
+        )
+        durations.extend(
+            [round(s[LAST_SEEN] - s[FIRST_SEEN]) for s in self.active.values()]
+        )
+        requests.extend([session[REQUESTS] for session in self.active.values()])
+
+        return {
+            "idleTimeoutSeconds": self.timeout,
+            "totalSessions": durations.count,
+            "activeAtEnd": len(self.active),
+            "peakActiveSessions": self.peak_active,
+            "lateRequests": self.late_requests,
+            "durationSeconds": self._describe(durations),
+            "requestsPerSession": self._describe(requests),
+            "sessionsPerDate": [
+                {"date": date.fromordinal(ordinal).isoformat(), "totalSessions": count}
+                for ordinal, count in sorted(sessions_per_day.items())
+            ],
+        }
+
+    @staticmethod
+    def _describe(histogram: HdrHistogram) -> dict[str, float]:
+        """Среднее, перцентили и максимум гистограммы."""
+        return {
+            "mean": round(histogram.mean, 2),
+            "p50": round(histogram.quantile(50), 2),
+            "p90": round(histogram.quantile(90), 2),
+            "p99": round(histogram.quantile(99), 2),
+            "max": histogram.max,
+        }
+
+    def _close(self, session: list[Any]) -> None:
+        """Сворачивает закрытую сессию в счетчики (без удаления из таблицы)."""
+        self.sessions_per_day[date.toordinal(session[START])] += 1
+        self._closed_durations.append(round(session[LAST_SEEN] - session[FIRST_SEEN]))
+        self._closed_requests.append(session[REQUESTS])
+
+    def _evict(self) -> None:
+        """Закрывает сессии, неактивные дольше timeout относительно watermark."""
+        heap, active, deadline = self.heap, self.active, self.watermark - self.timeout
+        while heap and heap[0][0] < deadline:
+            _, sequence, key = heapq.heappop(heap)
+            session = active.get(key)
+            if session is None or session[SEQUENCE] != sequence:
+                continue
+            if session[LAST_SEEN] < deadline:
+                self._close(session)
+                del active[key]
+            else:
+                heapq.heappush(heap, (session[LAST_SEEN], sequence, key))
+
+    def _flush(self) -> None:
+        """Переносит длительности и размеры закрытых сессий в гистограммы."""
+        if self._closed_durations:
+            self.durations.extend(self._closed_durations)
+            self.requests.extend(self._closed_requests)
+            self._closed_durations.clear()
+            self._closed_requests.clear()
@@ -0,0 +1,85 @@
+"""Аккумулятор размеров ответов.
+
+Отвечает ТОЛЬКО за потоковый сбор размеров для выбранного метода перцентиля.
+"""
+
+from array import array
+from collections.abc import Sequence
+
+from src.domain.calculators.quantile_sketch import QuantileSketch
+from src.domain.calculators.reservoir_sampler import ReservoirSampler
+
+
+class SizeAccumulator:
+    """Собирает размеры ответов блоками.
+
+    Количество, сумма и максимум считаются точно при любом методе,
+    а для перцентиля хранится только то, что нужно методу:
+    - exact: все значения в массиве int64 (8 байт на запись)
+    - sketch: логарифмические корзины QuantileSketch
+    - sample: reservoir-выборка ReservoirSampler
+    """
+
+    modes = ("exact", "sketch", "sample")
+
+    def __init__(
+        self,
+        mode: str = "exact",
+        relative_error: float = QuantileSketch.default_relative_error,
+        sample_size: int = ReservoirSampler.default_size,
+        seed: int | None = 0,
+    ) -> None:
+        if mode not in self.modes:
+            msg = (
+                f"Неизвестный метод перцентиля: '{mode}'. "
+                f"Поддерживаемые: {', '.join(self.modes)}"
+            )
+            raise ValueError(msg)
+
+        self.mode = mode
+        self.count = 0
+        self.total = 0
+        self.maximum = 0
+        self.values = array("q")
+        self.sketch = QuantileSketch(relative_error) if mode == "sketch" else None
+        self.sampler = (
+            ReservoirSampler(sample_size, seed=seed) if mode == "sample" else None
+        )
+
+    def __len__(self) -> int:
+        return self.count
+
+    def extend(self, sizes: Sequence[int]) -> None:
+        """Добавляет блок размеров (колонку пакета)."""
+        if not len(sizes):
+            return
+
+        self.count += len(sizes)
+        if self.mode == "exact":
+            # Сумма и максимум считаются векторно по массиву в конце
+            self.values.extend(sizes)
+            return
+
+        self.total += sum(sizes)
+        batch_maximum = max(sizes)
+        self.maximum = max(self.maximum, batch_maximum)
+        if self.sketch is not None:
+            self.sketch.extend(sizes)
+        else:
+            self.sampler.extend(sizes)
+
+    def merge(self, other: "SizeAccumulator") -> "SizeAccumulator":
+        """Объединяет аккумулятор другой части потока с текущим (на месте)."""
+        if other.mode != self.mode:
+            msg = "Нельзя объединить размеры, собранные разными методами"
+            raise ValueError(msg)
+
+        self.count += other.count
+        self.total += other.total
+        self.maximum = max(self.maximum, other.maximum)
+        self.values.extend(other.values)
+        if self.sketch is not None:
+            self.sketch.merge(other.sketch)
+        if self.sampler is not None:
+            self.sampler.merge(other.sampler)
+        return self
@@ -0,0 +1,178 @@
+"""Аккумулятор временных рядов запросов.
+
+Отвечает ТОЛЬКО за подсчет запросов, байт и классов статусов по временным корзинам.
+"""
+
+from datetime import UTC, date, datetime, timedelta
+from operator import attrgetter
+from typing import Any, ClassVar
+
+import numpy as np
+
+from src.models.log_batch import LogBatch
+
+
+class TimeSeriesAccumulator:
+    """Плотные счетчики по временным корзинам фиксированной ширины.
+
+    Корзина - номер интервала настенного времени (локальное время записи,
+    как в DateFilterService) от начала эпохи. Счетчики хранятся в массивах
+    numpy, индексированных смещением корзины от origin; массивы
+    расширяются в обе стороны, поэтому порядок строк и файлов не важен.
+
+    Для каждой корзины считаются запросы, отправленные байты и запросы
+    по классам статусов 1xx-5xx.
+    """
+
+    granularities: ClassVar[dict[str, int]] = {
+        "minute": 60,
+        "5min": 300,
+        "hour": 3600,
+    }
+    default_granularity = "minute"
+    status_classes = ("1xx", "2xx", "3xx", "4xx", "5xx")
+
+    epoch_ordinal = date(1970, 1, 1).toordinal()
+    seconds_per_day = 86400
+
+    # Защита от выбросов во времени: около 2 лет поминутных корзин
+    max_buckets = 1 << 20
+
+    def __init__(self, granularity: str = default_granularity) -> None:
+        if granularity not in self.granularities:
+            msg = (
+                f"Неизвестная гранулярность временного ряда: '{granularity}'. "
+                f"Поддерживаемые: {', '.join(self.granularities)}"
+            )
+            raise ValueError(msg)
+
+        self.granularity = granularity
+        self.bucket_seconds = self.granularities[granularity]
+        self.origin = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.bytes = np.zeros(0, dtype=np.int64)
+        self.statuses = np.zeros((0, len(self.status_classes)), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def add_batch(self, batch: LogBatch) -> None:
+        """Добавляет пакет: номера корзин считаются векторно по колонкам."""
+        if not len(batch):
+            return
+
+        buckets = self._buckets(batch.time_local)
+        low, high = int(buckets.min()), int(buckets.max())
+        self._ensure(low, high)
+
+        offsets = buckets - self.origin
+        length = len(self.counts)
+        sizes = np.asarray(batch.body_bytes_sent, dtype=np.int64)
+        classes = np.clip(np.asarray(batch.status, dtype=np.int64) // 100, 1, 5) - 1
+
+        self.counts += np.bincount(offsets, minlength=length)
+        self.bytes += np.rint(
+            np.bincount(offsets, weights=sizes, minlength=length)
+        ).astype(np.int64)
+        width = len(self.status_classes)
+        self.statuses += np.bincount(
+            offsets * width + classes, minlength=length * width
+        ).reshape(length, width)
+
+    def merge(self, other: "TimeSeriesAccumulator") -> "TimeSeriesAccumulator":
+        """Объединяет ряд другой части потока с текущим (на месте)."""
+        if other.bucket_seconds != self.bucket_seconds:
+            msg = "Нельзя объединить временные ряды с разной гранулярностью"
+            raise ValueError(msg)
+        if not len(other):
+            return self
+
+        self._ensure(other.origin, other.origin + len(other) - 1)
+        start = other.origin - self.origin
+        end = start + len(other)
+        self.counts[start:end] += other.counts
+        self.bytes[start:end] += other.bytes
+        self.statuses[start:end] += other.statuses
+        return self
+
+    def buckets(self) -> list[dict[str, Any]]:
+        """Все корзины от первой до последней (включая пустые)."""
+        start = datetime.fromtimestamp(self.origin * self.bucket_seconds, UTC).replace(
+            tzinfo=None
+        )
+        step = timedelta(seconds=self.bucket_seconds)
+        return [
+            {
+                "start": (start + step * index).isoformat(),
+                "totalRequestsCount": int(self.counts[index]),
+                "totalBytes": int(self.bytes[index]),
+                "statusClasses": dict(
+                    zip(
+                        self.status_classes,
+                        map(int, self.statuses[index]),
+                        strict=True,
+                    )
+                ),
+            }
+            for index in range(len(self.counts))
+        ]
+
+    @classmethod
+    def wall_clock_minutes(cls, times: list[datetime]) -> np.ndarray:
+        """Секунды настенного времени от начала эпохи с точностью до минуты."""
+        count = len(times)
+        ordinals = np.fromiter(map(date.toordinal, times), np.int64, count)
+        hours = np.fromiter(map(attrgetter("hour"), times), np.int64, count)
+        minutes = np.fromiter(map(attrgetter("minute"), times), np.int64, count)
+        return (
+            (ordinals - cls.epoch_ordinal) * cls.seconds_per_day
+            + hours * 3600
+            + minutes * 60
+        )
+
+    @staticmethod
+    def bucket_start(bucket: int, bucket_seconds: int) -> str:
+        """Начало корзины в ISO-формате настенного времени."""
+        return (
+            datetime.fromtimestamp(bucket * bucket_seconds, UTC)
+            .replace(tzinfo=None)
+            .isoformat()
+        )
+
+    def _buckets(self, times: list[datetime]) -> np.ndarray:
+        """Номера корзин настенного времени для колонки времени."""
+        return self.wall_clock_minutes(times) // self.bucket_seconds
+
+    def _ensure(self, low: int, high: int) -> None:
+        """Расширяет массивы, чтобы они покрывали корзины [low, high].
+
+        Raises:
+            ValueError: Если диапазон превышает max_buckets корзин
+
+        """
+        if len(self.counts):
+            low = min(low, self.origin)
+            high = max(high, self.origin + len(self.counts) - 1)
+        if high - low + 1 > self.max_buckets:
+            msg = (
+                f"Временной ряд превышает {self.max_buckets:,} корзин; "
+                "выберите более крупную гранулярность"
+            )
+            raise ValueError(msg)
+
+        if not len(self.counts):
+            self.origin = low
+            self._resize(0, high - low + 1)
+            return
+
+        before = max(0, self.origin - low)
+        after = max(0, high - (self.origin + len(self.counts) - 1))
+        if before or after:
+            self.origin -= before
+            self._resize(before, after)
+
+    def _resize(self, before: int, after: int) -> None:
+        """Добавляет нулевые корзины в начало и конец массивов."""
+        self.counts = np.pad(self.counts, (before, after))
+        self.bytes = np.pad(self.bytes, (before, after))
+        self.statuses = np.pad(self.statuses, ((before, after), (0, 0)))
@@ -0,0 +1,166 @@
+"""Аккумулятор времени ответа.
+
+Отвечает ТОЛЬКО за квантили request_time и upstream_response_time,
+общие и по популярным ресурсам.
+"""
+
+from dataclasses import dataclass, field
+from itertools import compress
+from typing import Any
+
+import numpy as np
+
+from src.domain.accumulators.batch_view import BatchView
+from src.domain.calculators.hdr_histogram import HdrHistogram
+from src.domain.calculators.space_saving import SpaceSaving
+
+
+@dataclass(slots=True)
+class TimingState:
+    """Время ответа ресурса с момента попадания в сводку.
+
+    Значения копятся в буфере и добавляются в гистограмму блоками;
+    гистограмма создается при первом переносе буфера.
+    """
+
+    histogram: HdrHistogram | None = None
+    buffer: list[int] = field(default_factory=list)
+
+    def add(self, values: list[int], flush_size: int) -> None:
+        """Добавляет время ответа запросов пакета (в микросекундах)."""
+        self.buffer.extend(values)
+        if len(self.buffer) >= flush_size:
+            self.flush()
+
+    def flush(self) -> HdrHistogram:
+        """Переносит буфер в гистограмму."""
+        if self.histogram is None:
+            self.histogram = HdrHistogram()
+        if self.buffer:
+            self.histogram.extend(self.buffer)
+            self.buffer.clear()
+        return self.histogram
+
+    def merge(self, other: "TimingState") -> "TimingState":
+        """Объединяет состояние другой части потока с текущим (на месте)."""
+        self.flush().merge(other.flush())
+        return self
+
+
+class TimingAccumulator:
+    """Гистограммы HDR времени ответа.
+
+    request_time и upstream_response_time (секунды из лога) переводятся
+    в микросекунды и идут в общие гистограммы фиксированного размера;
+    строки без тайминга ("-" или формат без таймингов) не учитываются.
+
+    Популярные ресурсы отбираются сводкой SpaceSaving по числу запросов
+    с request_time на capacity ключей; гистограмма ресурса хранится,
+    пока ключ в сводке, и считается с момента его попадания туда.
+    """
+
+    default_capacity = 100
+    flush_size = 256
+    percentiles = (50, 90, 99, 99.9)
+
+    def __init__(self, capacity: int = default_capacity) -> None:
+        self.capacity = capacity
+        self.request_time = HdrHistogram()
+        self.upstream_response_time = HdrHistogram()
+        self.requests = SpaceSaving(capacity)
+        self.stats: dict[str, TimingState] = {}
+
+    @staticmethod
+    def to_microseconds(seconds: list[float | None]) -> list[int]:
+        """Секунды → целые микросекунды; None пропускаются."""
+        present = [value for value in seconds if value is not None]
+        if not present:
+            return []
+        return np.rint(np.asarray(present) * 1_000_000).astype(np.int64).tolist()
+
+    def add_batch(self, view: BatchView) -> None:
+        """Добавляет тайминги пакета в общие гистограммы и гистограммы ресурсов."""
+        batch = view.batch
+        upstream = self.to_microseconds(batch.upstream_response_time)
+        self.upstream_response_time.extend(upstream)
+
+        timed = [value is not None for value in batch.request_time]
+        request_times = self.to_microseconds(batch.request_time)
+        if not request_times:
+            return
+        self.request_time.extend(request_times)
+
+        times_by_resource: dict[str, list[int]] = {}
+        get = times_by_resource.get
+        for resource, value in zip(
+            compress(view.column("resource"), timed), request_times, strict=True
+        ):
+            values = get(resource)
+            if values is None:
+                times_by_resource[resource] = [value]
+            else:
+                values.append(value)
+
+        self.requests.update(
+            {resource: len(values) for resource, values in times_by_resource.items()}
+        )
+        self._drop_evicted()
+
+        tracked, stats = self.requests.counts, self.stats
+        for resource, values in times_by_resource.items():
+            if resource in tracked:
+                state = stats.get(resource)
+                if state is None:
+                    state = stats[resource] = TimingState()
+                state.add(values, self.flush_size)
+
+    def merge(self, other: "TimingAccumulator") -> "TimingAccumulator":
+        """Объединяет гистограммы и сводку другой части потока (на месте)."""
+        self.request_time.merge(other.request_time)
+        self.upstream_response_time.merge(other.upstream_response_time)
+        self.requests.merge(other.requests)
+        self._drop_evicted()
+        for resource, state in other.stats.items():
+            if resource not in self.requests.counts:
+                continue
+            own = self.stats.get(resource)
+            if own is None:
+                self.stats[resource] = state
+            else:
+                own.merge(state)
+        return self
+
+    @classmethod
+    def quantiles(cls, histogram: HdrHistogram) -> dict[str, float]:
+        """Перцентили гистограммы в миллисекундах: {"p50": ..., "p99.9": ...}."""
+        return {
+            f"p{percentile:g}": round(histogram.quantile(percentile) / 1000, 3)
+            for percentile in cls.percentiles
+        }
+
+    @classmethod
+    def summary(cls, histogram: HdrHistogram) -> dict[str, Any]:
+        """Число значений, среднее, максимум и перцентили в миллисекундах."""
+        return {
+            "count": histogram.count,
+            "mean": round(histogram.mean / 1000, 3),
+            "max": round(histogram.max / 1000, 3),
+            **cls.quantiles(histogram),
+        }
+
+    def top(self, limit: int) -> list[dict[str, Any]]:
+        """Ресурсы по убыванию числа запросов с перцентилями request_time."""
+        return [
+            {
+                "resource": resource,
+                "totalRequestsCount": count,
+                "error": error,
+                **self.quantiles(self.stats.get(resource, TimingState()).flush()),
+            }
+            for resource, count, error in self.requests.top(limit)
+        ]
+
+    def _drop_evicted(self) -> None:
+        """Удаляет гистограммы ресурсов, вытесненных из сводки."""
+        for resource in self.stats.keys() - self.requests.counts.keys():
+            del self.stats[resource]
@@ -0,0 +1,121 @@
+"""Аккумулятор самых активных клиентов.
+
+Отвечает ТОЛЬКО за top-K адресов (или подсетей) по запросам и по байтам.
+"""
+
+from collections import Counter
+from typing import Any
+
+from src.domain.calculators.space_saving import SpaceSaving
+from src.domain.services.ip_address_packer import IpAddressPacker
+from src.models.log_batch import LogBatch
+
+
+class TopClientsAccumulator:
+    """Топ клиентов по числу запросов и по body_bytes_sent.
+
+    Ключ - адрес как 128-битное целое (IpAddressPacker). С rollup адрес
+    сворачивается в подсеть /24 (IPv4) или /48 (IPv6) маской.
+
+    Частоты пакета считаются точно и добавляются в две сводки
+    SpaceSaving, поэтому память ограничена capacity ключами даже при
+    сканировании с миллионов адресов. Строки, где remote_addr не IP,
+    учитываются только счетчиком invalid.
+    """
+
+    default_capacity = SpaceSaving.default_capacity
+    default_cache_size = 65536
+
+    ipv4_prefix = 24
+    ipv6_prefix = 48
+
+    def __init__(
+        self,
+        capacity: int = default_capacity,
+        *,
+        rollup: bool = False,
+        cache_size: int = default_cache_size,
+    ) -> None:
+        self.capacity = capacity
+        self.rollup = rollup
+        self.cache_size = cache_size
+        self.requests = SpaceSaving(capacity)
+        self.bytes = SpaceSaving(capacity)
+        self.invalid = 0
+        # Адрес → ключ (None для не-IP); повторяется между пакетами
+        self._cache: dict[str, int | None] = {}
+
+    def add_batch(self, batch: LogBatch) -> None:
+        """Считает запросы и байты по ключам пакета и добавляет их в сводки."""
+        if not len(batch):
+            return
+
+        addresses = Counter(batch.remote_addr)
+        keys = {address: self.key(address) for address in addresses}
+
+        requests: Counter[int] = Counter()
+        for address, count in addresses.items():
+            key = keys[address]
+            if key is None:
+                self.invalid += count
+            else:
+                requests[key] += count
+
+        sent: Counter[int] = Counter()
+        for address, size in zip(batch.remote_addr, batch.body_bytes_sent, strict=True):
+            key = keys[address]
+            if key is not None:
+                sent[key] += size
+
+        self.requests.update(requests)
+        self.bytes.update(sent)
+
+    def merge(self, other: "TopClientsAccumulator") -> "TopClientsAccumulator":
+        """Объединяет сводки другой части потока с текущими (на месте)."""
+        if other.rollup != self.rollup:
+            msg = "Нельзя объединить топ адресов и топ подсетей"
+            raise ValueError(msg)
+
+        self.requests.merge(other.requests)
+        self.bytes.merge(other.bytes)
+        self.invalid += other.invalid
+        return self
+
+    def key(self, address: str) -> int | None:
+        """Ключ адреса с учетом rollup (с ограниченным кэшем)."""
+        cache = self._cache
+        if address in cache:
+            return cache[address]
+
+        key = IpAddressPacker.pack(address)
+        if key is not None and self.rollup:
+            key = IpAddressPacker.prefix(key, self.ipv4_prefix, self.ipv6_prefix)
+        if len(cache) >= self.cache_size:
+            cache.clear()
+        cache[address] = key
+        return key
+
+    def unpack(self, key: int) -> str:
+        """Ключ → адрес или подсеть для отчета."""
+        address = IpAddressPacker.unpack(key)
+        if not self.rollup:
+            return address
+        prefix = self.ipv4_prefix if IpAddressPacker.is_ipv4(key) else self.ipv6_prefix
+        return f"{address}/{prefix}"
+
+    def top(self, limit: int) -> dict[str, list[dict[str, Any]]]:
+        """Топ по запросам и по байтам с максимальной ошибкой оценки."""
+        return {
+            "byRequests": [
+                {
+                    "client": self.unpack(key),
+                    "totalRequestsCount": count,
+                    "error": error,
+                }
+                for key, count, error in self.requests.top(limit)
+            ],
+            "byBytes": [
+                {"client": self.unpack(key), "totalBytes": count, "error": error}
+                for key, count, error in self.bytes.top(limit)
+            ],
+        }
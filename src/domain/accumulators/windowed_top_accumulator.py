@@ -0,0 +1,158 @@
+"""Аккумулятор топа ресурсов по временным окнам.
+
+Отвечает ТОЛЬКО за топ-K ресурсов по числу запросов в каждом окне времени.
+"""
+
+from collections import Counter
+from typing import Any
+
+from src.domain.accumulators.batch_view import BatchView
+from src.domain.accumulators.time_series_accumulator import TimeSeriesAccumulator
+from src.domain.calculators.space_saving import SpaceSaving
+
+
+class WindowedTopAccumulator:
+    """Топ ресурсов в окнах настенного времени фиксированной ширины.
+
+    У каждого открытого окна своя сводка SpaceSaving на capacity ресурсов.
+    Окно закрывается, когда поток уходит дальше его конца на lateness
+    секунд: сводка сжимается до top_size самых частых ресурсов
+    (SpaceSaving.shrink) и больше не меняется. Поэтому память - открытые
+    окна по capacity ключей плюс закрытые по top_size, а не число окон,
+    умноженное на число уникальных URI. Строки уже закрытых окон не
+    учитываются (lateRequests): поток должен быть упорядочен по времени
+    с точностью до lateness.
+
+    Ресурсы берутся из общей производной колонки BatchView, поэтому
+    строки запроса повторно не разбираются.
+    """
+
+    default_window = 60 * 60
+    default_capacity = 100
+    lateness = 5 * 60
+
+    def __init__(
+        self,
+        window: int = default_window,
+        capacity: int = default_capacity,
+        top_size: int = 10,
+    ) -> None:
+        self.window = window
+        self.capacity = capacity
+        # Сжатая сводка не может быть больше полной
+        self.top_size = min(top_size, capacity)
+        self.open: dict[int, SpaceSaving] = {}
+        self.closed: dict[int, SpaceSaving] = {}
+        self.watermark: int | None = None
+        self.late_requests = 0
+
+    def add_batch(self, view: BatchView) -> None:
+        """Раскладывает ресурсы пакета по окнам и закрывает пройденные окна."""
+        batch = view.batch
+        if not len(batch):
+            return
+
+        times = dict.fromkeys(batch.time_local)
+        seconds = TimeSeriesAccumulator.wall_clock_minutes(list(times))
+        windows = dict(zip(times, (seconds // self.window).tolist(), strict=True))
+
+        if len(set(windows.values())) == 1:
+            # Весь пакет в одном окне: частоты ресурсов по уникальным запросам
+            counts: Counter[str] = Counter()
+            for resource, count in zip(
+                view.resources, view.request_counts.values(), strict=True
+            ):
+                counts[resource] += count
+            self._add(next(iter(windows.values())), counts)
+        else:
+            per_window: dict[int, Counter[str]] = {}
+            for time_local, resource in zip(
+                batch.time_local, view.column("resource"), strict=True
+            ):
+                window = windows[time_local]
+                counts = per_window.get(window)
+                if counts is None:
+                    counts = per_window[window] = Counter()
+                counts[resource] += 1
+            for window, counts in per_window.items():
+                self._add(window, counts)
+
+        high = int(seconds.max())
+        self.watermark = high if self.watermark is None else max(self.watermark, high)
+        self._close_passed()
+
+    def merge(self, other: "WindowedTopAccumulator") -> "WindowedTopAccumulator":
+        """Объединяет окна другой части потока с текущими (на месте).
+
+        Окно, закрытое хотя бы в одной части, объединяется сжатыми
+        сводками; окна, открытые в обеих, - полными.
+        """
+        if (other.window, other.capacity, other.top_size) != (
+            self.window,
+            self.capacity,
+            self.top_size,
+        ):
+            msg = "Нельзя объединить топы окон с разными окном или размером сводки"
+            raise ValueError(msg)
+
+        self.late_requests += other.late_requests
+        for window, summary in other.closed.items():
+            own = self.open.pop(window, None)
+            if own is not None:
+                self.closed[window] = own.shrink(self.top_size)
+            if window in self.closed:
+                self.closed[window].merge(summary)
+            else:
+                self.closed[window] = summary
+        for window, summary in other.open.items():
+            if window in self.closed:
+                self.closed[window].merge(summary.shrink(self.top_size))
+            elif window in self.open:
+                self.open[window].merge(summary)
+            else:
+                self.open[window] = summary
+
+        if other.watermark is not None:
+            self.watermark = max(self.watermark or other.watermark, other.watermark)
+            self._close_passed()
+        return self
+
+    def summary(self) -> list[dict[str, Any]]:
+        """Окна по времени с топом ресурсов (открытые окна не закрываются)."""
+        windows = {
+            **self.closed,
+            **{
+                window: summary.shrink(self.top_size)
+                for window, summary in self.open.items()
+            },
+        }
+        return [
+            {
+                "start": TimeSeriesAccumulator.bucket_start(window, self.window),
+                "totalRequestsCount": windows[window].total,
+                "resources": [
+                    {"resource": resource, "totalRequestsCount": count, "error": error}
+                    for resource, count, error in windows[window].top(self.top_size)
+                ],
+            }
+            for window in sorted(windows)
+        ]
+
+    def _add(self, window: int, counts: Counter[str]) -> None:
+        """Добавляет частоты ресурсов в сводку окна."""
+        if self.watermark is not None and self._passed(window):
+            self.late_requests += counts.total()
+            return
+        summary = self.open.get(window)
+        if summary is None:
+            summary = self.open[window] = SpaceSaving(self.capacity)
+        summary.update(counts)
+
+    def _close_passed(self) -> None:
+        """Сжимает сводки окон, от конца которых поток ушел дальше lateness."""
+        for window in [window for window in self.open if self._passed(window)]:
+            self.closed[window] = self.open.pop(window).shrink(self.top_size)
+
+    def _passed(self, window: int) -> bool:
+        """Ушел ли поток дальше конца окна на lateness секунд."""
+        return (window + 1) * self.window <= self.watermark - self.lateness
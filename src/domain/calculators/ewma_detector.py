@@ -0,0 +1,59 @@
+"""Детектор выбросов по экспоненциально взвешенному среднему.
+
+Отвечает ТОЛЬКО за z-оценку значения ряда относительно скользящей базы.
+"""
+
+import math
+
+
+class EwmaDetector:
+    """Скользящие среднее и дисперсия EWMA с z-оценкой нового значения.
+
+    База обновляется за O(1) на значение и хранит три числа:
+    mean += alpha * (x - mean),
+    variance = (1 - alpha) * (variance + alpha * (x - mean)^2).
+    alpha = 2 / (window + 1), как у скользящего среднего на window точек.
+
+    Значение оценивается по базе до его добавления:
+    z = (x - mean) / max(std, min_std). min_std не дает малой дисперсии
+    спокойного участка превратить любое отклонение в выброс. Первые
+    warmup значений только обучают базу. baseline - среднее, с которым
+    сравнивалось последнее значение.
+    """
+
+    def __init__(
+        self, window: int, threshold: float, min_std: float, warmup: int | None = None
+    ) -> None:
+        self.alpha = 2 / (window + 1)
+        self.threshold = threshold
+        self.min_std = min_std
+        self.warmup = window if warmup is None else warmup
+        self.mean = 0.0
+        self.variance = 0.0
+        self.count = 0
+        self.baseline = 0.0
+
+    def update(self, value: float) -> float | None:
+        """Добавляет значение; возвращает z-оценку, если это выброс, иначе None."""
+        if not self.count:
+            self.mean = value
+            self.count = 1
+            return None
+
+        self.baseline = self.mean
+        diff = value - self.mean
+        score = diff / max(math.sqrt(self.variance), self.min_std)
+        increment = self.alpha * diff
+        self.mean += increment
+        self.variance = (1 - self.alpha) * (self.variance + diff * increment)
+        self.count += 1
+
+        if self.count <= self.warmup or abs(score) < self.threshold:
+            return None
+        return score
+
+    def reset(self) -> None:
+        """Забывает базу (например, после долгого разрыва в данных)."""
+        self.mean = 0.0
+        self.variance = 0.0
+        self.count = 0
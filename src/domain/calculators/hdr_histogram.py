@@ -0,0 +1,122 @@
+"""Гистограмма HDR для длительностей.
+
+Отвечает ТОЛЬКО за потоковую оценку квантилей неотрицательных целых значений
+в фиксированном объеме памяти.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+
+class HdrHistogram:
+    """Лог-линейная гистограмма в духе HdrHistogram (Gil Tene).
+
+    Значения делятся на степени двойки, каждая степень - на half_count
+    линейных корзин, поэтому ширина корзины не превышает 1/half_count
+    значения: при sub_bucket_bits = 8 оценка квантиля отличается
+    от истинной не более чем на 0.4% (2 значащие цифры). Значения
+    меньше sub_bucket_count хранятся точно.
+
+    Индекс корзины: shift = max(bit_length(v) - sub_bucket_bits, 0),
+    index = shift * half_count + (v >> shift). Значения больше
+    highest_value учитываются в последней корзине, поэтому массив
+    счетчиков не превышает index(highest_value) + 1 элементов (около
+    3.3 тыс. для часа в микросекундах) и растет лениво до этой границы.
+    Количество, сумма, минимум и максимум считаются точно; гистограммы
+    объединяются сложением счетчиков.
+    """
+
+    sub_bucket_bits = 8
+    sub_bucket_count = 1 << sub_bucket_bits
+    half_count = sub_bucket_count // 2
+
+    # Час в микросекундах
+    default_highest_value = 3_600_000_000
+
+    def __init__(self, highest_value: int = default_highest_value) -> None:
+        if highest_value < self.sub_bucket_count:
+            msg = (
+                "Верхняя граница гистограммы должна быть не меньше "
+                f"{self.sub_bucket_count}"
+            )
+            raise ValueError(msg)
+
+        self.highest_value = highest_value
+        self.max_index = self.index(highest_value)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    @classmethod
+    def index(cls, value: int) -> int:
+        """Индекс корзины значения."""
+        shift = max(value.bit_length() - cls.sub_bucket_bits, 0)
+        return shift * cls.half_count + (value >> shift)
+
+    @classmethod
+    def bucket_midpoint(cls, index: int) -> float:
+        """Середина корзины с индексом index."""
+        if index < cls.sub_bucket_count:
+            return float(index)
+        shift = index // cls.half_count - 1
+        low = (index - shift * cls.half_count) << shift
+        return low + ((1 << shift) - 1) / 2
+
+    def extend(self, values: Sequence[int] | np.ndarray) -> None:
+        """Добавляет блок неотрицательных значений."""
+        values = np.asarray(values, dtype=np.int64)
+        if not len(values):
+            return
+
+        low, high = int(values.min()), int(values.max())
+        self.min = low if not self.count else min(self.min, low)
+        self.max = high if not self.count else max(self.max, high)
+        self.count += len(values)
+        self.total += int(values.sum())
+
+        # frexp дает показатель степени, равный bit_length для целых < 2^53
+        clamped = np.minimum(values, self.highest_value)
+        shifts = np.maximum(np.frexp(clamped)[1] - self.sub_bucket_bits, 0)
+        indexes = shifts * self.half_count + (clamped >> shifts)
+        self._add_counts(np.bincount(indexes))
+
+    def merge(self, other: "HdrHistogram") -> "HdrHistogram":
+        """Объединяет гистограмму другой части потока с текущей (на месте)."""
+        if other.highest_value != self.highest_value:
+            msg = "Нельзя объединить гистограммы с разной верхней границей"
+            raise ValueError(msg)
+        if not other.count:
+            return self
+
+        self._add_counts(other.counts)
+        self.min = other.min if not self.count else min(self.min, other.min)
+        self.max = other.max if not self.count else max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+        return self
+
+    @property
+    def mean(self) -> float:
+        """Точное среднее значение."""
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, percentile: float) -> float:
+        """Оценка перцентиля (0-100): середина корзины, в пределах [min, max]."""
+        if not self.count:
+            return 0.0
+
+        rank = (self.count - 1) * percentile / 100
+        cumulative = np.cumsum(self.counts)
+        index = int(np.searchsorted(cumulative, rank, side="right"))
+        return min(max(self.bucket_midpoint(index), self.min), self.max)
+
+    def _add_counts(self, counts: np.ndarray) -> None:
+        """Прибавляет счетчики корзин, расширяя массив при необходимости."""
+        if len(counts) > len(self.counts):
+            grown = np.zeros(len(counts), dtype=np.int64)
+            grown[: len(self.counts)] = self.counts
+            self.counts = grown
+        self.counts[: len(counts)] += counts
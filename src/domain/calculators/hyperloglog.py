@@ -0,0 +1,133 @@
+"""Вероятностный счетчик уникальных значений.
+
+Отвечает ТОЛЬКО за оценку числа различных строк в потоке.
+"""
+
+import math
+from collections.abc import Iterable
+from hashlib import blake2b
+
+import numpy as np
+
+
+class HyperLogLog:
+    """HyperLogLog (Flajolet et al., 2007) с 64-битным хешем.
+
+    Первые precision бит хеша выбирают регистр, в регистре хранится
+    максимальный ранг (позиция первой единицы) остальных бит. Память -
+    2^precision байт независимо от числа значений; относительная
+    стандартная ошибка оценки 1.04 / sqrt(2^precision).
+
+    Свойства:
+    - Детерминированность: хеш blake2b не зависит от PYTHONHASHSEED,
+      поэтому счетчики разных процессов совместимы
+    - Пакетность: значения подаются блоками, повторы внутри блока
+      хешируются один раз, регистры обновляются через np.maximum.at
+    - Слияние: merge() берет поэлементный максимум регистров
+    - Сериализация: to_bytes()/from_bytes()
+    """
+
+    default_precision = 14
+    min_precision = 4
+    max_precision = 18
+
+    hash_bits = 64
+
+    def __init__(self, precision: int = default_precision) -> None:
+        if not self.min_precision <= precision <= self.max_precision:
+            msg = (
+                f"Точность HyperLogLog должна быть от {self.min_precision} "
+                f"до {self.max_precision}"
+            )
+            raise ValueError(msg)
+
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def standard_error(self) -> float:
+        """Относительная стандартная ошибка оценки."""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def extend(self, values: Iterable[str]) -> None:
+        """Добавляет блок строк (колонку пакета)."""
+        unique = set(values)
+        if not unique:
+            return
+
+        digests = b"".join(
+            blake2b(value.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+            for value in unique
+        )
+        self.add_hashes(np.frombuffer(digests, dtype="<u8"))
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        """Добавляет готовые 64-битные хеши значений."""
+        rest_bits = self.hash_bits - self.precision
+        indexes = (hashes >> np.uint64(rest_bits)).astype(np.intp)
+        rest = hashes & np.uint64((1 << rest_bits) - 1)
+        ranks = (rest_bits + 1 - self._bit_length(rest)).astype(np.uint8)
+        np.maximum.at(self.registers, indexes, ranks)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Объединяет счетчик другой части потока с текущим (на месте)."""
+        if other.precision != self.precision:
+            msg = "Нельзя объединить счетчики HyperLogLog с разной точностью"
+            raise ValueError(msg)
+
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> int:
+        """Оценка числа уникальных значений."""
+        registers_count = len(self.registers)
+        raw = (
+            self._alpha(registers_count)
+            * registers_count**2
+            / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int64))))
+        )
+
+        # Поправка для малых мощностей: линейный подсчет по пустым регистрам
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * registers_count and zeros:
+            raw = registers_count * math.log(registers_count / zeros)
+
+        return round(raw)
+
+    def to_bytes(self) -> bytes:
+        """Сериализует счетчик: байт точности и регистры."""
+        return bytes((self.precision,)) + self.registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        """Восстанавливает счетчик из to_bytes().
+
+        Raises:
+            ValueError: Если размер данных не соответствует точности
+
+        """
+        if not data or len(data) != (1 << data[0]) + 1:
+            msg = "Размер данных HyperLogLog не соответствует точности"
+            raise ValueError(msg)
+
+        counter = cls(data[0])
+        counter.registers = np.frombuffer(data, dtype=np.uint8, offset=1).copy()
+        return counter
+
+    @staticmethod
+    def _alpha(registers_count: int) -> float:
+        """Поправочный коэффициент оценки для числа регистров."""
+        small = {16: 0.673, 32: 0.697, 64: 0.709}
+        return small.get(registers_count, 0.7213 / (1 + 1.079 / registers_count))
+
+    @staticmethod
+    def _bit_length(values: np.ndarray) -> np.ndarray:
+        """Длина в битах для массива uint64 (двоичный поиск сдвигами)."""
+        values = values.copy()
+        lengths = np.zeros(len(values), dtype=np.int64)
+        for shift in (32, 16, 8, 4, 2, 1):
+            high = values >= np.uint64(1 << shift)
+            lengths[high] += shift
+            values[high] >>= np.uint64(shift)
+        lengths += values > 0
+        return lengths
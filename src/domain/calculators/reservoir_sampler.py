@@ -0,0 +1,118 @@
+"""Потоковая равномерная выборка фиксированного размера.
+
+Отвечает ТОЛЬКО за поддержание reservoir-выборки по потоку значений.
+"""
+
+import math
+import random
+import sys
+from collections.abc import Sequence
+
+
+class ReservoirSampler:
+    """Reservoir sampling с пропусками (Algorithm L, Li 1994).
+
+    Вместо случайного числа на каждый элемент потока сразу вычисляется
+    номер следующего элемента, который попадет в выборку, поэтому
+    генератор вызывается O(k·log(n/k)) раз, а промежуточные элементы
+    пропускаются арифметикой индексов.
+
+    Свойства:
+    - Детерминированность: собственный random.Random с seed
+    - Потоковость: значения подаются блоками через extend(), результат
+      не зависит от разбиения потока на блоки
+    - Слияние: merge() объединяет выборки независимых частей потока
+    """
+
+    default_size = 10000
+
+    def __init__(
+        self,
+        size: int = default_size,
+        seed: int | None = 0,
+        rng: random.Random | None = None,
+    ) -> None:
+        if size <= 0:
+            msg = "Размер выборки должен быть положительным"
+            raise ValueError(msg)
+
+        self.size = size
+        self.rng = rng or random.Random(seed)
+        self.seen = 0
+        self.sample: list[int] = []
+        self._weight = 0.0
+        self._next = 0
+
+    def add(self, value: int) -> None:
+        """Добавляет одно значение потока."""
+        self.extend((value,))
+
+    def extend(self, values: Sequence[int]) -> None:
+        """Добавляет блок значений потока (список, array, np.ndarray)."""
+        start = self.seen
+        end = start + len(values)
+
+        # Фаза заполнения: первые size элементов попадают в выборку целиком
+        free = self.size - len(self.sample)
+        if free > 0:
+            self.sample.extend(int(value) for value in values[:free])
+            if len(self.sample) < self.size:
+                self.seen = end
+                return
+            self._weight = math.exp(math.log(self._random()) / self.size)
+            self._next = self.size - 1
+            self._schedule()
+
+        # Фаза пропусков: обращаемся только к выбранным элементам
+        randrange = self.rng.randrange
+        while self._next < end:
+            self.sample[randrange(self.size)] = int(values[self._next - start])
+            self._weight *= math.exp(math.log(self._random()) / self.size)
+            self._schedule()
+
+        self.seen = end
+
+    def merge(self, other: "ReservoirSampler") -> "ReservoirSampler":
+        """Объединяет выборку другой части потока с текущей (на месте).
+
+        Элементы берутся без возвращения пропорционально числу еще
+        не выбранных элементов каждой части, поэтому результат остается
+        равномерной выборкой объединенного потока.
+        """
+        if other.size != self.size:
+            msg = "Нельзя объединить выборки разного размера"
+            raise ValueError(msg)
+
+        left, right = self.sample[:], other.sample[:]
+        self.rng.shuffle(left)
+        self.rng.shuffle(right)
+        left_count, right_count = self.seen, other.seen
+
+        merged: list[int] = []
+        while len(merged) < self.size and (left_count or right_count):
+            if self.rng.random() * (left_count + right_count) < left_count:
+                merged.append(left.pop())
+                left_count -= 1
+            else:
+                merged.append(right.pop())
+                right_count -= 1
+
+        self.sample = merged
+        self.seen += other.seen
+
+        if len(self.sample) == self.size:
+            # Порог выборки - k-я порядковая статистика n равномерных ключей
+            self._weight = self.rng.betavariate(self.size, self.seen - self.size + 1)
+            self._next = self.seen - 1
+            self._schedule()
+
+        return self
+
+    def _schedule(self) -> None:
+        """Вычисляет индекс следующего элемента, попадающего в выборку."""
+        skip = math.floor(math.log(self._random()) / math.log1p(-self._weight))
+        self._next += skip + 1
+
+    def _random(self) -> float:
+        """Случайное число из (0, 1) для логарифмов."""
+        return self.rng.random() or sys.float_info.min
@@ -1,70 +1,141 @@
 """Вспомогательный калькулятор для статистики размеров ответов.
 
-С умным переключением между точным и приближенным расчетом.
+С явным выбором метода расчета перцентиля и оценкой его погрешности.
 """
 
-import random
+import math
+from array import array
+from collections.abc import Sequence
+from typing import Any
 
 import numpy as np
 
+from src.domain.accumulators.size_accumulator import SizeAccumulator
+from src.domain.calculators.quantile_sketch import QuantileSketch
+from src.domain.calculators.reservoir_sampler import ReservoirSampler
 
-class SizeStatisticsCalculator:
-    """Умный калькулятор статистики размеров.
-
-    Автоматически выбирает метод расчета для баланса точности и памяти.
-    """
 
-    def __init__(self, exact_threshold: int = 100000) -> None:
-        """exact_threshold: Переключение на приближенный расчет."""
-        self.exact_threshold = exact_threshold
+class SizeStatisticsCalculator:
+    """Калькулятор статистики размеров.
 
-    def calculate(self, sizes: list[int]) -> dict[str, float]:
-        """Рассчитывает статистику размеров с умным выбором алгоритма.
+    Метод расчета 95-го перцентиля выбирается явно (--percentile-mode):
+    - exact: точный расчет через np.partition, O(n) памяти
+    - sketch: QuantileSketch с заданной относительной ошибкой значения
+    - sample: reservoir-выборка заданного размера; ошибка ранга оценивается
+      неравенством Дворецкого-Кифера-Вольфовица
 
-        Правило:
-        - До 100k записей: точный расчет (numpy.percentile)
-        - Свыше 100k: приближенный расчет (reservoir sampling)
-        """
-        if not sizes:
-            return self._get_empty_stats()
+    Среднее и максимум всегда точные. Для приближенных методов в результат
+    добавляется p95Estimate с методом и границей ошибки.
+    """
 
-        # Базовые метрики (всегда точные)
-        total = sum(sizes)
-        max_size = max(sizes)
-        avg = round(total / len(sizes), 2)
+    modes = SizeAccumulator.modes
 
-        # Умный выбор метода для p95
-        if len(sizes) <= self.exact_threshold:
-            # Мало данных → ТОЧНЫЙ расчет
-            p95 = self._calculate_exact_percentile(sizes)
-        else:
-            # Много данных → ПРИБЛИЖЕННЫЙ расчет
-            p95 = self._calculate_approx_percentile(sizes)
+    # Доверительная вероятность границы ошибки для метода sample
+    sample_confidence = 0.95
 
-        return {"average": float(avg), "max": float(max_size), "p95": p95}
+    def __init__(
+        self,
+        mode: str = "exact",
+        relative_error: float = QuantileSketch.default_relative_error,
+        sample_size: int = ReservoirSampler.default_size,
+        seed: int | None = 0,
+    ) -> None:
+        """mode: Метод перцентиля; relative_error и sample_size - его точность.
 
-    def _calculate_exact_percentile(self, sizes: list[int]) -> float:
-        """Точный расчет 95-го перцентиля используя numpy."""
-        return float(round(np.percentile(sizes, 95), 2))
+        seed задает воспроизводимую reservoir-выборку.
+        """
+        self.mode = mode
+        self.relative_error = relative_error
+        self.sample_size = sample_size
+        self.seed = seed
+
+        # Проверка параметров до чтения данных
+        self.create_accumulator()
+
+    def create_accumulator(self) -> SizeAccumulator:
+        """Создает потоковый аккумулятор размеров для выбранного метода."""
+        return SizeAccumulator(
+            mode=self.mode,
+            relative_error=self.relative_error,
+            sample_size=self.sample_size,
+            seed=self.seed,
+        )
+
+    def calculate(
+        self, sizes: SizeAccumulator | Sequence[int] | array
+    ) -> dict[str, Any]:
+        """Рассчитывает статистику размеров выбранным методом.
+
+        Args:
+            sizes: Аккумулятор размеров или сами размеры
 
-    def _calculate_approx_percentile(self, sizes: list[int]) -> float:
-        """Приближенный расчет 95-го перцентиля используя reservoir sampling."""
-        sample = self._reservoir_sample(sizes, sample_size=10000)
-        return float(round(np.percentile(sample, 95), 2))
+        """
+        if not isinstance(sizes, SizeAccumulator):
+            accumulator = self.create_accumulator()
+            accumulator.extend(sizes)
+            sizes = accumulator
 
-    def _reservoir_sample(self, data: list[int], sample_size: int) -> list[int]:
-        """Reservoir sampling для случайной выборки."""
-        if len(data) <= sample_size:
-            return data.copy()
+        if not sizes.count:
+            return self._get_empty_stats()
 
-        reservoir = data[:sample_size]
+        estimate = None
+        if sizes.mode == "exact":
+            values = np.frombuffer(sizes.values, dtype=np.int64)
+            total = int(values.sum())
+            max_size = int(values.max())
+            p95 = self.partition_percentile(values, 95)
+        else:
+            total = sizes.total
+            max_size = sizes.maximum
+            if sizes.mode == "sketch":
+                p95 = sizes.sketch.quantile(95)
+                estimate = {
+                    "method": "sketch",
+                    "relativeError": sizes.sketch.relative_error,
+                }
+            else:
+                sampler = sizes.sampler
+                p95 = self.partition_percentile(np.asarray(sampler.sample), 95)
+                if sampler.seen > sampler.size:
+                    estimate = {
+                        "method": "sample",
+                        "sampleSize": sampler.size,
+                        "rankError": round(self.sample_rank_error(sampler.size), 4),
+                    }
+
+        avg = round(total / sizes.count, 2)
+        statistics: dict[str, Any] = {
+            "average": float(avg),
+            "max": float(max_size),
+            "p95": float(round(p95, 2)),
+        }
+        if estimate is not None:
+            statistics["p95Estimate"] = estimate
+        return statistics
+
+    @classmethod
+    def sample_rank_error(cls, sample_size: int) -> float:
+        """Граница ошибки ранга квантиля по выборке (неравенство DKW).
+
+        С вероятностью sample_confidence оценка p95 лежит между истинными
+        перцентилями 95 - 100·e и 95 + 100·e.
+        """
+        alpha = 1 - cls.sample_confidence
+        return math.sqrt(math.log(2 / alpha) / (2 * sample_size))
 
-        for i in range(sample_size, len(data)):
-            j = random.randint(0, i)
-            if j < sample_size:
-                reservoir[j] = data[i]
+    @staticmethod
+    def partition_percentile(values: np.ndarray, percentile: float) -> float:
+        """Точный перцентиль с линейной интерполяцией, как np.percentile.
 
-        return reservoir
+        Вместо сортировки np.partition ставит на место только два соседних
+        порядковых элемента: O(n) вместо O(n log n).
+        """
+        rank = (len(values) - 1) * percentile / 100
+        low = math.floor(rank)
+        high = min(low + 1, len(values) - 1)
+        part = np.partition(values, (low, high))
+        lower, upper = float(part[low]), float(part[high])
+        return lower + (upper - lower) * (rank - low)
 
     def _get_empty_stats(self) -> dict[str, float]:
         """Возвращает структуру пустой статистики."""
@@ -0,0 +1,105 @@
+"""Поиск самых частых (тяжелых) ключей потока.
+
+Отвечает ТОЛЬКО за взвешенный top-K с ограниченной памятью.
+"""
+
+import heapq
+from collections.abc import Hashable, Mapping
+from operator import itemgetter
+
+
+class SpaceSaving:
+    """Взвешенный Space-Saving (Metwally et al., 2005) с блочным слиянием.
+
+    Хранит не более capacity ключей. Оценка веса ключа завышена не более
+    чем на его error, а error не превышает total / capacity, поэтому
+    ключи с долей больше 1/capacity гарантированно остаются в сводке.
+
+    Блок (веса ключей пакета) - точная сводка, и добавляется тем же
+    правилом, что и merge() двух сводок (Agarwal et al., 2012): ключ,
+    отсутствующий в заполненной сводке, получает ее минимальный вес
+    как оценку ошибки, после чего остаются capacity самых тяжелых ключей.
+    """
+
+    default_capacity = 1000
+
+    def __init__(self, capacity: int = default_capacity) -> None:
+        if capacity <= 0:
+            msg = "Размер сводки должен быть положительным"
+            raise ValueError(msg)
+
+        self.capacity = capacity
+        self.total = 0
+        self.counts: dict[Hashable, int] = {}
+        self.errors: dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    @property
+    def floor(self) -> int:
+        """Наибольший возможный вес ключа, не попавшего в сводку."""
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def update(self, weights: Mapping[Hashable, int]) -> None:
+        """Добавляет точные веса ключей блока."""
+        self._combine(weights, {}, 0)
+        self.total += sum(weights.values())
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """Объединяет сводку другой части потока с текущей (на месте)."""
+        if other.capacity != self.capacity:
+            msg = "Нельзя объединить сводки разного размера"
+            raise ValueError(msg)
+
+        self._combine(other.counts, other.errors, other.floor)
+        self.total += other.total
+        return self
+
+    def top(self, limit: int) -> list[tuple[Hashable, int, int]]:
+        """Самые тяжелые ключи: (ключ, оценка веса, максимальная ошибка)."""
+        heaviest = heapq.nlargest(limit, self.counts.items(), key=itemgetter(1))
+        return [(key, count, self.errors[key]) for key, count in heaviest]
+
+    def shrink(self, capacity: int) -> "SpaceSaving":
+        """Сводка на capacity ключей из самых тяжелых ключей текущей.
+
+        Отброшенные ключи не тяжелее оставшихся, поэтому минимальный вес
+        новой сводки остается верхней границей их веса, и ее можно
+        объединять с другими сводками того же размера.
+        """
+        shrunk = SpaceSaving(capacity)
+        shrunk.total = self.total
+        for key, count, error in self.top(capacity):
+            shrunk.counts[key] = count
+            shrunk.errors[key] = error
+        return shrunk
+
+    def _combine(
+        self,
+        counts: Mapping[Hashable, int],
+        errors: Mapping[Hashable, int],
+        other_floor: int,
+    ) -> None:
+        """Слияние с весами другой сводки и усечение до capacity ключей."""
+        own_floor = self.floor
+        own_counts, own_errors = self.counts, self.errors
+
+        if other_floor:
+            # Ключи только этой сводки могли иметь в другой вес до other_floor
+            for key in own_counts.keys() - counts.keys():
+                own_counts[key] += other_floor
+                own_errors[key] += other_floor
+
+        for key, count in counts.items():
+            if key in own_counts:
+                own_counts[key] += count
+                own_errors[key] += errors.get(key, 0)
+            else:
+                own_counts[key] = count + own_floor
+                own_errors[key] = errors.get(key, 0) + own_floor
+
+        if len(own_counts) > self.capacity:
+            kept = heapq.nlargest(self.capacity, own_counts.items(), key=itemgetter(1))
+            self.counts = dict(kept)
+            self.errors = {key: own_errors[key] for key in self.counts}
@@ -0,0 +1,154 @@
+"""Классификация клиентов на ботов и людей по user agent.
+
+Отвечает ТОЛЬКО за сопоставление http_user_agent с сигнатурами ботов.
+"""
+
+import re
+from argparse import Namespace
+from collections.abc import Iterator
+from functools import cache, lru_cache
+
+from src.models.log_batch import LogBatch
+
+
+class BotClassifier:
+    """Сопоставляет user agent со списком сигнатур ботов и краулеров.
+
+    Все сигнатуры собраны в одно регулярное выражение без учета регистра,
+    поэтому строка просматривается один раз, а не по разу на сигнатуру.
+    Вердикты кэшируются по строке user agent в ограниченном LRU-кэше:
+    различных user agent на порядки меньше, чем строк лога. Пустой
+    user agent ("-") считается ботом: браузеры его всегда передают.
+    """
+
+    bot = "bot"
+    human = "human"
+    traffic_types = (bot, human)
+
+    # Сигнатуры по умолчанию: фрагменты регулярного выражения
+    default_signatures: tuple[str, ...] = (
+        r"bot\b",
+        "crawl",
+        "spider",
+        "slurp",
+        "scrap",
+        "archiver",
+        "indexer",
+        "facebookexternalhit",
+        "mediapartners-google",
+        "feedfetcher",
+        "headlesschrome",
+        "phantomjs",
+        "lighthouse",
+        "pingdom",
+        "uptimerobot",
+        r"^curl/",
+        r"^wget/",
+        "python-requests",
+        "python-urllib",
+        "aiohttp",
+        "httpx",
+        "go-http-client",
+        "okhttp",
+        "libwww-perl",
+        "apache-httpclient",
+        r"^java/",
+        "node-fetch",
+        "axios/",
+        "apt-http",
+        "zgrab",
+        "masscan",
+        "nmap",
+        "nikto",
+        "sqlmap",
+    )
+
+    default_cache_size = 65536
+
+    def __init__(
+        self,
+        signatures: tuple[str, ...] = (),
+        cache_size: int = default_cache_size,
+    ) -> None:
+        """signatures: Дополнительные сигнатуры к сигнатурам по умолчанию."""
+        self.signatures = (*signatures, *self.default_signatures)
+        self._search = self.compile(self.signatures).search
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+
+    @classmethod
+    @cache
+    def default(cls) -> "BotClassifier":
+        """Общий классификатор с сигнатурами по умолчанию."""
+        return cls()
+
+    @classmethod
+    def from_args(cls, args: Namespace | None) -> "BotClassifier":
+        """Классификатор с дополнительными сигнатурами --bot-pattern."""
+        signatures = cls.parse_signatures(getattr(args, "bot_pattern", None))
+        return cls(signatures) if signatures else cls.default()
+
+    @classmethod
+    def parse_signatures(cls, raw: list[str] | None) -> tuple[str, ...]:
+        """Проверяет сигнатуры --bot-pattern.
+
+        Raises:
+            ValueError: Если сигнатура пуста или не является регулярным выражением
+
+        """
+        signatures = tuple(item.strip() for item in raw or ())
+        for signature in signatures:
+            if not signature:
+                msg = "Сигнатура бота не может быть пустой"
+                raise ValueError(msg)
+            try:
+                re.compile(signature)
+            except re.error as e:
+                msg = f"Некорректное регулярное выражение сигнатуры '{signature}': {e}"
+                raise ValueError(msg) from e
+        return signatures
+
+    @classmethod
+    def validate_traffic(cls, traffic: str | None) -> None:
+        """Проверяет значение --traffic.
+
+        Raises:
+            ValueError: Если тип трафика не bot и не human
+
+        """
+        if traffic is not None and traffic not in cls.traffic_types:
+            msg = (
+                f"Неизвестный тип трафика '{traffic}'. "
+                f"Поддерживаемые: {', '.join(cls.traffic_types)}"
+            )
+            raise ValueError(msg)
+
+    @staticmethod
+    def compile(signatures: tuple[str, ...]) -> re.Pattern[str]:
+        """Собирает сигнатуры в одно выражение без учета регистра."""
+        return re.compile(
+            "|".join(f"(?:{signature})" for signature in signatures), re.IGNORECASE
+        )
+
+    def filter_batches(
+        self, batches: Iterator[LogBatch], traffic: str | None
+    ) -> Iterator[LogBatch]:
+        """Оставляет в пакетах только записи ботов или только людей.
+
+        Вердикт считается один раз на уникальный user agent пакета.
+        """
+        if traffic is None:
+            yield from batches
+            return
+
+        classify = self.classify
+        for batch in batches:
+            verdicts = dict.fromkeys(batch.http_user_agent)
+            for user_agent in verdicts:
+                verdicts[user_agent] = classify(user_agent) == traffic
+            yield batch.select(list(map(verdicts.__getitem__, batch.http_user_agent)))
+
+    def _classify(self, user_agent: str) -> str:
+        """Вердикт для строки user agent: bot или human."""
+        if not user_agent or user_agent == "-":
+            return self.bot
+        return self.bot if self._search(user_agent) else self.human
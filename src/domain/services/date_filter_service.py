@@ -1,11 +1,41 @@
+from collections.abc import Iterable, Iterator
 from datetime import datetime
 
+from src.domain.services.time_parser_service import TimeParserService
+from src.models.log_batch import LogBatch
 from src.models.log_entry import LogEntry
 
 
 class DateFilterService:
     """Сервис для фильтрации дат."""
 
+    @staticmethod
+    def resolve_bounds(
+        date_from_str: str | None, date_to_str: str | None
+    ) -> tuple[datetime | None, datetime | None]:
+        """Преобразует --from/--to в границы фильтра (включительно)."""
+        date_from = datetime.fromisoformat(date_from_str) if date_from_str else None
+        date_to = datetime.fromisoformat(date_to_str) if date_to_str else None
+
+        # Расширяем date_to до конца дня ВСЕГДА когда он указан
+        if date_to:
+            date_to = date_to.replace(hour=23, minute=59, second=59, microsecond=999999)
+
+        return date_from, date_to
+
+    @staticmethod
+    def resolve_epoch_bounds(
+        date_from_str: str | None, date_to_str: str | None
+    ) -> tuple[int | None, int | None]:
+        """Границы фильтра в настенных секундах эпохи (см. TimeParserService)."""
+        date_from, date_to = DateFilterService.resolve_bounds(
+            date_from_str, date_to_str
+        )
+        return (
+            TimeParserService.datetime_to_epoch(date_from) if date_from else None,
+            TimeParserService.datetime_to_epoch(date_to) if date_to else None,
+        )
+
     @staticmethod
     def filter_entries(
         entries: list[LogEntry], date_from_str: str, date_to_str: str
@@ -14,12 +44,9 @@ class DateFilterService:
         if not date_from_str and not date_to_str:
             return entries
 
-        date_from = datetime.fromisoformat(date_from_str) if date_from_str else None
-        date_to = datetime.fromisoformat(date_to_str) if date_to_str else None
-
-        # Расширяем date_to до конца дня ВСЕГДА когда он указан
-        if date_to:
-            date_to = date_to.replace(hour=23, minute=59, second=59, microsecond=999999)
+        date_from, date_to = DateFilterService.resolve_bounds(
+            date_from_str, date_to_str
+        )
 
         filtered_entries = []
         for entry in entries:
@@ -33,3 +60,26 @@ class DateFilterService:
             filtered_entries.append(entry)
 
         return filtered_entries
+
+    @staticmethod
+    def filter_batches(
+        batches: Iterable[LogBatch], date_from_str: str, date_to_str: str
+    ) -> Iterator[LogBatch]:
+        """Лениво фильтрует поток пакетов по датам."""
+        if not date_from_str and not date_to_str:
+            yield from batches
+            return
+
+        date_from, date_to = DateFilterService.resolve_bounds(
+            date_from_str, date_to_str
+        )
+
+        for batch in batches:
+            keep = [
+                (not date_from or entry_dt >= date_from)
+                and (not date_to or entry_dt <= date_to)
+                for entry_dt in (
+                    time_local.replace(tzinfo=None) for time_local in batch.time_local
+                )
+            ]
+            yield batch if all(keep) else batch.select(keep)
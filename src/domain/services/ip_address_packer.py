@@ -0,0 +1,49 @@
+"""Упаковка IP-адресов в целые числа.
+
+Отвечает ТОЛЬКО за перевод адресов в 128-битные целые и обратно.
+"""
+
+import socket
+from ipaddress import IPv4Address, IPv6Address
+
+
+class IpAddressPacker:
+    """Адреса IPv4 и IPv6 как целые одного пространства.
+
+    IPv4 переводится в IPv4-mapped IPv6 (::ffff:a.b.c.d), поэтому оба
+    семейства сравниваются и маскируются как 128-битные целые.
+    Разбор идет через inet_pton, без создания объектов ipaddress.
+    """
+
+    mapped_ipv4 = 0xFFFF << 32
+    ipv4_mask = (1 << 32) - 1
+
+    @classmethod
+    def pack(cls, address: str) -> int | None:
+        """Адрес → 128-битное целое; None, если строка не IP-адрес."""
+        try:
+            if ":" in address:
+                return int.from_bytes(socket.inet_pton(socket.AF_INET6, address))
+            return cls.mapped_ipv4 | int.from_bytes(
+                socket.inet_pton(socket.AF_INET, address)
+            )
+        except OSError:
+            return None
+
+    @classmethod
+    def is_ipv4(cls, key: int) -> bool:
+        """Лежит ли целое в пространстве IPv4-mapped."""
+        return key >> 32 == cls.mapped_ipv4 >> 32
+
+    @classmethod
+    def unpack(cls, key: int) -> str:
+        """128-битное целое → адрес в обычной записи."""
+        if cls.is_ipv4(key):
+            return str(IPv4Address(key & cls.ipv4_mask))
+        return str(IPv6Address(key))
+
+    @classmethod
+    def prefix(cls, key: int, ipv4_prefix: int, ipv6_prefix: int) -> int:
+        """Обнуляет биты адреса за пределами префикса подсети."""
+        host_bits = 32 - ipv4_prefix if cls.is_ipv4(key) else 128 - ipv6_prefix
+        return key >> host_bits << host_bits
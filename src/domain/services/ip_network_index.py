@@ -0,0 +1,313 @@
+"""Офлайн-справочник сетей: IP → ASN и страна.
+
+Отвечает ТОЛЬКО за загрузку диапазонов адресов и поиск сети адреса.
+"""
+
+import bisect
+import csv
+import logging
+import struct
+from functools import lru_cache
+from pathlib import Path
+
+from src.domain.services.ip_address_packer import IpAddressPacker
+
+logger = logging.getLogger(__name__)
+
+
+class PackedInts:
+    """Отсортированный массив целых фиксированной ширины в одном буфере.
+
+    Числа хранятся big-endian по width байт без объектов Python на
+    элемент, поэтому массив компактен и читается из кэша без разбора.
+    Поддерживает len() и индексацию - этого достаточно для bisect.
+    """
+
+    def __init__(self, data: bytes, width: int) -> None:
+        self.data = data
+        self.width = width
+
+    def __len__(self) -> int:
+        return len(self.data) // self.width
+
+    def __getitem__(self, index: int) -> int:
+        offset = index * self.width
+        return int.from_bytes(self.data[offset : offset + self.width])
+
+    @classmethod
+    def pack(cls, values: list[int], width: int) -> "PackedInts":
+        """Собирает массив из списка целых."""
+        return cls(b"".join(value.to_bytes(width) for value in values), width)
+
+
+class IpNetworkIndex:
+    """Отсортированные непересекающиеся диапазоны адресов с метками.
+
+    Ответственность:
+    - Разбор CSV: network,asn,country (CIDR) или start,end,asn,country
+    - Компактное хранение: начала и концы диапазонов IPv4 (4 байта) и
+      IPv6 (16 байт), индекс метки (4 байта) на диапазон
+    - Бинарный кэш рядом с CSV для быстрого старта
+    - Поиск адреса бинарным поиском с LRU-кэшем по адресам
+
+    Соседние диапазоны с одинаковой меткой склеиваются при загрузке.
+    """
+
+    cache_suffix = ".ipidx"
+    magic = b"NGXIPN"
+    version = 1
+    default_cache_size = 65536
+
+    # Значение измерения для адресов вне справочника и не-IP
+    unknown = "(unknown)"
+
+    header_struct = struct.Struct("<6sHqqIII")
+    widths = (4, 16)
+    label_width = 4
+
+    def __init__(
+        self,
+        ranges: tuple[
+            tuple[PackedInts, PackedInts, PackedInts],
+            tuple[PackedInts, PackedInts, PackedInts],
+        ],
+        labels: tuple[tuple[str, str], ...],
+        cache_size: int = default_cache_size,
+    ) -> None:
+        """ranges: (начала, концы, индексы меток) для IPv4 и для IPv6."""
+        self.ranges = ranges
+        self.labels = labels
+        self.lookup = lru_cache(maxsize=cache_size)(self._find)
+
+    def __len__(self) -> int:
+        return sum(len(starts) for starts, _, _ in self.ranges)
+
+    @staticmethod
+    def cache_path(csv_path: str | Path) -> Path:
+        """Путь к бинарному кэшу для CSV-справочника."""
+        csv_path = Path(csv_path)
+        return csv_path.with_name(csv_path.name + IpNetworkIndex.cache_suffix)
+
+    @classmethod
+    def load(cls, csv_path: str | Path) -> "IpNetworkIndex":
+        """Загружает справочник из бинарного кэша или из CSV с записью кэша.
+
+        Кэш используется, если совпадают размер и mtime CSV; иначе он
+        пересобирается. Ошибка записи кэша не мешает анализу.
+
+        Raises:
+            FileNotFoundError: Если CSV не найден
+            ValueError: Если строка CSV некорректна или диапазоны пересекаются
+
+        """
+        csv_path = Path(csv_path)
+        stat = csv_path.stat()
+        cache_path = cls.cache_path(csv_path)
+
+        if cache_path.is_file():
+            index = cls.from_bytes(
+                cache_path.read_bytes(), stat.st_size, stat.st_mtime_ns
+            )
+            if index is not None:
+                return index
+            logger.warning(f"Кэш {cache_path} устарел или поврежден и будет пересобран")
+
+        index = cls.from_csv(csv_path)
+        try:
+            cache_path.write_bytes(index.to_bytes(stat.st_size, stat.st_mtime_ns))
+        except OSError as e:
+            logger.warning(f"Не удалось записать кэш справочника {cache_path}: {e}")
+        logger.info(f"Справочник сетей {csv_path}: {len(index):,} диапазонов")
+        return index
+
+    @classmethod
+    def from_csv(cls, csv_path: str | Path) -> "IpNetworkIndex":
+        """Строит справочник из CSV (строки-заголовки и # комментарии пропускаются).
+
+        Raises:
+            ValueError: Если строка некорректна или диапазоны пересекаются
+
+        """
+        rows: list[tuple[int, int, tuple[str, str]]] = []
+        with Path(csv_path).open(newline="", encoding="utf-8") as file:
+            for line_number, fields in enumerate(csv.reader(file), start=1):
+                if not fields or fields[0].lstrip().startswith("#"):
+                    continue
+                row = cls._parse_row([field.strip() for field in fields])
+                if row is None:
+                    if not rows:
+                        continue  # заголовок
+                    msg = f"Некорректная строка справочника сетей {line_number}"
+                    raise ValueError(msg)
+                rows.append(row)
+
+        return cls.from_ranges(rows)
+
+    @classmethod
+    def from_ranges(
+        cls, rows: list[tuple[int, int, tuple[str, str]]]
+    ) -> "IpNetworkIndex":
+        """Строит справочник из диапазонов (начало, конец, (asn, страна)).
+
+        Raises:
+            ValueError: Если диапазоны пересекаются
+
+        """
+        label_codes: dict[tuple[str, str], int] = {}
+        families: list[list[list[int]]] = [[[], [], []], [[], [], []]]
+        previous = None
+        for key, end_key, label in sorted(rows):
+            family = 0 if IpAddressPacker.is_ipv4(key) else 1
+            starts, ends, codes = families[family]
+            # IPv4 хранится 4 байтами: без префикса ::ffff:
+            mask = IpAddressPacker.ipv4_mask if family == 0 else -1
+            start, end = key & mask, end_key & mask
+            code = label_codes.setdefault(label, len(label_codes))
+
+            if ends and start <= ends[-1]:
+                msg = (
+                    "Диапазоны справочника сетей пересекаются: "
+                    f"{IpAddressPacker.unpack(previous)} и "
+                    f"{IpAddressPacker.unpack(key)}"
+                )
+                raise ValueError(msg)
+            previous = key
+            if ends and start == ends[-1] + 1 and codes[-1] == code:
+                ends[-1] = end
+                continue
+            starts.append(start)
+            ends.append(end)
+            codes.append(code)
+
+        ranges = tuple(
+            (
+                PackedInts.pack(starts, width),
+                PackedInts.pack(ends, width),
+                PackedInts.pack(codes, cls.label_width),
+            )
+            for (starts, ends, codes), width in zip(families, cls.widths, strict=True)
+        )
+        return cls(ranges, tuple(label_codes))
+
+    def to_bytes(self, source_size: int, source_mtime_ns: int) -> bytes:
+        """Сериализует справочник: заголовок, массивы диапазонов и метки."""
+        labels = "\n".join(f"{asn}\t{country}" for asn, country in self.labels)
+        encoded_labels = labels.encode()
+        (v4_starts, _, _), (v6_starts, _, _) = self.ranges
+        chunks = [
+            self.header_struct.pack(
+                self.magic,
+                self.version,
+                source_size,
+                source_mtime_ns,
+                len(v4_starts),
+                len(v6_starts),
+                len(encoded_labels),
+            )
+        ]
+        chunks.extend(array.data for family in self.ranges for array in family)
+        chunks.append(encoded_labels)
+        return b"".join(chunks)
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, source_size: int, source_mtime_ns: int
+    ) -> "IpNetworkIndex | None":
+        """Восстанавливает справочник из to_bytes().
+
+        Returns:
+            IpNetworkIndex | None: Справочник или None, если кэш поврежден
+            или построен по другой версии CSV
+
+        """
+        header_size = cls.header_struct.size
+        if len(data) < header_size:
+            return None
+
+        magic, version, file_size, mtime_ns, *counts, labels_size = (
+            cls.header_struct.unpack_from(data)
+        )
+        if (magic, version, file_size, mtime_ns) != (
+            cls.magic,
+            cls.version,
+            source_size,
+            source_mtime_ns,
+        ):
+            return None
+        expected_size = (
+            header_size
+            + labels_size
+            + sum(
+                count * (2 * width + cls.label_width)
+                for count, width in zip(counts, cls.widths, strict=True)
+            )
+        )
+        if len(data) != expected_size:
+            return None
+
+        offset = header_size
+        ranges = []
+        for count, width in zip(counts, cls.widths, strict=True):
+            family = []
+            for array_width in (width, width, cls.label_width):
+                end = offset + count * array_width
+                family.append(PackedInts(data[offset:end], array_width))
+                offset = end
+            ranges.append(tuple(family))
+
+        labels = data[offset:].decode()
+        return cls(
+            tuple(ranges),
+            tuple(tuple(line.split("\t", 1)) for line in labels.split("\n") if labels),
+        )
+
+    def _find(self, address: str) -> tuple[str, str] | None:
+        """Метка (asn, страна) диапазона, содержащего адрес."""
+        key = IpAddressPacker.pack(address)
+        if key is None:
+            return None
+
+        if IpAddressPacker.is_ipv4(key):
+            starts, ends, codes = self.ranges[0]
+            key &= IpAddressPacker.ipv4_mask
+        else:
+            starts, ends, codes = self.ranges[1]
+
+        position = bisect.bisect_right(starts, key) - 1
+        if position < 0 or ends[position] < key:
+            return None
+        return self.labels[codes[position]]
+
+    @classmethod
+    def _parse_row(cls, fields: list[str]) -> tuple[int, int, tuple[str, str]] | None:
+        """Строка CSV → (начало, конец, (asn, страна)); None, если не диапазон."""
+        address, slash, prefix = fields[0].partition("/")
+        start = IpAddressPacker.pack(address)
+        if start is None or len(fields) < 1 + (not slash):
+            return None
+
+        if slash:
+            bits = 32 if IpAddressPacker.is_ipv4(start) else 128
+            if not prefix.isdigit() or int(prefix) > bits:
+                return None
+            host_mask = (1 << (bits - int(prefix))) - 1
+            start &= ~host_mask
+            end = start | host_mask
+            label = fields[1:3]
+        else:
+            end = IpAddressPacker.pack(fields[1])
+            if (
+                end is None
+                or start > end
+                or (IpAddressPacker.is_ipv4(start) != IpAddressPacker.is_ipv4(end))
+            ):
+                return None
+            label = fields[2:4]
+
+        asn, country = (*label, "", "")[:2]
+        asn = asn.upper().removeprefix("AS")
+        return (
+            start,
+            end,
+            (f"AS{asn}" if asn else cls.unknown, country.upper() or cls.unknown),
+        )
@@ -0,0 +1,280 @@
+"""Сервис фильтрации сырых строк логов до парсинга.
+
+Отвечает ТОЛЬКО за компиляцию фильтров CLI в цепочку предикатов.
+"""
+
+import ipaddress
+from argparse import Namespace
+from collections.abc import Callable, Iterator
+from functools import lru_cache
+
+from src.models.log_batch import LogBatch
+
+LinePredicate = Callable[[str], bool]
+
+# Предикат по полям распознанной записи: (remote_addr, request, status)
+RowPredicate = Callable[[str, str, int], bool]
+
+
+class LineFilterService:
+    """Компилирует фильтры в цепочку предикатов над сырыми строками NGINX.
+
+    Предикаты работают по позициям полей формата combined (без регулярных
+    выражений и без построения LogEntry) и выполняются в порядке стоимости:
+    метод → префикс пути → статус → IP/CIDR. Строка, в которой поле не
+    найдено, фильтр не проходит.
+
+    Поддерживаемые значения:
+    - statuses: "404", "5xx", "4xx,500"
+    - path_prefixes: "/api/", "/api/,/static/"
+    - networks: "10.0.0.1", "10.0.0.0/24", "2001:db8::/32"
+    - methods: "GET", "GET,POST"
+
+    Для форматов без фиксированных позиций полей (JSON) те же фильтры
+    компилируются в предикат по колонкам LogBatch (compile_rows).
+    """
+
+    status_length = 3
+
+    @staticmethod
+    def from_args(args: Namespace) -> LinePredicate | None:
+        """Компилирует фильтры из аргументов CLI (--status, --path-prefix, ...).
+
+        Returns:
+            Callable | None: Предикат или None, если фильтры не заданы
+
+        Raises:
+            ValueError: Если значение фильтра некорректно
+
+        """
+        return LineFilterService.compile(**LineFilterService._filters_from_args(args))
+
+    @staticmethod
+    def rows_from_args(args: Namespace) -> RowPredicate | None:
+        """Компилирует фильтры из аргументов CLI в предикат по полям записи."""
+        return LineFilterService.compile_rows(
+            **LineFilterService._filters_from_args(args)
+        )
+
+    @staticmethod
+    def compile(
+        statuses: list[str] | None = None,
+        path_prefixes: list[str] | None = None,
+        networks: list[str] | None = None,
+        methods: list[str] | None = None,
+    ) -> LinePredicate | None:
+        """Компилирует фильтры в один предикат (дешевые проверки - первыми)."""
+        predicates: list[tuple[int, LinePredicate]] = []
+
+        if methods:
+            predicates.append((1, LineFilterService._method_predicate(methods)))
+        if path_prefixes:
+            predicates.append((2, LineFilterService._path_predicate(path_prefixes)))
+        if statuses:
+            predicates.append((3, LineFilterService._status_predicate(statuses)))
+        if networks:
+            predicates.append((4, LineFilterService._network_predicate(networks)))
+
+        if not predicates:
+            return None
+
+        chain = tuple(predicate for _, predicate in sorted(predicates))
+        if len(chain) == 1:
+            return chain[0]
+
+        def matches(line: str) -> bool:
+            return all(predicate(line) for predicate in chain)
+
+        return matches
+
+    @staticmethod
+    def compile_rows(
+        statuses: list[str] | None = None,
+        path_prefixes: list[str] | None = None,
+        networks: list[str] | None = None,
+        methods: list[str] | None = None,
+    ) -> RowPredicate | None:
+        """Компилирует фильтры в предикат по полям распознанной записи."""
+        predicates: list[RowPredicate] = []
+
+        if methods:
+            prefixes = LineFilterService._method_prefixes(methods)
+            predicates.append(lambda _, request, __: request.startswith(prefixes))
+        if path_prefixes:
+            paths = LineFilterService._path_prefixes(path_prefixes)
+
+            def path_matches(_: str, request: str, __: int) -> bool:
+                space = request.find(" ")
+                return space >= 0 and request.startswith(paths, space + 1)
+
+            predicates.append(path_matches)
+        if statuses:
+            exact, classes = LineFilterService._status_sets(statuses)
+
+            def status_matches(_: str, __: str, status: int) -> bool:
+                value = str(status)
+                return value in exact or value[:1] in classes
+
+            predicates.append(status_matches)
+        if networks:
+            address_matches = LineFilterService._address_matcher(networks)
+            predicates.append(lambda addr, _, __: address_matches(addr))
+
+        if not predicates:
+            return None
+
+        chain = tuple(predicates)
+
+        def matches(addr: str, request: str, status: int) -> bool:
+            return all(predicate(addr, request, status) for predicate in chain)
+
+        return matches
+
+    @staticmethod
+    def filter_batches(
+        batches: Iterator[LogBatch], predicate: RowPredicate | None
+    ) -> Iterator[LogBatch]:
+        """Оставляет в пакетах только записи, удовлетворяющие предикату."""
+        if predicate is None:
+            yield from batches
+            return
+
+        for batch in batches:
+            keep = list(map(predicate, batch.remote_addr, batch.request, batch.status))
+            yield batch.select(keep)
+
+    @staticmethod
+    def filter_lines(
+        lines: Iterator[str], predicate: LinePredicate | None
+    ) -> Iterator[str]:
+        """Пропускает только строки, удовлетворяющие предикату."""
+        if predicate is None:
+            return lines
+        return filter(predicate, lines)
+
+    @staticmethod
+    def _filters_from_args(args: Namespace) -> dict[str, list[str] | None]:
+        """Извлекает значения фильтров из аргументов CLI."""
+        return {
+            "statuses": LineFilterService._split(getattr(args, "status", None)),
+            "path_prefixes": LineFilterService._split(
+                getattr(args, "path_prefix", None)
+            ),
+            "networks": LineFilterService._split(getattr(args, "ip", None)),
+            "methods": LineFilterService._split(getattr(args, "method", None)),
+        }
+
+    @staticmethod
+    def _split(raw: str | None) -> list[str] | None:
+        """Разбивает значение CLI вида "a,b" на непустые элементы."""
+        if not raw:
+            return None
+        return [item.strip() for item in raw.split(",") if item.strip()]
+
+    @staticmethod
+    def _method_predicate(methods: list[str]) -> LinePredicate:
+        """Предикат по HTTP-методу: начало поля $request."""
+        prefixes = LineFilterService._method_prefixes(methods)
+
+        def matches(line: str) -> bool:
+            quote = line.find('"')
+            return quote >= 0 and line.startswith(prefixes, quote + 1)
+
+        return matches
+
+    @staticmethod
+    def _path_predicate(path_prefixes: list[str]) -> LinePredicate:
+        """Предикат по префиксу пути: второе слово поля $request."""
+        prefixes = LineFilterService._path_prefixes(path_prefixes)
+
+        def matches(line: str) -> bool:
+            quote = line.find('"')
+            if quote < 0:
+                return False
+            space = line.find(" ", quote + 1)
+            return space >= 0 and line.startswith(prefixes, space + 1)
+
+        return matches
+
+    @staticmethod
+    def _status_predicate(statuses: list[str]) -> LinePredicate:
+        """Предикат по статусу: точные коды и классы вида 5xx."""
+        exact, classes = LineFilterService._status_sets(statuses)
+
+        def matches(line: str) -> bool:
+            # Статус следует сразу за закрывающей кавычкой $request
+            quote = line.find('"')
+            if quote < 0:
+                return False
+            closing = line.find('"', quote + 1)
+            if closing < 0:
+                return False
+            status = line[closing + 2 : closing + 5]
+            return status in exact or status[:1] in classes
+
+        return matches
+
+    @staticmethod
+    def _network_predicate(networks: list[str]) -> LinePredicate:
+        """Предикат по IP-адресу или подсети клиента ($remote_addr)."""
+        address_matches = LineFilterService._address_matcher(networks)
+
+        def matches(line: str) -> bool:
+            space = line.find(" ")
+            return space > 0 and address_matches(line[:space])
+
+        return matches
+
+    @staticmethod
+    def _method_prefixes(methods: list[str]) -> tuple[str, ...]:
+        """Префиксы поля $request для HTTP-методов."""
+        return tuple(f"{method.upper()} " for method in methods)
+
+    @staticmethod
+    def _path_prefixes(path_prefixes: list[str]) -> tuple[str, ...]:
+        """Проверяет префиксы пути."""
+        for prefix in path_prefixes:
+            if not prefix.startswith("/"):
+                msg = f"Префикс пути должен начинаться с '/': {prefix}"
+                raise ValueError(msg)
+        return tuple(path_prefixes)
+
+    @staticmethod
+    def _status_sets(statuses: list[str]) -> tuple[set[str], set[str]]:
+        """Разбирает фильтры статуса на точные коды и классы вида 5xx."""
+        exact = set()
+        classes = set()
+        for status in statuses:
+            value = status.lower()
+            if len(value) != LineFilterService.status_length:
+                msg = f"Некорректный фильтр статуса: {status}"
+                raise ValueError(msg)
+            if value[0].isdigit() and value[1:] == "xx":
+                classes.add(value[0])
+            elif value.isdigit():
+                exact.add(value)
+            else:
+                msg = f"Некорректный фильтр статуса: {status}"
+                raise ValueError(msg)
+        return exact, classes
+
+    @staticmethod
+    def _address_matcher(networks: list[str]) -> Callable[[str], bool]:
+        """Проверка адреса клиента по IP/CIDR с кэшем по строке адреса."""
+        try:
+            parsed = [
+                ipaddress.ip_network(network, strict=False) for network in networks
+            ]
+        except ValueError as e:
+            msg = f"Некорректный фильтр IP/CIDR: {e}"
+            raise ValueError(msg) from e
+
+        @lru_cache(maxsize=65536)
+        def address_matches(address: str) -> bool:
+            try:
+                ip = ipaddress.ip_address(address)
+            except ValueError:
+                return False
+            return any(ip in network for network in parsed)
+
+        return address_matches
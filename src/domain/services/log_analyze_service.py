@@ -1,15 +1,19 @@
 from argparse import Namespace
 from collections.abc import Iterator
+from itertools import chain, islice
 from typing import TYPE_CHECKING, Any
 
+from src.core.abstractions.parsers import ILogParser
 from src.core.implementations.calculators.nginx_statistics_calculator import (
     NginxStatisticsCalculator,
 )
 from src.core.implementations.parsers.log_parser import NginxLogParser
-from src.models.log_entry import LogEntry
+from src.domain.services.time_index_service import TimeIndexService
+from src.models.log_batch import LogBatch
 
 if TYPE_CHECKING:
     from src.infrastructure.factories.formatter_factory import FormatterFactory
+    from src.infrastructure.factories.parser_factory import ParserFactory
     from src.infrastructure.factories.reader_factory import ReaderFactory
 
 
@@ -33,27 +37,35 @@ class LogAnalyzerService:
         parser: NginxLogParser,
         calculator: NginxStatisticsCalculator,
         formatter_factory: "FormatterFactory",
+        parser_factory: "ParserFactory | None" = None,
     ) -> None:
         self.reader_factory = reader_factory
         self.parser = parser
         self.calculator = calculator
         self.formatter_factory = formatter_factory
+        self.parser_factory = parser_factory
 
     def analyze(self, args: Namespace) -> int:
         """Координирует выполнение шагов анализа логов."""
-        # 1. Координация чтения файлов
-        lines = self._coordinate_reading(args.path)
+        # 1. Координация чтения файлов (по источникам)
+        sources = self._coordinate_reading(args.path, args.date_from, args.date_to)
 
-        # 2. Координация парсинга логов
-        entries = self._coordinate_parsing(lines)
+        # 2. Координация парсинга логов (лениво, блоками, с фильтрами строк)
+        batches = self._coordinate_parsing(sources, args)
 
         # 3. Координация фильтрации по датам
-        filtered_entries = self._coordinate_date_filtering(
-            entries, args.date_from, args.date_to
+        filtered_batches = self._coordinate_date_filtering(
+            batches, args.date_from, args.date_to
         )
 
+        # 3.1. Координация фильтрации ботов или людей
+        filtered_batches = self._coordinate_traffic_filtering(filtered_batches, args)
+
         # 4. Координация расчета статистики
-        statistics = self._coordinate_calculation(filtered_entries, args.path)
+        statistics = self._coordinate_calculation(filtered_batches, args.path)
+
+        # 4.1. Координация сводки по некорректным строкам
+        self._coordinate_malformed_summary(statistics)
 
         # 5. Координация форматирования отчета
         report = self._coordinate_formatting(statistics, args.format)
@@ -61,35 +73,95 @@ class LogAnalyzerService:
         # 6. Координация сохранения отчета
         self._coordinate_saving(report, args.output, args.format)
 
+        # 6.1. Координация выгрузки временного ряда в CSV
+        self._coordinate_time_series_export(
+            statistics, getattr(args, "time_series_csv", None)
+        )
+
         return 0
 
-    def _coordinate_reading(self, path: str) -> Iterator[str]:
+    def _coordinate_reading(
+        self, path: str, date_from: str | None, date_to: str | None
+    ) -> Iterator[tuple[str, Iterator[str]]]:
         """Координация чтения файлов."""
-        reader = self.reader_factory.create_reader(path)
-        return reader.read_files(path)
+        from src.domain.services.date_filter_service import DateFilterService
 
-    def _coordinate_parsing(self, lines: Iterator[str]) -> list[LogEntry]:
-        """Координация парсинга логов."""
-        return self.parser.parse_lines(lines)
+        time_range = DateFilterService.resolve_epoch_bounds(date_from, date_to)
+        reader = self.reader_factory.create_reader(path, time_range=time_range)
+        return reader.read_sources(path)
+
+    def _coordinate_parsing(
+        self, sources: Iterator[tuple[str, Iterator[str]]], args: Namespace
+    ) -> Iterator[LogBatch]:
+        """Координация парсинга логов.
+
+        Для каждого источника парсер выбирается по образцу первых строк,
+        а фильтры --status, --path-prefix и др. применяются к сырым строкам
+        до парсинга. Для форматов без фиксированных позиций полей (JSON)
+        фильтры применяются к колонкам распознанных пакетов.
+        """
+        from src.domain.services.line_filter_service import LineFilterService
+
+        predicate = LineFilterService.from_args(args)
+        row_predicate = LineFilterService.rows_from_args(args)
+
+        for source, raw_lines in sources:
+            parser, lines = self._select_parser(source, raw_lines)
+            if parser.raw_line_filters:
+                yield from parser.parse_batches(
+                    LineFilterService.filter_lines(lines, predicate)
+                )
+            else:
+                yield from LineFilterService.filter_batches(
+                    parser.parse_batches(lines), row_predicate
+                )
+
+    def _select_parser(
+        self, source: str, lines: Iterator[str]
+    ) -> tuple[ILogParser, Iterator[str]]:
+        """Выбирает парсер по образцу строк, не теряя прочитанный образец."""
+        if self.parser_factory is None:
+            return self.parser, lines
+
+        lines = iter(lines)
+        sample = list(islice(lines, self.parser_factory.sample_size))
+        parser = self.parser_factory.create_parser(sample, source)
+        return parser, chain(sample, lines)
 
     def _coordinate_date_filtering(
-        self, entries: list[LogEntry], date_from: str | None, date_to: str | None
-    ) -> list[LogEntry]:
+        self, batches: Iterator[LogBatch], date_from: str | None, date_to: str | None
+    ) -> Iterator[LogBatch]:
         """Координация фильтрации по датам."""
         from src.domain.services.date_filter_service import DateFilterService
 
-        return DateFilterService.filter_entries(entries, date_from, date_to)
+        return DateFilterService.filter_batches(batches, date_from, date_to)
+
+    def _coordinate_traffic_filtering(
+        self, batches: Iterator[LogBatch], args: Namespace
+    ) -> Iterator[LogBatch]:
+        """Координация фильтрации по типу клиента (--traffic bot|human)."""
+        from src.domain.services.bot_classifier import BotClassifier
+
+        traffic = getattr(args, "traffic", None)
+        if traffic is None:
+            return batches
+        return BotClassifier.from_args(args).filter_batches(batches, traffic)
 
     def _coordinate_calculation(
-        self, entries: list[LogEntry], path: str
+        self, batches: Iterator[LogBatch], path: str
     ) -> dict[str, Any]:
         """Координация расчета статистики."""
-        statistics = self.calculator.calculate(entries)
+        statistics = self.calculator.calculate_batches(batches)
 
         import glob
         from pathlib import Path
 
-        actual_files = glob.glob(path)
+        # Sidecar-индексы читатель пропускает, в списке файлов их тоже нет
+        actual_files = [
+            file_path
+            for file_path in glob.glob(path)
+            if not TimeIndexService.is_sidecar(file_path)
+        ]
 
         # Берем только имена файлов без полного пути
         file_names = [Path(file_path).name for file_path in actual_files]
@@ -97,6 +169,15 @@ class LogAnalyzerService:
         statistics["files"] = file_names
         return statistics
 
+    def _coordinate_malformed_summary(self, statistics: dict[str, Any]) -> None:
+        """Координация итоговой сводки по некорректным строкам."""
+        reporter = self.parser.malformed_reporter
+        reporter.finish()
+
+        summary = reporter.summary()
+        if summary:
+            statistics["malformedLines"] = summary
+
     def _coordinate_formatting(
         self, statistics: dict[str, Any], format_name: str
     ) -> str:
@@ -118,3 +199,17 @@ class LogAnalyzerService:
 
         # Сохранение отчета
         ReportSaver.save_report(report, output_path)
+
+    def _coordinate_time_series_export(
+        self, statistics: dict[str, Any], csv_path: str | None
+    ) -> None:
+        """Координация выгрузки временного ряда в CSV."""
+        if not csv_path:
+            return
+
+        from src.core.implementations.formatters.time_series_csv_formatter import (
+            TimeSeriesCsvFormatter,
+        )
+        from src.domain.services.report_saver import ReportSaver
+
+        ReportSaver.save_report(TimeSeriesCsvFormatter().format(statistics), csv_path)
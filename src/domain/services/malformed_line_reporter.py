@@ -0,0 +1,99 @@
+"""Агрегированный учет некорректных строк логов.
+
+Отвечает ТОЛЬКО за подсчет, ограниченное логирование и карантин плохих строк.
+"""
+
+import logging
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class MalformedLineReporter:
+    """Считает некорректные строки по причинам вместо WARN на каждую строку.
+
+    Ответственность:
+    - Подсчет некорректных строк по причинам
+    - Логирование только первых max_examples примеров и итоговой сводки
+    - Пакетная запись плохих строк в карантинный файл (опционально)
+
+    Не знает о:
+    - Формате логов и причинах ошибок парсинга
+    - Структуре итогового отчета
+    """
+
+    default_max_examples = 5
+    flush_threshold = 10000
+    example_length = 200
+
+    def __init__(
+        self,
+        max_examples: int = default_max_examples,
+        quarantine_path: str | None = None,
+    ) -> None:
+        self.max_examples = max_examples
+        self.quarantine_path = Path(quarantine_path) if quarantine_path else None
+        self.reasons: Counter = Counter()
+        self._total = 0
+        self._buffer: list[str] = []
+        self._quarantine_opened = False
+
+    @property
+    def total(self) -> int:
+        """Общее количество некорректных строк."""
+        return self._total
+
+    def record(self, line: str, reason: str) -> None:
+        """Учитывает одну некорректную строку."""
+        self.reasons[reason] += 1
+        self._total += 1
+
+        if self._total <= self.max_examples:
+            logger.warning(
+                "Строка не соответствует формату NGINX и будет пропущена "
+                f"({reason}): {line[: self.example_length]!r}"
+            )
+
+        if self.quarantine_path is not None:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.flush_threshold:
+                self._flush()
+
+    def finish(self) -> None:
+        """Записывает остаток карантина и логирует итоговую сводку."""
+        if self.quarantine_path is not None:
+            self._flush()
+
+        total = self.total
+        if total:
+            details = ", ".join(
+                f"{reason}: {count:,}" for reason, count in self.reasons.most_common()
+            )
+            logger.warning(f"Пропущено некорректных строк: {total:,} ({details})")
+
+    def summary(self) -> dict[str, Any]:
+        """Сводка для отчета (пустой словарь, если ошибок не было)."""
+        total = self.total
+        if not total:
+            return {}
+        return {
+            "totalLinesCount": total,
+            "reasons": [
+                {"reason": reason, "totalLinesCount": count}
+                for reason, count in sorted(self.reasons.items())
+            ],
+        }
+
+    def _flush(self) -> None:
+        """Дописывает буфер карантина в файл одной операцией."""
+        if not self._buffer and self._quarantine_opened:
+            return
+
+        mode = "a" if self._quarantine_opened else "w"
+        with self.quarantine_path.open(mode, encoding="utf-8") as file:
+            if self._buffer:
+                file.write("\n".join(self._buffer) + "\n")
+        self._quarantine_opened = True
+        self._buffer.clear()
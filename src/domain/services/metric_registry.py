@@ -0,0 +1,149 @@
+"""Реестр подключаемых метрик.
+
+Отвечает ТОЛЬКО за поиск метрик по имени и выбор набора для --metrics.
+"""
+
+from typing import ClassVar
+
+from src.core.abstractions.metrics import IMetric, MetricOptions
+from src.core.implementations.metrics.anomaly_metric import AnomalyMetric
+from src.core.implementations.metrics.date_metric import DateMetric
+from src.core.implementations.metrics.distinct_metric import DistinctMetric
+from src.core.implementations.metrics.group_by_metric import GroupByMetric
+from src.core.implementations.metrics.protocol_metric import ProtocolMetric
+from src.core.implementations.metrics.resource_bytes_metric import ResourceBytesMetric
+from src.core.implementations.metrics.resource_metric import ResourceMetric
+from src.core.implementations.metrics.session_metric import SessionMetric
+from src.core.implementations.metrics.size_metric import SizeMetric
+from src.core.implementations.metrics.status_metric import StatusMetric
+from src.core.implementations.metrics.time_series_metric import TimeSeriesMetric
+from src.core.implementations.metrics.timing_metric import TimingMetric
+from src.core.implementations.metrics.top_clients_metric import TopClientsMetric
+from src.core.implementations.metrics.windowed_resource_metric import (
+    WindowedResourceMetric,
+)
+
+
+class MetricRegistry:
+    """Реестр метрик по имени.
+
+    Ответственность:
+    - Разбор списка --metrics и проверка имен
+    - Набор по умолчанию (отчет по ТЗ) и опциональные метрики по флагам
+    - Объединение колонок, которые читают выбранные метрики
+
+    Новая метрика добавляется реализацией IMetric и register(), без
+    изменений DataAccumulator и StatisticsComposer.
+    """
+
+    _metrics: ClassVar[dict[str, type[IMetric]]] = {
+        metric.name: metric
+        for metric in (
+            SizeMetric,
+            ResourceMetric,
+            StatusMetric,
+            DateMetric,
+            ProtocolMetric,
+            TimeSeriesMetric,
+            DistinctMetric,
+            GroupByMetric,
+            TopClientsMetric,
+            ResourceBytesMetric,
+            TimingMetric,
+            SessionMetric,
+            AnomalyMetric,
+            WindowedResourceMetric,
+        )
+    }
+
+    # Метрики отчета по ТЗ, если --metrics не задан
+    default_names = ("sizes", "resources", "codes", "dates", "protocols")
+
+    @classmethod
+    def register(cls, metric: type[IMetric]) -> type[IMetric]:
+        """Регистрирует метрику (можно использовать как декоратор)."""
+        cls._metrics[metric.name] = metric
+        return metric
+
+    @classmethod
+    def names(cls) -> list[str]:
+        """Имена зарегистрированных метрик для --metrics."""
+        return list(cls._metrics)
+
+    @classmethod
+    def parse(cls, raw: str | None) -> tuple[str, ...] | None:
+        """Разбирает --metrics: "sizes,codes" → ("sizes", "codes").
+
+        Raises:
+            ValueError: Если имя метрики неизвестно или список пуст
+
+        """
+        if raw is None:
+            return None
+
+        names = tuple(
+            dict.fromkeys(name.strip() for name in raw.split(",") if name.strip())
+        )
+        if not names:
+            msg = "Список метрик --metrics пуст"
+            raise ValueError(msg)
+        cls.resolve(names)
+        return names
+
+    @classmethod
+    def resolve(cls, names: tuple[str, ...] | list[str]) -> list[type[IMetric]]:
+        """Возвращает классы метрик по именам.
+
+        Raises:
+            ValueError: Если имя метрики неизвестно
+
+        """
+        unknown = [name for name in names if name not in cls._metrics]
+        if unknown:
+            msg = (
+                f"Неизвестные метрики: {', '.join(unknown)}. "
+                f"Поддерживаемые: {', '.join(cls._metrics)}"
+            )
+            raise ValueError(msg)
+
+        return [cls._metrics[name] for name in names]
+
+    @classmethod
+    def select(
+        cls, names: tuple[str, ...] | None, options: MetricOptions
+    ) -> tuple[str, ...]:
+        """Выбирает метрики: --metrics или набор по умолчанию.
+
+        --time-series, --distinct, --group-by, --top-clients,
+        --resource-bytes, --timings, --sessions, --anomalies
+        и --windowed-resources добавляют свои метрики к любому набору.
+        """
+        selected = list(names or cls.default_names)
+        if options.time_series_granularity:
+            selected.append(TimeSeriesMetric.name)
+        if options.distinct_precision:
+            selected.append(DistinctMetric.name)
+        if options.group_by:
+            selected.append(GroupByMetric.name)
+        if options.top_clients_capacity:
+            selected.append(TopClientsMetric.name)
+        if options.resource_bytes_capacity:
+            selected.append(ResourceBytesMetric.name)
+        if options.timings_capacity:
+            selected.append(TimingMetric.name)
+        if options.session_timeout:
+            selected.append(SessionMetric.name)
+        if options.anomaly_window:
+            selected.append(AnomalyMetric.name)
+        if options.resource_window:
+            selected.append(WindowedResourceMetric.name)
+        return tuple(dict.fromkeys(selected))
+
+    @classmethod
+    def fields(cls, names: tuple[str, ...], options: MetricOptions) -> set[str]:
+        """Колонки LogBatch, которые читают выбранные метрики."""
+        return {
+            field
+            for metric in cls.resolve(names)
+            for field in metric.required_fields(options)
+        }
@@ -0,0 +1,88 @@
+"""Словарное кодирование повторяющихся строковых полей.
+
+Отвечает ТОЛЬКО за замену повторяющихся значений общими экземплярами строк.
+"""
+
+from src.models.log_batch import LogBatch
+
+
+class StringInterner:
+    """Ограниченные словари общих экземпляров строк по полям LogBatch.
+
+    Регулярное выражение создает для каждой строки лога новые объекты str,
+    хотя адреса клиентов, запросы, referer и user agent повторяются
+    миллионы раз. Интернер заменяет значения в колонках пакета экземплярами
+    из словаря поля, и дубликаты освобождаются вместе с пакетом строк.
+
+    Политика переполнения (проверяется перед каждым пакетом, поэтому словарь
+    может превысить max_size не более чем на размер пакета):
+    - freeze: новые значения больше не добавляются, уже известные
+      (обычно самые частые) продолжают разделяться
+    - reset: словарь очищается и заполняется заново
+    """
+
+    default_max_size = 65536
+    overflow_policies = ("freeze", "reset")
+    default_fields = ("remote_addr", "request", "http_referer", "http_user_agent")
+
+    def __init__(
+        self,
+        max_size: int = default_max_size,
+        overflow: str = "freeze",
+        fields: tuple[str, ...] = default_fields,
+    ) -> None:
+        if max_size < 0:
+            msg = "Размер словаря строк не может быть отрицательным"
+            raise ValueError(msg)
+        if overflow not in self.overflow_policies:
+            msg = (
+                f"Неизвестная политика переполнения: '{overflow}'. "
+                f"Поддерживаемые: {', '.join(self.overflow_policies)}"
+            )
+            raise ValueError(msg)
+
+        self.max_size = max_size
+        self.overflow = overflow
+        self._tables: dict[str, dict[str, str]] = {name: {} for name in fields}
+        self.resets = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Включено ли кодирование (max_size > 0)."""
+        return self.max_size > 0 and bool(self._tables)
+
+    def sizes(self) -> dict[str, int]:
+        """Текущее количество значений в словаре каждого поля."""
+        return {name: len(table) for name, table in self._tables.items()}
+
+    def intern(self, field: str, value: str) -> str:
+        """Возвращает общий экземпляр значения поля."""
+        table = self._tables[field]
+        if len(table) < self.max_size:
+            return table.setdefault(value, value)
+        return table.get(value, value)
+
+    def intern_batch(self, batch: LogBatch) -> LogBatch:
+        """Заменяет значения колонок пакета общими экземплярами (на месте).
+
+        Замена выполняется через map по методам dict, без Python-цикла
+        на строку.
+        """
+        if not self.enabled:
+            return batch
+
+        for name, table in self._tables.items():
+            if len(table) >= self.max_size:
+                if self.overflow == "reset":
+                    table.clear()
+                    self.resets += 1
+                    lookup = table.setdefault
+                else:
+                    lookup = table.get
+            else:
+                lookup = table.setdefault
+
+            column = getattr(batch, name)
+            column[:] = map(lookup, column, column)
+
+        return batch
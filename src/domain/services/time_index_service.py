@@ -0,0 +1,267 @@
+"""Сервис sidecar-индексов времени для лог-файлов.
+
+Отвечает ТОЛЬКО за построение, сохранение и загрузку индексов времени.
+"""
+
+import glob
+import logging
+import struct
+from pathlib import Path
+
+from src.domain.services.time_parser_service import TimeParserService
+from src.domain.validators.file_format_validator import FileFormatValidator
+from src.models.time_index import TimeIndex, TimeIndexSegment
+
+logger = logging.getLogger(__name__)
+
+
+class TimeIndexService:
+    """Строит и читает компактные индексы времени рядом с лог-файлами.
+
+    Индекс разбивает файл на непрерывные участки по временным корзинам
+    (по умолчанию - минута) и хранит для каждого участка смещение в байтах,
+    длину, количество строк и min/max время. Это позволяет при фильтрации
+    по датам читать только нужные участки и пропускать файлы целиком.
+
+    Формат файла: заголовок (магия, версия, размер и mtime лог-файла, размер
+    корзины, число участков) и массив участков фиксированного размера.
+    """
+
+    suffix = ".idx"
+    magic = b"NGXIDX"
+    version = 1
+    default_bucket_seconds = 60
+
+    # Значение для участков без распознанного времени
+    no_time = -(2**63)
+
+    header_struct = struct.Struct("<6sHqqII")
+    segment_struct = struct.Struct("<qqqqq")
+
+    def __init__(self) -> None:
+        self.format_validator = FileFormatValidator()
+
+    @staticmethod
+    def sidecar_path(log_path: str | Path) -> Path:
+        """Возвращает путь к sidecar-файлу индекса для лог-файла."""
+        log_path = Path(log_path)
+        return log_path.with_name(log_path.name + TimeIndexService.suffix)
+
+    @staticmethod
+    def is_sidecar(path: str | Path) -> bool:
+        """Является ли файл sidecar-индексом (а не лог-файлом)."""
+        return str(path).endswith(TimeIndexService.suffix)
+
+    def write_indexes(
+        self, path_pattern: str, bucket_seconds: int = default_bucket_seconds
+    ) -> list[Path]:
+        """Строит и сохраняет индексы для всех файлов по шаблону glob.
+
+        Args:
+            path_pattern: Путь к файлу или шаблон glob
+            bucket_seconds: Размер временной корзины в секундах
+
+        Returns:
+            list[Path]: Пути к записанным sidecar-файлам
+
+        Raises:
+            FileNotFoundError: Если файлы не найдены
+            ValueError: Если неподдерживаемый формат или некорректная корзина
+
+        """
+        if bucket_seconds <= 0:
+            msg = "Размер корзины индекса должен быть положительным"
+            raise ValueError(msg)
+
+        file_paths = glob.glob(path_pattern)
+        if not file_paths:
+            msg = f"Файл(ы) '{path_pattern}' не найден(ы)"
+            raise FileNotFoundError(msg)
+
+        written = []
+        for file_path in file_paths:
+            if self.is_sidecar(file_path):
+                continue
+            if not Path(file_path).is_file():
+                msg = f"'{file_path}' не является файлом"
+                raise ValueError(msg)
+            self.format_validator.validate_extension(file_path)
+
+            index = self.build(file_path, bucket_seconds)
+            written.append(self.save(index, file_path))
+            logger.info(f"Индекс {written[-1]}: {len(index.segments):,} участков")
+
+        return written
+
+    def build(
+        self, log_path: str | Path, bucket_seconds: int = default_bucket_seconds
+    ) -> TimeIndex:
+        """Строит индекс времени за один последовательный проход по файлу.
+
+        Новый участок начинается, когда корзина строки становится больше
+        корзины текущего участка. Строки "из прошлого" остаются в текущем
+        участке и расширяют его min_time, поэтому индекс корректен и для
+        не строго упорядоченных логов.
+        """
+        log_path = Path(log_path)
+        stat = log_path.stat()
+
+        segments = []
+        segment_offset = 0
+        segment_lines = 0
+        segment_bucket = None
+        min_time = max_time = None
+        offset = 0
+
+        with log_path.open("rb") as file:
+            for line in file:
+                epoch = self._extract_epoch(line)
+
+                if epoch is not None:
+                    bucket = epoch // bucket_seconds
+                    if segment_bucket is None:
+                        segment_bucket = bucket
+                    elif bucket > segment_bucket:
+                        segments.append(
+                            TimeIndexSegment(
+                                offset=segment_offset,
+                                length=offset - segment_offset,
+                                line_count=segment_lines,
+                                min_time=min_time,
+                                max_time=max_time,
+                            )
+                        )
+                        segment_offset = offset
+                        segment_lines = 0
+                        segment_bucket = bucket
+                        min_time = max_time = None
+
+                    min_time = epoch if min_time is None else min(min_time, epoch)
+                    max_time = epoch if max_time is None else max(max_time, epoch)
+
+                segment_lines += 1
+                offset += len(line)
+
+        if segment_lines:
+            segments.append(
+                TimeIndexSegment(
+                    offset=segment_offset,
+                    length=offset - segment_offset,
+                    line_count=segment_lines,
+                    min_time=min_time,
+                    max_time=max_time,
+                )
+            )
+
+        return TimeIndex(
+            file_size=stat.st_size,
+            file_mtime_ns=stat.st_mtime_ns,
+            bucket_seconds=bucket_seconds,
+            segments=tuple(segments),
+        )
+
+    def save(self, index: TimeIndex, log_path: str | Path) -> Path:
+        """Сохраняет индекс в sidecar-файл рядом с лог-файлом."""
+        index_path = self.sidecar_path(log_path)
+
+        chunks = [
+            self.header_struct.pack(
+                self.magic,
+                self.version,
+                index.file_size,
+                index.file_mtime_ns,
+                index.bucket_seconds,
+                len(index.segments),
+            )
+        ]
+        chunks.extend(
+            self.segment_struct.pack(
+                segment.offset,
+                segment.length,
+                segment.line_count,
+                self.no_time if segment.min_time is None else segment.min_time,
+                self.no_time if segment.max_time is None else segment.max_time,
+            )
+            for segment in index.segments
+        )
+
+        with index_path.open("wb") as file:
+            file.write(b"".join(chunks))
+
+        return index_path
+
+    def load(self, log_path: str | Path) -> TimeIndex | None:
+        """Загружает индекс, если он существует и соответствует файлу.
+
+        Returns:
+            TimeIndex | None: Индекс или None, если он отсутствует, поврежден
+            или устарел (не совпадают размер или mtime лог-файла)
+
+        """
+        log_path = Path(log_path)
+        index_path = self.sidecar_path(log_path)
+        if not index_path.is_file():
+            return None
+
+        data = index_path.read_bytes()
+        index = self._unpack(data)
+        if index is None:
+            logger.warning(f"Индекс {index_path} поврежден и будет проигнорирован")
+            return None
+
+        stat = log_path.stat()
+        if index.file_size != stat.st_size or index.file_mtime_ns != stat.st_mtime_ns:
+            logger.warning(f"Индекс {index_path} устарел и будет проигнорирован")
+            return None
+
+        return index
+
+    def _unpack(self, data: bytes) -> TimeIndex | None:
+        """Распаковывает бинарное представление индекса."""
+        header_size = self.header_struct.size
+        if len(data) < header_size:
+            return None
+
+        magic, version, file_size, mtime_ns, bucket_seconds, count = (
+            self.header_struct.unpack_from(data)
+        )
+        expected_size = header_size + count * self.segment_struct.size
+        if magic != self.magic or version != self.version:
+            return None
+        if len(data) != expected_size:
+            return None
+
+        segments = tuple(
+            TimeIndexSegment(
+                offset=offset,
+                length=length,
+                line_count=line_count,
+                min_time=None if min_time == self.no_time else min_time,
+                max_time=None if max_time == self.no_time else max_time,
+            )
+            for offset, length, line_count, min_time, max_time in (
+                self.segment_struct.iter_unpack(data[header_size:])
+            )
+        )
+
+        return TimeIndex(
+            file_size=file_size,
+            file_mtime_ns=mtime_ns,
+            bucket_seconds=bucket_seconds,
+            segments=segments,
+        )
+
+    @staticmethod
+    def _extract_epoch(line: bytes) -> int | None:
+        """Извлекает время из сырой строки без полного парсинга."""
+        start = line.find(b"[")
+        if start < 0:
+            return None
+        end = line.find(b"]", start)
+        if end < 0:
+            return None
+
+        try:
+            return TimeParserService.to_epoch(line[start + 1 : end].decode("ascii"))
+        except (UnicodeDecodeError, ValueError):
+            return None
@@ -0,0 +1,92 @@
+"""Сервис для быстрого преобразования времени NGINX в секунды эпохи.
+
+Отвечает ТОЛЬКО за разбор поля $time_local без использования strptime.
+"""
+
+from datetime import UTC, date, datetime
+from functools import lru_cache
+from typing import ClassVar
+
+
+class TimeParserService:
+    """Преобразует время NGINX в "настенные" секунды эпохи.
+
+    Настенное время - локальное время записи без учета смещения часового пояса,
+    отсчитанное от 1970-01-01 как если бы оно было UTC. Такая шкала совпадает с
+    семантикой DateFilterService, который сравнивает время без tzinfo.
+    """
+
+    months: ClassVar[dict[str, int]] = {
+        "Jan": 1,
+        "Feb": 2,
+        "Mar": 3,
+        "Apr": 4,
+        "May": 5,
+        "Jun": 6,
+        "Jul": 7,
+        "Aug": 8,
+        "Sep": 9,
+        "Oct": 10,
+        "Nov": 11,
+        "Dec": 12,
+    }
+
+    # Длина строки вида "17/May/2015:08:05:32 +0000"
+    time_length = 26
+    seconds_per_day = 86400
+    epoch_ordinal = date(1970, 1, 1).toordinal()
+
+    @staticmethod
+    def to_epoch(time_str: str) -> int:
+        """Преобразует время NGINX в настенные секунды эпохи.
+
+        Args:
+            time_str: Время в формате "%d/%b/%Y:%H:%M:%S %z"
+
+        Returns:
+            int: Секунды от начала эпохи без учета часового пояса
+
+        Raises:
+            ValueError: Если строка не соответствует формату NGINX
+
+        Examples:
+            "01/Jan/1970:00:01:00 +0300" → 60
+
+        """
+        if len(time_str) != TimeParserService.time_length:
+            msg = f"Некорректное время NGINX: {time_str!r}"
+            raise ValueError(msg)
+
+        day_start = TimeParserService._day_start(time_str[:11])
+        try:
+            hours = int(time_str[12:14])
+            minutes = int(time_str[15:17])
+            seconds = int(time_str[18:20])
+        except ValueError as e:
+            msg = f"Некорректное время NGINX: {time_str!r}"
+            raise ValueError(msg) from e
+
+        return day_start + hours * 3600 + minutes * 60 + seconds
+
+    @staticmethod
+    def datetime_to_epoch(value: datetime) -> int:
+        """Преобразует datetime в настенные секунды эпохи (tzinfo игнорируется)."""
+        naive = value.replace(tzinfo=UTC)
+        return int(naive.timestamp())
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _day_start(date_str: str) -> int:
+        """Секунды эпохи для начала дня "17/May/2015" (с кэшированием)."""
+        try:
+            day = int(date_str[0:2])
+            month = TimeParserService.months[date_str[3:6]]
+            year = int(date_str[7:11])
+            ordinal = date(year, month, day).toordinal()
+        except (KeyError, ValueError) as e:
+            msg = f"Некорректная дата NGINX: {date_str!r}"
+            raise ValueError(msg) from e
+
+        return (
+            ordinal - TimeParserService.epoch_ordinal
+        ) * TimeParserService.seconds_per_day
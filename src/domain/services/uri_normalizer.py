@@ -0,0 +1,124 @@
+"""Нормализация путей ресурсов в шаблоны.
+
+Отвечает ТОЛЬКО за приведение путей с идентификаторами к общему шаблону.
+"""
+
+import re
+from urllib.parse import unquote
+
+
+class UriNormalizer:
+    """Сворачивает пути с идентификаторами в шаблоны.
+
+    /users/123?ts=1 и /users/124 → /users/{id}:
+    1. Отбрасываются query string и фрагмент
+    2. Путь декодируется из percent-encoding
+    3. Сегменты пути, целиком совпадающие с правилом, заменяются на {имя}
+
+    Все правила собраны в одно регулярное выражение с именованными
+    группами, поэтому путь проходится один раз. Результаты кэшируются
+    в ограниченном словаре: одни и те же пути повторяются в каждом пакете.
+    """
+
+    # Правила по умолчанию в порядке приоритета: имя → шаблон сегмента
+    default_rules: tuple[tuple[str, str], ...] = (
+        ("uuid", r"[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}"),
+        ("id", r"\d+"),
+        ("hash", r"[0-9a-fA-F]{16,}"),
+    )
+
+    default_cache_size = 65536
+
+    rule_name_pattern = re.compile(r"[A-Za-z_]\w*")
+
+    def __init__(
+        self,
+        rules: tuple[tuple[str, str], ...] = (),
+        cache_size: int = default_cache_size,
+    ) -> None:
+        """rules: Дополнительные правила, проверяются раньше правил по умолчанию."""
+        self.rules = (*rules, *self.default_rules)
+        self.cache_size = cache_size
+        self._pattern = self._compile(self.rules)
+        self._cache: dict[str, str] = {}
+
+    @classmethod
+    def parse_rules(cls, raw: list[str] | None) -> tuple[tuple[str, str], ...]:
+        """Разбирает --uri-rule: ["version=v[0-9]+"] → (("version", "v[0-9]+"),).
+
+        Raises:
+            ValueError: Если правило не в формате имя=шаблон, шаблон некорректен
+                или содержит именованные группы
+
+        """
+        rules = []
+        for item in raw or ():
+            name, separator, pattern = item.partition("=")
+            name = name.strip()
+            if (
+                not separator
+                or not pattern
+                or not cls.rule_name_pattern.fullmatch(name)
+            ):
+                msg = f"Правило URI '{item}' должно иметь вид имя=регулярное_выражение"
+                raise ValueError(msg)
+            try:
+                compiled = re.compile(pattern)
+            except re.error as e:
+                msg = f"Некорректное регулярное выражение правила URI '{name}': {e}"
+                raise ValueError(msg) from e
+            if compiled.groupindex:
+                # Имя шаблона берется из match.lastgroup правила
+                msg = f"Правило URI '{name}' не должно содержать именованные группы"
+                raise ValueError(msg)
+            rules.append((name, pattern))
+
+        try:
+            cls._compile((*rules, *cls.default_rules))
+        except re.error as e:
+            msg = f"Некорректные правила URI: {e}"
+            raise ValueError(msg) from e
+        return tuple(rules)
+
+    def normalize(self, path: str) -> str:
+        """Возвращает шаблон пути.
+
+        Query string отбрасывается до обращения к кэшу, поэтому пути,
+        отличающиеся только параметрами, разделяют одну запись кэша.
+        """
+        path = path.partition("?")[0].partition("#")[0]
+        cache = self._cache
+        normalized = cache.get(path)
+        if normalized is None:
+            normalized = self._normalize(path)
+            if len(cache) >= self.cache_size:
+                cache.clear()
+            cache[path] = normalized
+        return normalized
+
+    def _normalize(self, path: str) -> str:
+        """Нормализация пути без query string (без кэша)."""
+        if "%" in path:
+            path = unquote(path)
+        return self._pattern.sub(self._template, path) or "/"
+
+    @staticmethod
+    def _template(match: re.Match[str]) -> str:
+        return "{" + match.lastgroup + "}"
+
+    @staticmethod
+    def _compile(rules: tuple[tuple[str, str], ...]) -> re.Pattern[str]:
+        """Собирает правила в одно выражение по целым сегментам пути.
+
+        Raises:
+            ValueError: Если имена правил повторяются
+
+        """
+        names = [name for name, _ in rules]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            msg = f"Повторяющиеся имена правил URI: {', '.join(duplicates)}"
+            raise ValueError(msg)
+
+        alternatives = "|".join(f"(?P<{name}>{pattern})" for name, pattern in rules)
+        return re.compile(rf"(?<=/)(?:{alternatives})(?=/|$)")
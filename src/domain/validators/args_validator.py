@@ -1,10 +1,43 @@
 from argparse import Namespace
 from datetime import datetime
+from typing import ClassVar
+
+from src.core.implementations.parsers.json_log_parser import NginxJsonLogParser
+from src.core.implementations.parsers.template_log_parser import NginxTemplateLogParser
+from src.domain.accumulators.group_by_accumulator import GroupByAccumulator
+from src.domain.calculators.hyperloglog import HyperLogLog
+from src.domain.services.bot_classifier import BotClassifier
+from src.domain.services.line_filter_service import LineFilterService
+from src.domain.services.metric_registry import MetricRegistry
+from src.domain.services.uri_normalizer import UriNormalizer
 
 
 class ArgsValidator:
     """Валидатор аргументов командной строки."""
 
+    # Настройки метрик, которые должны быть положительными
+    positive_options: ClassVar[tuple[tuple[str, str], ...]] = (
+        ("group_limit", "Лимит числа групп должен быть положительным"),
+        (
+            "top_clients_capacity",
+            "Размер сводки топа клиентов должен быть положительным",
+        ),
+        (
+            "resource_bytes_capacity",
+            "Размер сводки трафика ресурсов должен быть положительным",
+        ),
+        (
+            "timings_capacity",
+            "Размер сводки ресурсов времени ответа должен быть положительным",
+        ),
+        ("anomaly_threshold", "Порог z-оценки аномалий должен быть положительным"),
+        ("resource_window", "Окно топа ресурсов должно быть положительным"),
+        (
+            "resource_window_capacity",
+            "Размер сводки топа ресурсов окна должен быть положительным",
+        ),
+    )
+
     @staticmethod
     def validate_args(args: Namespace) -> None:
         """Валидирует аргументы командной строки."""
@@ -15,3 +48,72 @@ class ArgsValidator:
         if args.date_from and args.date_to and args.date_from >= args.date_to:
             msg = "Дата 'from' должна быть меньше даты 'to'"
             raise ValueError(msg)
+
+        malformed_examples = getattr(args, "malformed_examples", None)
+        if malformed_examples is not None and malformed_examples < 0:
+            msg = "Количество примеров некорректных строк не может быть отрицательным"
+            raise ValueError(msg)
+
+        intern_size = getattr(args, "intern_size", None)
+        if intern_size is not None and intern_size < 0:
+            msg = "Размер словаря строк не может быть отрицательным"
+            raise ValueError(msg)
+
+        percentile_error = getattr(args, "percentile_error", None)
+        if percentile_error is not None and not 0 < percentile_error < 1:
+            msg = "Относительная ошибка перцентиля должна быть в интервале (0, 1)"
+            raise ValueError(msg)
+        percentile_sample = getattr(args, "percentile_sample", None)
+        if percentile_sample is not None and percentile_sample <= 0:
+            msg = "Размер выборки перцентиля должен быть положительным"
+            raise ValueError(msg)
+
+        distinct_precision = getattr(args, "distinct_precision", None)
+        if distinct_precision is not None and not (
+            HyperLogLog.min_precision <= distinct_precision <= HyperLogLog.max_precision
+        ):
+            msg = (
+                f"Точность HyperLogLog должна быть от {HyperLogLog.min_precision} "
+                f"до {HyperLogLog.max_precision}"
+            )
+            raise ValueError(msg)
+
+        # Фильтры строк компилируются заранее, чтобы ошибки всплыли до чтения
+        LineFilterService.from_args(args)
+        BotClassifier.parse_signatures(getattr(args, "bot_pattern", None))
+        BotClassifier.validate_traffic(getattr(args, "traffic", None))
+        NginxJsonLogParser.parse_key_map(getattr(args, "json_keys", None))
+        log_template = getattr(args, "nginx_log_format", None)
+        if log_template:
+            NginxTemplateLogParser.compile(log_template)
+        ArgsValidator._validate_metrics(args)
+
+    @staticmethod
+    def _validate_positive(args: Namespace) -> None:
+        """Валидирует настройки метрик, которые должны быть положительными."""
+        for name, message in ArgsValidator.positive_options:
+            value = getattr(args, name, None)
+            if value is not None and value <= 0:
+                raise ValueError(message)
+
+    @staticmethod
+    def _validate_metrics(args: Namespace) -> None:
+        """Валидирует выбор метрик и настройки группировки."""
+        MetricRegistry.parse(getattr(args, "metrics", None))
+        UriNormalizer.parse_rules(getattr(args, "uri_rule", None))
+
+        ArgsValidator._validate_positive(args)
+        session_timeout = getattr(args, "session_timeout", None)
+        if session_timeout is not None and session_timeout * 60 < 1:
+            msg = "Таймаут неактивности сессии должен быть не меньше секунды"
+            raise ValueError(msg)
+        anomaly_window = getattr(args, "anomaly_window", None)
+        if anomaly_window is not None and anomaly_window <= 1:
+            msg = "Окно базы аномалий должно быть больше одной минуты"
+            raise ValueError(msg)
+        group_by = getattr(args, "group_by", None)
+        if group_by is not None:
+            dimensions = GroupByAccumulator.parse_dimensions(group_by)
+            if not getattr(args, "ip_db", None):
+                GroupByAccumulator.require_network_index(dimensions)
+        GroupByAccumulator.parse_aggregates(getattr(args, "aggregate", None))
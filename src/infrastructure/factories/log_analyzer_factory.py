@@ -3,12 +3,32 @@
 Собирает все зависимости для анализа логов.
 """
 
+from argparse import Namespace
+
+from src.core.abstractions.metrics import MetricOptions
 from src.core.implementations.calculators.nginx_statistics_calculator import (
     NginxStatisticsCalculator,
 )
+from src.core.implementations.parsers.json_log_parser import NginxJsonLogParser
 from src.core.implementations.parsers.log_parser import NginxLogParser
+from src.domain.accumulators.anomaly_accumulator import AnomalyAccumulator
+from src.domain.accumulators.resource_bytes_accumulator import ResourceBytesAccumulator
+from src.domain.accumulators.session_accumulator import SessionAccumulator
+from src.domain.accumulators.time_series_accumulator import TimeSeriesAccumulator
+from src.domain.accumulators.timing_accumulator import TimingAccumulator
+from src.domain.accumulators.top_clients_accumulator import TopClientsAccumulator
+from src.domain.accumulators.windowed_top_accumulator import WindowedTopAccumulator
+from src.domain.calculators.hyperloglog import HyperLogLog
+from src.domain.calculators.size_statistics_calculator import SizeStatisticsCalculator
+from src.domain.services.bot_classifier import BotClassifier
+from src.domain.services.ip_network_index import IpNetworkIndex
 from src.domain.services.log_analyze_service import LogAnalyzerService
+from src.domain.services.malformed_line_reporter import MalformedLineReporter
+from src.domain.services.metric_registry import MetricRegistry
+from src.domain.services.string_interner import StringInterner
+from src.domain.services.uri_normalizer import UriNormalizer
 from src.infrastructure.factories.formatter_factory import FormatterFactory
+from src.infrastructure.factories.parser_factory import ParserFactory
 from src.infrastructure.factories.reader_factory import ReaderFactory
 
 
@@ -22,16 +42,57 @@ class LogAnalyzerFactory:
     """
 
     @staticmethod
-    def create() -> LogAnalyzerService:
+    def create(args: Namespace | None = None) -> LogAnalyzerService:
         """Создает готовый к работе LogAnalyzerService.
 
+        Args:
+            args: Аргументы CLI для настройки компонентов (опционально)
+
         Returns:
             LogAnalyzerService: Сервис со всеми зависимостями
 
         """
         reader_factory = ReaderFactory()
-        parser = NginxLogParser()
-        calculator = NginxStatisticsCalculator()
+        malformed_reporter = LogAnalyzerFactory._create_malformed_reporter(args)
+        time_series_granularity = LogAnalyzerFactory._time_series_granularity(args)
+        distinct_precision = LogAnalyzerFactory._distinct_precision(args)
+        metrics = MetricRegistry.parse(getattr(args, "metrics", None))
+        options = MetricOptions(
+            time_series_granularity=time_series_granularity,
+            distinct_precision=distinct_precision,
+            group_by=getattr(args, "group_by", None),
+            group_aggregates=getattr(args, "aggregate", None),
+            group_limit=getattr(args, "group_limit", None),
+            top_clients_capacity=LogAnalyzerFactory._top_clients_capacity(args),
+            client_prefix=getattr(args, "client_prefix", False),
+            resource_bytes_capacity=LogAnalyzerFactory._resource_bytes_capacity(args),
+            timings_capacity=LogAnalyzerFactory._timings_capacity(args),
+            session_timeout=LogAnalyzerFactory._session_timeout(args),
+            anomaly_window=LogAnalyzerFactory._anomaly_window(args),
+            anomaly_threshold=getattr(args, "anomaly_threshold", None),
+            resource_window=LogAnalyzerFactory._resource_window(args),
+            resource_window_capacity=getattr(args, "resource_window_capacity", None),
+            uri_normalizer=LogAnalyzerFactory._create_uri_normalizer(args),
+            ip_index=LogAnalyzerFactory._create_ip_index(args),
+            bot_classifier=BotClassifier.from_args(args),
+        )
+        metric_names = MetricRegistry.select(metrics, options)
+        interner = LogAnalyzerFactory._create_interner(
+            args, MetricRegistry.fields(metric_names, options)
+        )
+        parser = NginxLogParser(malformed_reporter, interner)
+        parser_factory = ParserFactory(
+            malformed_reporter,
+            log_format=getattr(args, "log_format", None),
+            json_keys=NginxJsonLogParser.parse_key_map(
+                getattr(args, "json_keys", None)
+            ),
+            interner=interner,
+            log_template=getattr(args, "nginx_log_format", None),
+        )
+        calculator = NginxStatisticsCalculator(
+            LogAnalyzerFactory._create_size_calculator(args), options, metrics
+        )
         formatter_factory = FormatterFactory()
 
         return LogAnalyzerService(
@@ -39,4 +100,144 @@ class LogAnalyzerFactory:
             parser=parser,
             calculator=calculator,
             formatter_factory=formatter_factory,
+            parser_factory=parser_factory,
+        )
+
+    @staticmethod
+    def _create_malformed_reporter(args: Namespace | None) -> MalformedLineReporter:
+        """Создает учет некорректных строк по --malformed-examples/--quarantine."""
+        max_examples = getattr(args, "malformed_examples", None)
+        if max_examples is None:
+            max_examples = MalformedLineReporter.default_max_examples
+
+        return MalformedLineReporter(
+            max_examples=max_examples,
+            quarantine_path=getattr(args, "quarantine", None),
+        )
+
+    @staticmethod
+    def _create_interner(
+        args: Namespace | None, fields: set[str]
+    ) -> StringInterner | None:
+        """Создает словарь строк по --intern-size/--intern-overflow (0 - выключен).
+
+        Кодируются только поля, которые читают выбранные метрики.
+        """
+        max_size = getattr(args, "intern_size", None)
+        if max_size is None:
+            max_size = StringInterner.default_max_size
+        interned_fields = tuple(
+            name for name in StringInterner.default_fields if name in fields
+        )
+        if max_size == 0 or not interned_fields:
+            return None
+
+        return StringInterner(
+            max_size=max_size,
+            overflow=getattr(args, "intern_overflow", None) or "freeze",
+            fields=interned_fields,
+        )
+
+    @staticmethod
+    def _time_series_granularity(args: Namespace | None) -> str | None:
+        """Гранулярность временного ряда по --time-series/--time-series-csv."""
+        granularity = getattr(args, "time_series", None)
+        if granularity is None and getattr(args, "time_series_csv", None):
+            return TimeSeriesAccumulator.default_granularity
+        return granularity
+
+    @staticmethod
+    def _distinct_precision(args: Namespace | None) -> int | None:
+        """Точность HyperLogLog по --distinct/--distinct-precision.
+
+        --distinct-precision включает уникальные значения сам.
+        """
+        precision = getattr(args, "distinct_precision", None)
+        if precision is None and not getattr(args, "distinct", False):
+            return None
+        return HyperLogLog.default_precision if precision is None else precision
+
+    @staticmethod
+    def _top_clients_capacity(args: Namespace | None) -> int | None:
+        """Размер сводки топа клиентов по --top-clients/--top-clients-capacity.
+
+        --top-clients-capacity и --client-prefix включают топ клиентов сами.
+        """
+        capacity = getattr(args, "top_clients_capacity", None)
+        if capacity is None and not (
+            getattr(args, "top_clients", False) or getattr(args, "client_prefix", False)
+        ):
+            return None
+        return TopClientsAccumulator.default_capacity if capacity is None else capacity
+
+    @staticmethod
+    def _resource_bytes_capacity(args: Namespace | None) -> int | None:
+        """Размер сводки трафика ресурсов по --resource-bytes(-capacity)."""
+        capacity = getattr(args, "resource_bytes_capacity", None)
+        if capacity is None and not getattr(args, "resource_bytes", False):
+            return None
+        return (
+            ResourceBytesAccumulator.default_capacity if capacity is None else capacity
+        )
+
+    @staticmethod
+    def _timings_capacity(args: Namespace | None) -> int | None:
+        """Размер сводки ресурсов времени ответа по --timings(-capacity)."""
+        capacity = getattr(args, "timings_capacity", None)
+        if capacity is None and not getattr(args, "timings", False):
+            return None
+        return TimingAccumulator.default_capacity if capacity is None else capacity
+
+    @staticmethod
+    def _session_timeout(args: Namespace | None) -> int | None:
+        """Таймаут неактивности сессии в секундах по --sessions/--session-timeout."""
+        minutes = getattr(args, "session_timeout", None)
+        if minutes is None:
+            if not getattr(args, "sessions", False):
+                return None
+            return SessionAccumulator.default_timeout
+        return round(minutes * 60)
+
+    @staticmethod
+    def _anomaly_window(args: Namespace | None) -> int | None:
+        """Окно базы аномалий в минутах по --anomalies/--anomaly-window."""
+        window = getattr(args, "anomaly_window", None)
+        if window is None and not getattr(args, "anomalies", False):
+            return None
+        return AnomalyAccumulator.default_window if window is None else window
+
+    @staticmethod
+    def _resource_window(args: Namespace | None) -> int | None:
+        """Ширина окна топа ресурсов в секундах по --windowed-resources(-window)."""
+        minutes = getattr(args, "resource_window", None)
+        if minutes is None:
+            if not getattr(args, "windowed_resources", False):
+                return None
+            return WindowedTopAccumulator.default_window
+        return minutes * 60
+
+    @staticmethod
+    def _create_uri_normalizer(args: Namespace | None) -> UriNormalizer | None:
+        """Создает нормализатор путей по --normalize-uri/--uri-rule."""
+        rules = getattr(args, "uri_rule", None)
+        if not getattr(args, "normalize_uri", False) and not rules:
+            return None
+        return UriNormalizer(UriNormalizer.parse_rules(rules))
+
+    @staticmethod
+    def _create_ip_index(args: Namespace | None) -> IpNetworkIndex | None:
+        """Загружает справочник сетей по --ip-db (с бинарным кэшем)."""
+        ip_db = getattr(args, "ip_db", None)
+        return IpNetworkIndex.load(ip_db) if ip_db else None
+
+    @staticmethod
+    def _create_size_calculator(args: Namespace | None) -> SizeStatisticsCalculator:
+        """Создает калькулятор размеров по --percentile-mode/-error/-sample."""
+        options = {
+            "mode": getattr(args, "percentile_mode", None),
+            "relative_error": getattr(args, "percentile_error", None),
+            "sample_size": getattr(args, "percentile_sample", None),
+        }
+        return SizeStatisticsCalculator(
+            **{name: value for name, value in options.items() if value is not None}
         )
@@ -0,0 +1,150 @@
+"""Фабрика для создания парсеров логов.
+
+Отвечает за выбор реализации ILogParser по образцу строк источника.
+"""
+
+import logging
+
+from src.core.abstractions.parsers import ILogParser
+from src.core.implementations.parsers.generic_log_parser import GenericLogParser
+from src.core.implementations.parsers.json_log_parser import NginxJsonLogParser
+from src.core.implementations.parsers.log_parser import NginxLogParser
+from src.core.implementations.parsers.template_log_parser import NginxTemplateLogParser
+from src.core.implementations.parsers.timed_log_parser import NginxTimedLogParser
+from src.domain.services.malformed_line_reporter import MalformedLineReporter
+from src.domain.services.string_interner import StringInterner
+
+logger = logging.getLogger(__name__)
+
+
+class ParserFactory:
+    """Фабрика для создания парсеров логов.
+
+    Ответственность:
+    - Автоопределение формата по первым строкам источника
+    - Выбор самого быстрого подходящего строгого парсера
+    - Запасной нестрогий парсер, если ни один строгий формат не подошел
+    - Парсер по строке log_format, если она задана
+
+    Не знает о:
+    - Источнике строк (файл, URL)
+    - Расчете статистики и форматах вывода
+    """
+
+    auto_format = "auto"
+    sample_size = 500
+
+    # Доля строк образца, которую должен распознать строгий парсер
+    min_match_ratio = 0.5
+
+    # Строгие парсеры в порядке предпочтения (быстрые - первыми)
+    strict_parsers: tuple[type[ILogParser], ...] = (
+        NginxLogParser,
+        NginxTimedLogParser,
+        NginxJsonLogParser,
+    )
+    fallback_parser: type[ILogParser] = GenericLogParser
+
+    def __init__(
+        self,
+        malformed_reporter: MalformedLineReporter | None = None,
+        log_format: str = auto_format,
+        json_keys: dict[str, str] | None = None,
+        interner: StringInterner | None = None,
+        log_template: str | None = None,
+    ) -> None:
+        self.malformed_reporter = malformed_reporter or MalformedLineReporter()
+        self.log_format = self.validate_format(log_format)
+        self.json_keys = json_keys or {}
+        self.interner = interner
+        self.log_template = log_template
+        self._instances: dict[str, ILogParser] = {}
+
+    @classmethod
+    def supported_formats(cls) -> list[str]:
+        """Возвращает имена форматов для --log-format."""
+        return [
+            cls.auto_format,
+            *(parser.format_name for parser in cls.strict_parsers),
+            cls.fallback_parser.format_name,
+        ]
+
+    @classmethod
+    def validate_format(cls, log_format: str | None) -> str:
+        """Проверяет имя формата.
+
+        Raises:
+            ValueError: Если формат не поддерживается
+
+        """
+        log_format = (log_format or cls.auto_format).lower().strip()
+        if log_format not in cls.supported_formats():
+            msg = (
+                f"Unsupported log format: '{log_format}'. "
+                f"Supported formats: {', '.join(cls.supported_formats())}"
+            )
+            raise ValueError(msg)
+        return log_format
+
+    def create_parser(self, sample: list[str], source: str = "") -> ILogParser:
+        """Создает парсер для источника по образцу его первых строк.
+
+        Args:
+            sample: Первые строки источника (до sample_size)
+            source: Имя источника для логирования
+
+        Returns:
+            ILogParser: Парсер по log_format, если он задан; иначе первый
+            строгий парсер с максимальной долей совпадений или нестрогий
+            запасной парсер, если совпадений слишком мало
+
+        """
+        if self.log_template:
+            return self._get_instance(NginxTemplateLogParser)
+        if self.log_format != self.auto_format:
+            return self._get_instance(self._parser_class(self.log_format))
+
+        lines = [line for line in sample if line and not line.isspace()]
+        if not lines:
+            return self._get_instance(self.strict_parsers[0])
+
+        best_class = None
+        best_matches = 0
+        for parser_class in self.strict_parsers:
+            parser = self._get_instance(parser_class)
+            matches = sum(1 for line in lines if parser.matches(line))
+            if matches > best_matches:
+                best_class, best_matches = parser_class, matches
+            if matches == len(lines):
+                break
+
+        if best_class is None or best_matches < len(lines) * self.min_match_ratio:
+            best_class = self.fallback_parser
+
+        logger.info(f"Формат источника {source or '-'}: {best_class.format_name}")
+        return self._get_instance(best_class)
+
+    def _parser_class(self, log_format: str) -> type[ILogParser]:
+        """Возвращает класс парсера по имени формата."""
+        for parser_class in (*self.strict_parsers, self.fallback_parser):
+            if parser_class.format_name == log_format:
+                return parser_class
+        msg = f"Unsupported log format: '{log_format}'"
+        raise ValueError(msg)
+
+    def _get_instance(self, parser_class: type[ILogParser]) -> ILogParser:
+        """Возвращает общий экземпляр парсера (общие учет ошибок и словарь строк)."""
+        name = parser_class.format_name
+        if name not in self._instances:
+            if issubclass(parser_class, NginxTemplateLogParser):
+                parser = parser_class(
+                    self.log_template, self.malformed_reporter, self.interner
+                )
+            elif issubclass(parser_class, NginxJsonLogParser):
+                parser = parser_class(
+                    self.malformed_reporter, self.json_keys, self.interner
+                )
+            else:
+                parser = parser_class(self.malformed_reporter, self.interner)
+            self._instances[name] = parser
+        return self._instances[name]
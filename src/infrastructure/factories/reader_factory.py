@@ -24,11 +24,15 @@ class ReaderFactory:
     """
 
     @staticmethod
-    def create_reader(path: str) -> IFileReader:
+    def create_reader(
+        path: str, time_range: tuple[int | None, int | None] | None = None
+    ) -> IFileReader:
         """Создает ридер на основе анализа пути.
 
         Args:
             path: Путь к файлу (локальный, шаблон glob или URL)
+            time_range: Диапазон времени в настенных секундах эпохи; позволяет
+                локальному ридеру пропускать участки по sidecar-индексу
 
         Returns:
             IFileReader: Соответствующая реализация ридера
@@ -51,4 +55,4 @@ class ReaderFactory:
         # Используем UrlValidator для определения типа пути
         if UrlValidator.is_valid(path):
             return UrlReader()
-        return LocalFileReader()
+        return LocalFileReader(time_range=time_range)
@@ -2,21 +2,33 @@ import argparse
 import logging
 import sys
 
+from src.domain.accumulators.time_series_accumulator import TimeSeriesAccumulator
+from src.domain.calculators.size_statistics_calculator import SizeStatisticsCalculator
+from src.domain.services.bot_classifier import BotClassifier
+from src.domain.services.metric_registry import MetricRegistry
+from src.domain.services.string_interner import StringInterner
+from src.domain.services.time_index_service import TimeIndexService
 from src.domain.validators.args_validator import ArgsValidator
 from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+from src.infrastructure.factories.parser_factory import ParserFactory
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+INDEX_COMMAND = "index"
+
 
 def main() -> int:
     """Точка входа приложения."""
+    if sys.argv[1:2] == [INDEX_COMMAND]:
+        return run_index(sys.argv[2:])
+
     try:
         args = parse_args()
         ArgsValidator.validate_args(args)  # ← Валидация в main
-        analyzer = LogAnalyzerFactory.create()
+        analyzer = LogAnalyzerFactory.create(args)
         return analyzer.analyze(args)
 
     except (ValueError, FileNotFoundError):
@@ -25,6 +37,20 @@ def main() -> int:
         return 1
 
 
+def run_index(argv: list[str]) -> int:
+    """Точка входа подкоманды index: строит sidecar-индексы времени."""
+    try:
+        args = parse_index_args(argv)
+        TimeIndexService().write_indexes(args.path, args.bucket)
+
+    except (ValueError, FileNotFoundError):
+        return 2
+    except Exception:
+        return 1
+    else:
+        return 0
+
+
 def parse_args() -> argparse.Namespace:
     """ТОЛЬКО парсинг аргументов."""
     parser = argparse.ArgumentParser(description="Анализатор логов NGINX")
@@ -37,8 +63,254 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument("--from", dest="date_from", default=None)
     parser.add_argument("--to", dest="date_to", default=None)
+    parser.add_argument(
+        "--log-format",
+        default=ParserFactory.auto_format,
+        choices=ParserFactory.supported_formats(),
+        help="Формат логов (по умолчанию определяется по первым строкам файла)",
+    )
+    parser.add_argument(
+        "--json-keys",
+        default=None,
+        help="Ключи JSON-логов: status=code,remote_addr=client_ip",
+    )
+    parser.add_argument(
+        "--nginx-log-format",
+        default=None,
+        help="Строка log_format из конфигурации NGINX: "
+        "'$remote_addr - $remote_user [$time_local] \"$request\" $status ...' "
+        "(заменяет --log-format)",
+    )
+    parser.add_argument(
+        "--status", default=None, help="Фильтр статусов: 404, 5xx, 4xx,500"
+    )
+    parser.add_argument(
+        "--path-prefix", default=None, help="Фильтр префиксов пути: /api/,/static/"
+    )
+    parser.add_argument(
+        "--ip", default=None, help="Фильтр клиентов: 10.0.0.1, 10.0.0.0/24"
+    )
+    parser.add_argument("--method", default=None, help="Фильтр методов: GET,POST")
+    parser.add_argument(
+        "--traffic",
+        default=None,
+        choices=BotClassifier.traffic_types,
+        help="Считать только ботов или только людей (по user agent)",
+    )
+    parser.add_argument(
+        "--bot-pattern",
+        action="append",
+        default=None,
+        help="Дополнительная сигнатура бота: регулярное выражение по user agent",
+    )
+    parser.add_argument(
+        "--malformed-examples",
+        type=int,
+        default=None,
+        help="Сколько некорректных строк вывести в лог как примеры",
+    )
+    parser.add_argument(
+        "--quarantine", default=None, help="Файл для записи некорректных строк"
+    )
+    parser.add_argument(
+        "--percentile-mode",
+        default="exact",
+        choices=SizeStatisticsCalculator.modes,
+        help="Метод расчета 95p: exact, sketch (--percentile-error), "
+        "sample (--percentile-sample)",
+    )
+    parser.add_argument(
+        "--percentile-error",
+        type=float,
+        default=None,
+        help="Относительная ошибка значения для sketch (по умолчанию 0.01)",
+    )
+    parser.add_argument(
+        "--percentile-sample",
+        type=int,
+        default=None,
+        help="Размер выборки для sample (по умолчанию 10000)",
+    )
+    parser.add_argument(
+        "--intern-size",
+        type=int,
+        default=None,
+        help="Размер словаря повторяющихся строк на поле (0 - выключить)",
+    )
+    parser.add_argument(
+        "--intern-overflow",
+        default="freeze",
+        choices=StringInterner.overflow_policies,
+        help="Политика переполнения словаря строк",
+    )
+    parser.add_argument(
+        "--metrics",
+        default=None,
+        help="Метрики отчета через запятую: "
+        f"{','.join(MetricRegistry.names())} "
+        f"(по умолчанию {','.join(MetricRegistry.default_names)})",
+    )
+    parser.add_argument(
+        "--distinct",
+        action="store_true",
+        help="Оценка числа уникальных клиентов, ресурсов и user agent",
+    )
+    parser.add_argument(
+        "--distinct-precision",
+        type=int,
+        default=None,
+        help="Точность HyperLogLog: 2^p регистров на поле (по умолчанию 14); "
+        "включает --distinct",
+    )
+    parser.add_argument(
+        "--normalize-uri",
+        action="store_true",
+        help="Сворачивать пути ресурсов в шаблоны: /users/123?x=1 → /users/{id}",
+    )
+    parser.add_argument(
+        "--uri-rule",
+        action="append",
+        default=None,
+        help="Дополнительное правило шаблона сегмента: имя=регулярное_выражение",
+    )
+    parser.add_argument(
+        "--group-by",
+        default=None,
+        help="Группировка по измерениям: resource,status_class (колонки лога, "
+        "resource, method, protocol, status_class, date, hour, minute, asn, country, "
+        "client_type)",
+    )
+    parser.add_argument(
+        "--ip-db",
+        default=None,
+        help="CSV-справочник сетей для измерений asn и country: "
+        "network,asn,country или start,end,asn,country",
+    )
+    parser.add_argument(
+        "--aggregate",
+        default=None,
+        help="Агрегаты группировки: count,sum:body_bytes_sent,p95:body_bytes_sent",
+    )
+    parser.add_argument(
+        "--group-limit",
+        type=int,
+        default=None,
+        help="Максимум групп, остальные строки попадают в группу (other) "
+        "(по умолчанию 1000)",
+    )
+    parser.add_argument(
+        "--top-clients",
+        action="store_true",
+        help="Топ клиентов по числу запросов и по body_bytes_sent",
+    )
+    parser.add_argument(
+        "--top-clients-capacity",
+        type=int,
+        default=None,
+        help="Сколько адресов хранит сводка топа клиентов (по умолчанию 1000)",
+    )
+    parser.add_argument(
+        "--client-prefix",
+        action="store_true",
+        help="Сворачивать клиентов в подсети /24 (IPv4) и /48 (IPv6)",
+    )
+    parser.add_argument(
+        "--resource-bytes",
+        action="store_true",
+        help="Топ ресурсов по body_bytes_sent со средним и 95p размера ответа",
+    )
+    parser.add_argument(
+        "--resource-bytes-capacity",
+        type=int,
+        default=None,
+        help="Сколько ресурсов хранит сводка трафика (по умолчанию 1000)",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Перцентили $request_time и $upstream_response_time: общие "
+        "и по популярным ресурсам (нужен формат с таймингами)",
+    )
+    parser.add_argument(
+        "--timings-capacity",
+        type=int,
+        default=None,
+        help="Сколько ресурсов хранит сводка времени ответа (по умолчанию 100)",
+    )
+    parser.add_argument(
+        "--sessions",
+        action="store_true",
+        help="Сессии клиентов (remote_addr + user agent): число по дням, "
+        "длительность и запросы на сессию",
+    )
+    parser.add_argument(
+        "--session-timeout",
+        type=float,
+        default=None,
+        help="Таймаут неактивности сессии в минутах (по умолчанию 30)",
+    )
+    parser.add_argument(
+        "--anomalies",
+        action="store_true",
+        help="Аномалии поминутного числа запросов и доли 5xx (EWMA, z-оценка)",
+    )
+    parser.add_argument(
+        "--anomaly-window",
+        type=int,
+        default=None,
+        help="Окно скользящей базы аномалий в минутах (по умолчанию 30)",
+    )
+    parser.add_argument(
+        "--anomaly-threshold",
+        type=float,
+        default=None,
+        help="Порог |z-оценки| минуты-выброса (по умолчанию 3)",
+    )
+    parser.add_argument(
+        "--windowed-resources",
+        action="store_true",
+        help="Топ-10 ресурсов в каждом окне времени (по умолчанию в каждом часе)",
+    )
+    parser.add_argument(
+        "--resource-window",
+        type=int,
+        default=None,
+        help="Ширина окна топа ресурсов в минутах (по умолчанию 60)",
+    )
+    parser.add_argument(
+        "--resource-window-capacity",
+        type=int,
+        default=None,
+        help="Сколько ресурсов хранит сводка открытого окна (по умолчанию 100)",
+    )
+    parser.add_argument(
+        "--time-series",
+        default=None,
+        choices=TimeSeriesAccumulator.granularities,
+        help="Временной ряд запросов, байт и классов статусов по корзинам",
+    )
+    parser.add_argument(
+        "--time-series-csv",
+        default=None,
+        help="Файл для выгрузки временного ряда в CSV",
+    )
     return parser.parse_args()
 
 
+def parse_index_args(argv: list[str]) -> argparse.Namespace:
+    """ТОЛЬКО парсинг аргументов подкоманды index."""
+    parser = argparse.ArgumentParser(
+        prog=INDEX_COMMAND, description="Построение индексов времени"
+    )
+    parser.add_argument("-p", "--path", required=True, help="Путь к лог-файлам")
+    parser.add_argument(
+        "--bucket",
+        type=int,
+        default=TimeIndexService.default_bucket_seconds,
+        help="Размер временной корзины в секундах",
+    )
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,85 @@
+from datetime import UTC, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import NamedTuple
+
+from src.models.log_entry import LogEntry
+
+
+class CompactLogEntry(NamedTuple):
+    """Компактная неизменяемая запись лога NGINX.
+
+    Отвечает ТОЛЬКО за хранение данных.
+    В отличие от LogEntry не имеет __dict__ и создается без frozen-__setattr__.
+    Время хранится как настенные секунды эпохи (локальное время записи,
+    отсчитанное как UTC) и смещение часового пояса в секундах; datetime
+    строится только при обращении к time_local, поэтому запись принимается
+    кодом, читающим атрибуты LogEntry. time_offset None - время без tzinfo.
+    """
+
+    remote_addr: str
+    remote_user: None | str
+    time_epoch: int
+    time_offset: None | int
+    request: str
+    status: int
+    body_bytes_sent: int
+    http_referer: str
+    http_user_agent: str
+    request_time: float | None = None
+    upstream_response_time: float | None = None
+
+    @property
+    def time_local(self) -> datetime:
+        """Время записи с часовым поясом (как LogEntry.time_local)."""
+        return CompactLogEntry._to_datetime(self.time_epoch, self.time_offset)
+
+    @classmethod
+    def from_entry(cls, entry: LogEntry) -> "CompactLogEntry":
+        """Создает компактную запись из LogEntry."""
+        epoch, offset = cls.split_time(entry.time_local)
+        return cls(
+            entry.remote_addr,
+            entry.remote_user,
+            epoch,
+            offset,
+            entry.request,
+            entry.status,
+            entry.body_bytes_sent,
+            entry.http_referer,
+            entry.http_user_agent,
+            entry.request_time,
+            entry.upstream_response_time,
+        )
+
+    def to_entry(self) -> LogEntry:
+        """Разворачивает запись в LogEntry."""
+        return LogEntry(
+            remote_addr=self.remote_addr,
+            remote_user=self.remote_user,
+            time_local=self.time_local,
+            request=self.request,
+            status=self.status,
+            body_bytes_sent=self.body_bytes_sent,
+            http_referer=self.http_referer,
+            http_user_agent=self.http_user_agent,
+            request_time=self.request_time,
+            upstream_response_time=self.upstream_response_time,
+        )
+
+    @staticmethod
+    def split_time(value: datetime) -> tuple[int, None | int]:
+        """Раскладывает datetime на настенные секунды эпохи и смещение."""
+        offset = value.utcoffset()
+        epoch = int(value.replace(tzinfo=UTC).timestamp())
+        if offset is None:
+            return epoch, None
+        return epoch, int(offset.total_seconds())
+
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def _to_datetime(epoch: int, offset: None | int) -> datetime:
+        """Строит datetime по настенным секундам и смещению (с кэшем)."""
+        wall = datetime.fromtimestamp(epoch, UTC)
+        if offset is None:
+            return wall.replace(tzinfo=None)
+        return wall.replace(tzinfo=timezone(timedelta(seconds=offset)))
@@ -0,0 +1,91 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from itertools import compress
+
+from src.models.compact_log_entry import CompactLogEntry
+from src.models.log_entry import LogEntry
+
+
+@dataclass(slots=True)
+class LogBatch:
+    """Колоночный пакет распознанных записей лога NGINX.
+
+    Отвечает ТОЛЬКО за хранение данных.
+    Колонки содержат только распознанные строки и имеют имена полей LogEntry.
+    valid - маска по входным строкам пакета: 1 - строка распознана, 0 - пропущена.
+    """
+
+    remote_addr: list[str] = field(default_factory=list)
+    remote_user: list[None | str] = field(default_factory=list)
+    time_local: list[datetime] = field(default_factory=list)
+    request: list[str] = field(default_factory=list)
+    status: list[int] = field(default_factory=list)
+    body_bytes_sent: list[int] = field(default_factory=list)
+    http_referer: list[str] = field(default_factory=list)
+    http_user_agent: list[str] = field(default_factory=list)
+    request_time: list[float | None] = field(default_factory=list)
+    upstream_response_time: list[float | None] = field(default_factory=list)
+    valid: bytearray = field(default_factory=bytearray)
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    @classmethod
+    def column_names(cls) -> tuple[str, ...]:
+        """Имена колонок данных (без маски valid)."""
+        return tuple(item.name for item in fields(cls) if item.name != "valid")
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[LogEntry]) -> "LogBatch":
+        """Собирает пакет из готовых записей (все строки считаются валидными)."""
+        batch = cls()
+        columns = [getattr(batch, name) for name in cls.column_names()]
+        names = cls.column_names()
+        for entry in entries:
+            for column, name in zip(columns, names, strict=True):
+                column.append(getattr(entry, name))
+        batch.valid.extend(b"\x01" * len(batch))
+        return batch
+
+    def to_entries(self) -> list[LogEntry]:
+        """Разворачивает пакет в список LogEntry."""
+        columns = [getattr(self, name) for name in self.column_names()]
+        return [LogEntry(*row) for row in zip(*columns, strict=True)]
+
+    def to_compact_entries(self) -> list[CompactLogEntry]:
+        """Разворачивает пакет в список CompactLogEntry.
+
+        Время раскладывается один раз на каждое уникальное значение в пакете.
+        """
+        times = dict.fromkeys(self.time_local)
+        for value in times:
+            times[value] = CompactLogEntry.split_time(value)
+
+        return [
+            CompactLogEntry(addr, user, *times[time], *rest)
+            for addr, user, time, *rest in zip(
+                self.remote_addr,
+                self.remote_user,
+                self.time_local,
+                self.request,
+                self.status,
+                self.body_bytes_sent,
+                self.http_referer,
+                self.http_user_agent,
+                self.request_time,
+                self.upstream_response_time,
+                strict=True,
+            )
+        ]
+
+    def select(self, keep: list[bool]) -> "LogBatch":
+        """Возвращает пакет только из строк, отмеченных в keep.
+
+        Маска valid сохраняется без изменений: она описывает результат
+        парсинга входных строк, а не последующую фильтрацию.
+        """
+        selected = LogBatch(valid=self.valid)
+        for name in self.column_names():
+            setattr(selected, name, list(compress(getattr(self, name), keep)))
+        return selected
@@ -7,6 +7,8 @@ class LogEntry:
     """Неизменяемая модель данных лога NGINX.
 
     Отвечает ТОЛЬКО за хранение данных.
+    Тайминги ($request_time, $upstream_response_time) - секунды;
+    None, если формат лога их не содержит или значение "-".
     """
 
     remote_addr: str
@@ -17,3 +19,5 @@ class LogEntry:
     body_bytes_sent: int
     http_referer: str
     http_user_agent: str
+    request_time: float | None = None
+    upstream_response_time: float | None = None
@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class TimeIndexSegment:
+    """Непрерывный участок лог-файла, покрытый одной временной корзиной.
+
+    Отвечает ТОЛЬКО за хранение данных.
+    min_time/max_time равны None, если в участке нет ни одной строки с
+    распознанным временем (такие участки нельзя отбросить по фильтру).
+    """
+
+    offset: int
+    length: int
+    line_count: int
+    min_time: int | None
+    max_time: int | None
+
+    def overlaps(self, start: int | None, end: int | None) -> bool:
+        """Проверяет пересечение участка с диапазоном [start, end]."""
+        if self.min_time is None or self.max_time is None:
+            return True
+        if start is not None and self.max_time < start:
+            return False
+        return not (end is not None and self.min_time > end)
+
+
+@dataclass(frozen=True)
+class TimeIndex:
+    """Индекс времени для одного лог-файла (sidecar-файл .idx).
+
+    Отвечает ТОЛЬКО за хранение данных.
+    Время хранится в настенных секундах эпохи (см. TimeParserService).
+    """
+
+    file_size: int
+    file_mtime_ns: int
+    bucket_seconds: int
+    segments: tuple[TimeIndexSegment, ...]
+
+    def select(self, start: int | None, end: int | None) -> list[TimeIndexSegment]:
+        """Возвращает участки, пересекающиеся с диапазоном [start, end]."""
+        return [segment for segment in self.segments if segment.overlaps(start, end)]
@@ -75,3 +75,51 @@ ANOTHER INVALID LINE"""
         finally:
             if os.path.exists(log_path):
                 os.unlink(log_path)
+
+    def test_malformed_lines_summary_in_report(self, temp_output_dir) -> None:
+        """Тест сводки по некорректным строкам в отчете и карантина."""
+        import json
+
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        log_content = """93.180.71.3 - - [17/May/2015:08:05:32 +0000] "GET /test HTTP/1.1" 200 100 "-" "Agent"
+INVALID LINE 1
+93.180.71.3 - - [17/Foo/2015:08:05:32 +0000] "GET /test HTTP/1.1" 200 100 "-" "Agent"
+INVALID LINE 2"""
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".log", delete=False) as f:
+            f.write(log_content)
+            log_path = f.name
+
+        try:
+            output_path = os.path.join(temp_output_dir, "report.json")
+            quarantine_path = os.path.join(temp_output_dir, "quarantine.log")
+
+            class Args:
+                path = log_path
+                output = output_path
+                format = "json"
+                date_from = None
+                date_to = None
+                malformed_examples = 1
+                quarantine = quarantine_path
+
+            analyzer = LogAnalyzerFactory.create(Args())
+            result = analyzer.analyze(Args())
+
+            assert result == 0
+            with open(output_path) as f:
+                report = json.load(f)
+            assert report["totalRequestsCount"] == 1
+            assert report["malformedLines"]["totalLinesCount"] == 3
+            assert {
+                item["reason"]: item["totalLinesCount"]
+                for item in report["malformedLines"]["reasons"]
+            } == {"format_mismatch": 2, "invalid_time": 1}
+
+            with open(quarantine_path) as f:
+                assert len(f.read().splitlines()) == 3
+
+        finally:
+            if os.path.exists(log_path):
+                os.unlink(log_path)
@@ -48,3 +48,70 @@ class TestFactories:
         assert hasattr(analyzer, "parser")
         assert hasattr(analyzer, "calculator")
         assert hasattr(analyzer, "formatter_factory")
+
+    @pytest.mark.parametrize(
+        ("sample", "expected_parser_type"),
+        [
+            (
+                [
+                    '1.1.1.1 - - [17/May/2015:08:05:32 +0000] "GET /a HTTP/1.1" 200 10 "-" "Agent"'
+                ],
+                "NginxLogParser",
+            ),
+            (
+                [
+                    '1.1.1.1 - - [17/May/2015:08:05:32 +0000] "GET /a HTTP/1.1" 200 10 "-" "Agent" 0.012 0.010, 0.002'
+                ],
+                "NginxTimedLogParser",
+            ),
+            (
+                ['1.1.1.1 - - [17/May/2015:08:05:32 +0000] "GET /a HTTP/1.1" 200 -'],
+                "GenericLogParser",
+            ),
+            (
+                [
+                    (
+                        '{"time_local":"17/May/2015:08:05:32 +0000",'
+                        '"remote_addr":"1.1.1.1","request":"GET /a HTTP/1.1",'
+                        '"status":"200"}'
+                    )
+                ],
+                "NginxJsonLogParser",
+            ),
+            ([], "NginxLogParser"),
+        ],
+    )
+    def test_parser_factory_detection(self, sample, expected_parser_type) -> None:
+        """Тест автоопределения формата по образцу строк."""
+        from src.infrastructure.factories.parser_factory import ParserFactory
+
+        parser = ParserFactory().create_parser(sample)
+
+        assert parser.__class__.__name__ == expected_parser_type
+
+    def test_parser_factory_explicit_format(self) -> None:
+        """Тест явного выбора формата и валидации имени формата."""
+        from src.infrastructure.factories.parser_factory import ParserFactory
+
+        factory = ParserFactory(log_format="generic")
+        parser = factory.create_parser([])
+        assert parser.__class__.__name__ == "GenericLogParser"
+
+        # Общий учет некорректных строк у всех парсеров фабрики
+        assert parser.malformed_reporter is factory.malformed_reporter
+
+        entries = parser.parse_lines(
+            iter(['1.1.1.1 x bob [17/May/2015:08:05:32 +0000] "GET /a HTTP/1.1" 200 -'])
+        )
+        assert entries[0].body_bytes_sent == 0
+        assert entries[0].http_user_agent == "-"
+
+        with pytest.raises(ValueError, match="Unsupported log format"):
+            ParserFactory(log_format="xml")
+
+        # Строка log_format заменяет автоопределение и --log-format
+        template = ParserFactory(
+            log_format="json",
+            log_template='$remote_addr [$time_local] "$request" $status',
+        )
+        assert template.create_parser([]).__class__.__name__ == "NginxTemplateLogParser"
@@ -118,3 +118,713 @@ class TestIntegration:
 
         except (OSError, requests.RequestException, ValueError) as e:
             pytest.skip(f"Не удалось загрузить удалённый файл: {e}")
+
+    def test_workflow_with_line_filters(self, temp_output_dir: str) -> None:
+        """Полный workflow с фильтрами строк: статистика только по подходящим."""
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        log_content = '''93.180.71.3 - - [17/May/2015:08:05:32 +0000] "GET /downloads/product_1 HTTP/1.1" 304 0 "-" "Debian APT-HTTP/1.3"
+80.91.33.133 - - [17/May/2015:08:05:33 +0000] "GET /downloads/product_2 HTTP/1.1" 200 512 "-" "Debian APT-HTTP/1.3"
+217.168.17.5 - - [17/May/2015:08:05:34 +0000] "POST /api/users HTTP/2.0" 404 0 "-" "Mozilla/5.0"'''
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".log", delete=False) as f:
+            f.write(log_content)
+            log_path = f.name
+
+        try:
+            output_path = os.path.join(temp_output_dir, "report.json")
+
+            class Args:
+                path = log_path
+                output = output_path
+                format = "json"
+                date_from = None
+                date_to = None
+                status = "2xx,3xx"
+                path_prefix = "/downloads/"
+                ip = None
+                method = "GET"
+
+            analyzer = LogAnalyzerFactory.create()
+            result = analyzer.analyze(Args())
+
+            assert result == 0
+            with open(output_path) as f:
+                content = f.read()
+                assert '"totalRequestsCount": 2' in content
+                assert "/api/users" not in content
+
+        finally:
+            if os.path.exists(log_path):
+                os.unlink(log_path)
+
+    def test_workflow_lists_only_log_files(self, temp_output_dir: str) -> None:
+        """Sidecar-индексы по шаблону glob не попадают в список файлов отчета."""
+        import json
+        from pathlib import Path
+
+        from src.domain.services.time_index_service import TimeIndexService
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        log_dir = Path(temp_output_dir) / "logs"
+        log_dir.mkdir()
+        (log_dir / "access.log").write_text(
+            '93.180.71.3 - - [17/May/2015:08:05:32 +0000] "GET /a HTTP/1.1" 200 1 "-" "A"\n'
+        )
+        # Повторная индексация по шаблону пропускает уже записанные индексы
+        TimeIndexService().write_indexes(str(log_dir / "*"))
+        assert TimeIndexService().write_indexes(str(log_dir / "*")) == [
+            log_dir / "access.log.idx"
+        ]
+        output_path = os.path.join(temp_output_dir, "report.json")
+
+        class Args:
+            path = str(log_dir / "*")
+            output = output_path
+            format = "json"
+            date_from = None
+            date_to = None
+
+        result = LogAnalyzerFactory.create(Args()).analyze(Args())
+
+        assert result == 0
+        with open(output_path) as f:
+            report = json.load(f)
+        assert report["files"] == ["access.log"]
+        assert report["totalRequestsCount"] == 1
+
+    def test_workflow_with_mixed_formats(self, temp_output_dir: str) -> None:
+        """Каждый файл в glob получает собственный парсер."""
+        import json
+
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        combined = '93.180.71.3 - - [17/May/2015:08:05:32 +0000] "GET /a HTTP/1.1" 200 100 "-" "Agent"\n'
+        timed = '93.180.71.3 - - [17/May/2015:08:05:33 +0000] "GET /b HTTP/1.1" 200 100 "-" "Agent" 0.010 0.008\n'
+
+        from pathlib import Path
+
+        log_dir = os.path.join(temp_output_dir, "logs")
+        Path(log_dir).mkdir()
+        with open(os.path.join(log_dir, "a.log"), "w") as f:
+            f.write(combined * 3)
+        with open(os.path.join(log_dir, "b.log"), "w") as f:
+            f.write(timed * 2)
+
+        output_path = os.path.join(temp_output_dir, "report.json")
+
+        class Args:
+            path = os.path.join(log_dir, "*.log")
+            output = output_path
+            format = "json"
+            date_from = None
+            date_to = None
+
+        result = LogAnalyzerFactory.create(Args()).analyze(Args())
+
+        assert result == 0
+        with open(output_path) as f:
+            report = json.load(f)
+        assert report["totalRequestsCount"] == 5
+        assert "malformedLines" not in report
+
+    def test_workflow_with_json_logs(self, temp_output_dir: str) -> None:
+        """Полный workflow для JSON-логов с ключами и фильтрами."""
+        import json
+
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        records = [
+            {
+                "time": "17/May/2015:08:05:32 +0000",
+                "remote_addr": "10.0.0.1",
+                "request": "GET /api/a HTTP/1.1",
+                "status": "200",
+                "body_bytes_sent": "10",
+            },
+            {
+                "time": "17/May/2015:08:05:33 +0000",
+                "remote_addr": "10.0.0.2",
+                "request": "GET /api/b HTTP/1.1",
+                "status": "500",
+                "body_bytes_sent": "30",
+            },
+            {
+                "time": "17/May/2015:08:05:34 +0000",
+                "remote_addr": "10.0.0.3",
+                "request": "GET /static/c HTTP/1.1",
+                "status": "200",
+                "body_bytes_sent": "5",
+            },
+        ]
+        log_path = os.path.join(temp_output_dir, "access.log")
+        with open(log_path, "w") as f:
+            f.writelines(json.dumps(record) + "\n" for record in records)
+
+        output_path = os.path.join(temp_output_dir, "report.json")
+
+        class Args:
+            path = log_path
+            output = output_path
+            format = "json"
+            date_from = None
+            date_to = None
+            json_keys = "time_local=time"
+            path_prefix = "/api/"
+
+        result = LogAnalyzerFactory.create(Args()).analyze(Args())
+
+        assert result == 0
+        with open(output_path) as f:
+            report = json.load(f)
+        assert report["totalRequestsCount"] == 2
+        assert report["responseSizeInBytes"]["max"] == 30
+        assert "malformedLines" not in report
+
+    def test_workflow_with_percentile_sketch(
+        self, sample_log_file: str, temp_output_dir: str
+    ) -> None:
+        """Метод перцентиля выбирается из CLI и указывается в отчете."""
+        import json
+
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        output_path = os.path.join(temp_output_dir, "report.json")
+
+        class Args:
+            path = sample_log_file
+            output = output_path
+            format = "json"
+            date_from = None
+            date_to = None
+            percentile_mode = "sketch"
+            percentile_error = 0.05
+
+        result = LogAnalyzerFactory.create(Args()).analyze(Args())
+
+        assert result == 0
+        with open(output_path) as f:
+            report = json.load(f)
+        assert report["responseSizeInBytes"]["p95Estimate"] == {
+            "method": "sketch",
+            "relativeError": 0.05,
+        }
+
+    def test_workflow_with_time_series(
+        self, sample_log_file: str, temp_output_dir: str
+    ) -> None:
+        """Временной ряд выводится в JSON и выгружается в CSV."""
+        import json
+
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        output_path = os.path.join(temp_output_dir, "report.json")
+        csv_path = os.path.join(temp_output_dir, "series.csv")
+
+        class Args:
+            path = sample_log_file
+            output = output_path
+            format = "json"
+            date_from = None
+            date_to = None
+            time_series = "minute"
+            time_series_csv = csv_path
+
+        result = LogAnalyzerFactory.create(Args()).analyze(Args())
+
+        assert result == 0
+        with open(output_path) as f:
+            report = json.load(f)
+        assert report["timeSeries"]["granularity"] == "minute"
+        assert report["timeSeries"]["bucketSeconds"] == 60
+        assert report["timeSeries"]["buckets"] == [
+            {
+                "start": "2015-05-17T08:05:00",
+                "totalRequestsCount": 3,
+                "totalBytes": 512,
+                "statusClasses": {"1xx": 0, "2xx": 1, "3xx": 1, "4xx": 1, "5xx": 0},
+            }
+        ]
+        with open(csv_path) as f:
+            assert f.read() == (
+                "start,totalRequestsCount,totalBytes,1xx,2xx,3xx,4xx,5xx\n"
+                "2015-05-17T08:05:00,3,512,0,1,1,1,0\n"
+            )
+
+    def test_workflow_with_distinct_counts(
+        self, sample_log_file: str, temp_output_dir: str
+    ) -> None:
+        """Оценки уникальных значений выводятся с ошибкой в JSON и Markdown."""
+        import json
+
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        output_path = os.path.join(temp_output_dir, "report.json")
+
+        class Args:
+            path = sample_log_file
+            output = output_path
+            format = "json"
+            date_from = None
+            date_to = None
+            distinct = True
+            distinct_precision = 12
+
+        result = LogAnalyzerFactory.create(Args()).analyze(Args())
+
+        assert result == 0
+        with open(output_path) as f:
+            report = json.load(f)
+        assert report["uniqueCounts"] == {
+            "clients": {"estimate": 3, "relativeStandardError": 0.0163},
+            "resources": {"estimate": 3, "relativeStandardError": 0.0163},
+            "userAgents": {"estimate": 2, "relativeStandardError": 0.0163},
+        }
+
+        Args.output = os.path.join(temp_output_dir, "report.md")
+        Args.format = "markdown"
+        assert LogAnalyzerFactory.create(Args()).analyze(Args()) == 0
+        with open(Args.output) as f:
+            markdown = f.read()
+        assert "#### Уникальные значения" in markdown
+        assert "| User agent |" in markdown
+        assert "±1.63%" in markdown
+
+    def test_workflow_distinct_precision_enables_distinct(
+        self, sample_log_file: str, temp_output_dir: str
+    ) -> None:
+        """--distinct-precision без --distinct включает уникальные значения."""
+        import json
+
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        output_path = os.path.join(temp_output_dir, "report.json")
+
+        class Args:
+            path = sample_log_file
+            output = output_path
+            format = "json"
+            date_from = None
+            date_to = None
+            distinct_precision = 12
+
+        assert LogAnalyzerFactory.create(Args()).analyze(Args()) == 0
+        with open(output_path) as f:
+            report = json.load(f)
+        assert report["uniqueCounts"]["clients"] == {
+            "estimate": 3,
+            "relativeStandardError": 0.0163,
+        }
+
+    def test_workflow_with_selected_metrics(
+        self, sample_log_file: str, temp_output_dir: str
+    ) -> None:
+        """--metrics оставляет в отчете только выбранные разделы."""
+        import json
+
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        output_path = os.path.join(temp_output_dir, "report.json")
+
+        class Args:
+            path = sample_log_file
+            output = output_path
+            format = "json"
+            date_from = None
+            date_to = None
+            metrics = "codes,protocols"
+            time_series = "hour"
+
+        result = LogAnalyzerFactory.create(Args()).analyze(Args())
+
+        assert result == 0
+        with open(output_path) as f:
+            report = json.load(f)
+        assert set(report) == {
+            "totalRequestsCount",
+            "responseCodes",
+            "uniqueProtocols",
+            "timeSeries",
+            "files",
+        }
+        assert report["uniqueProtocols"] == ["HTTP/1.1", "HTTP/2.0"]
+
+    def test_workflow_with_group_by(
+        self, sample_log_file: str, temp_output_dir: str
+    ) -> None:
+        """--group-by добавляет таблицу групп с агрегатами в отчет."""
+        import json
+
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        output_path = os.path.join(temp_output_dir, "report.json")
+
+        class Args:
+            path = sample_log_file
+            output = output_path
+            format = "json"
+            date_from = None
+            date_to = None
+            group_by = "method,status_class"
+            aggregate = "count,sum:body_bytes_sent"
+
+        result = LogAnalyzerFactory.create(Args()).analyze(Args())
+
+        assert result == 0
+        with open(output_path) as f:
+            report = json.load(f)
+        assert report["totalRequestsCount"] == 3
+        assert report["groupBy"]["dimensions"] == ["method", "status_class"]
+        assert sorted(
+            (
+                row["key"]["method"],
+                row["key"]["status_class"],
+                row["count"],
+                row["sum(body_bytes_sent)"],
+            )
+            for row in report["groupBy"]["groups"]
+        ) == [("GET", "2xx", 1, 512), ("GET", "3xx", 1, 0), ("POST", "4xx", 1, 0)]
+
+    def test_workflow_with_group_by_time(
+        self, sample_log_file: str, temp_output_dir: str
+    ) -> None:
+        """Группировка по time_local выводит время в JSON в ISO-формате."""
+        import json
+
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        output_path = os.path.join(temp_output_dir, "report.json")
+
+        class Args:
+            path = sample_log_file
+            output = output_path
+            format = "json"
+            date_from = None
+            date_to = None
+            group_by = "time_local"
+
+        result = LogAnalyzerFactory.create(Args()).analyze(Args())
+
+        assert result == 0
+        with open(output_path) as f:
+            report = json.load(f)
+        assert sorted(
+            row["key"]["time_local"] for row in report["groupBy"]["groups"]
+        ) == [
+            "2015-05-17T08:05:32+00:00",
+            "2015-05-17T08:05:33+00:00",
+            "2015-05-17T08:05:34+00:00",
+        ]
+
+    def test_workflow_with_top_clients(
+        self, sample_log_file: str, temp_output_dir: str
+    ) -> None:
+        """--client-prefix добавляет топ подсетей по запросам и байтам."""
+        import json
+
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        output_path = os.path.join(temp_output_dir, "report.json")
+
+        class Args:
+            path = sample_log_file
+            output = output_path
+            format = "json"
+            date_from = None
+            date_to = None
+            client_prefix = True
+
+        result = LogAnalyzerFactory.create(Args()).analyze(Args())
+
+        assert result == 0
+        with open(output_path) as f:
+            report = json.load(f)
+        top_clients = report["topClients"]
+        assert top_clients["prefix"] == "/24,/48"
+        assert top_clients["invalidAddresses"] == 0
+        assert len(top_clients["byRequests"]) == 3
+        assert top_clients["byBytes"][0] == {
+            "client": "80.91.33.0/24",
+            "totalBytes": 512,
+            "error": 0,
+        }
+
+    def test_workflow_with_ip_db(
+        self, sample_log_file: str, temp_output_dir: str
+    ) -> None:
+        """--ip-db добавляет измерения asn и country для группировки."""
+        import json
+
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        output_path = os.path.join(temp_output_dir, "report.json")
+        ip_db_path = os.path.join(temp_output_dir, "networks.csv")
+        with open(ip_db_path, "w") as f:
+            f.write("80.91.0.0/16,AS8821,RU\n93.180.64.0/19,AS12345,ES\n")
+
+        class Args:
+            path = sample_log_file
+            output = output_path
+            format = "json"
+            date_from = None
+            date_to = None
+            group_by = "country,asn"
+            ip_db = ip_db_path
+
+        result = LogAnalyzerFactory.create(Args()).analyze(Args())
+
+        assert result == 0
+        with open(output_path) as f:
+            report = json.load(f)
+        assert sorted(
+            (row["key"]["country"], row["key"]["asn"], row["count"])
+            for row in report["groupBy"]["groups"]
+        ) == [
+            ("(unknown)", "(unknown)", 1),
+            ("ES", "AS12345", 1),
+            ("RU", "AS8821", 1),
+        ]
+
+    def test_workflow_with_timings(self, temp_output_dir: str) -> None:
+        """--nginx-log-format и --timings: перцентили времени ответа в отчете."""
+        import json
+
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        log_path = os.path.join(temp_output_dir, "access.log")
+        with open(log_path, "w") as f:
+            f.writelines(
+                f"10.0.0.{index % 5} [17/May/2015:08:05:32 +0000] "
+                f'"GET /api/{index % 2} HTTP/1.1" 200 {index} '
+                f"rt={(index + 1) / 1000:.3f} urt={index / 1000:.3f}\n"
+                for index in range(100)
+            )
+
+        output_path = os.path.join(temp_output_dir, "report.json")
+
+        class Args:
+            path = log_path
+            output = output_path
+            format = "json"
+            date_from = None
+            date_to = None
+            nginx_log_format = (
+                '$remote_addr [$time_local] "$request" $status $body_bytes_sent '
+                "rt=$request_time urt=$upstream_response_time"
+            )
+            timings = True
+
+        result = LogAnalyzerFactory.create(Args()).analyze(Args())
+
+        assert result == 0
+        with open(output_path) as f:
+            report = json.load(f)
+        assert report["totalRequestsCount"] == 100
+        timings = report["timings"]
+        assert timings["requestTime"]["count"] == 100
+        assert timings["requestTime"]["p50"] == pytest.approx(50.5, rel=0.01)
+        assert timings["requestTime"]["max"] == 100
+        assert timings["upstreamResponseTime"]["mean"] == pytest.approx(49.5)
+        assert [item["resource"] for item in timings["resources"]] == [
+            "/api/0",
+            "/api/1",
+        ]
+
+    def test_workflow_with_timings_and_invalid_time(self, temp_output_dir: str) -> None:
+        """Строка combined_timing с некорректной датой не ломает --timings."""
+        import json
+
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        log_path = os.path.join(temp_output_dir, "timed.log")
+        with open(log_path, "w") as f:
+            f.writelines(
+                f'10.0.0.1 - - [{date}:08:05:32 +0000] "GET /a HTTP/1.1" 200 10 '
+                f'"-" "Mozilla/5.0" {request_time} {request_time}\n'
+                for date, request_time in (
+                    ("17/May/2015", "0.100"),
+                    ("17/Foo/2015", "9.000"),
+                    ("17/May/2015", "0.300"),
+                )
+            )
+        output_path = os.path.join(temp_output_dir, "report.json")
+
+        class Args:
+            path = log_path
+            output = output_path
+            format = "json"
+            date_from = None
+            date_to = None
+            timings = True
+
+        result = LogAnalyzerFactory.create(Args()).analyze(Args())
+
+        assert result == 0
+        with open(output_path) as f:
+            report = json.load(f)
+        assert report["totalRequestsCount"] == 2
+        assert report["timings"]["requestTime"]["count"] == 2
+        assert report["timings"]["requestTime"]["max"] == pytest.approx(300, rel=0.01)
+
+    def test_workflow_with_sessions(
+        self, sample_log_file: str, temp_output_dir: str
+    ) -> None:
+        """--session-timeout добавляет раздел сессий клиентов."""
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        output_path = os.path.join(temp_output_dir, "report.md")
+
+        class Args:
+            path = sample_log_file
+            output = output_path
+            format = "markdown"
+            date_from = None
+            date_to = None
+            session_timeout = 0.5
+
+        result = LogAnalyzerFactory.create(Args()).analyze(Args())
+
+        assert result == 0
+        with open(output_path) as f:
+            report = f.read()
+        assert "#### Сессии" in report
+        assert "Таймаут неактивности: 0.5 мин, всего сессий: 3" in report
+        assert "| 2015-05-17 |" in report
+
+    def test_workflow_with_anomalies(self, temp_output_dir: str) -> None:
+        """--anomalies добавляет интервалы аномального числа запросов."""
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        log_path = os.path.join(temp_output_dir, "access.log")
+        with open(log_path, "w") as f:
+            f.writelines(
+                f"10.0.0.1 - - [17/May/2015:08:{minute:02d}:00 +0000] "
+                f'"GET /page HTTP/1.1" 200 10 "-" "Mozilla/5.0"\n'
+                for minute in range(40)
+                for _ in range(60 if minute == 30 else 10 + minute % 2)
+            )
+        output_path = os.path.join(temp_output_dir, "report.md")
+
+        class Args:
+            path = log_path
+            output = output_path
+            format = "markdown"
+            date_from = None
+            date_to = None
+            anomalies = True
+            anomaly_window = 10
+
+        result = LogAnalyzerFactory.create(Args()).analyze(Args())
+
+        assert result == 0
+        with open(output_path) as f:
+            report = f.read()
+        assert "#### Аномалии" in report
+        assert "Окно базы: 10 мин, порог z-оценки: 3" in report
+        rows = [line for line in report.splitlines() if "| Запросы в минуту |" in line]
+        assert len(rows) == 1
+        assert "| рост " in rows[0]
+        assert "| 2015-05-17T08:30:00 |" in rows[0]
+
+    def test_workflow_with_windowed_resources(self, temp_output_dir: str) -> None:
+        """--resource-window показывает ресурс, популярный только в одном окне."""
+        import json
+
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        log_path = os.path.join(temp_output_dir, "access.log")
+        with open(log_path, "w") as f:
+            f.writelines(
+                f"10.0.0.1 - - [17/May/2015:{hour:02d}:{minute:02d}:00 +0000] "
+                f'"GET {resource} HTTP/1.1" 200 10 "-" "Mozilla/5.0"\n'
+                for hour in (8, 9)
+                for minute in range(0, 60, 5)
+                for resource in (
+                    ("/index", "/spike") if hour == 9 and minute < 10 else ("/index",)
+                )
+            )
+        output_path = os.path.join(temp_output_dir, "report.json")
+
+        class Args:
+            path = log_path
+            output = output_path
+            format = "json"
+            date_from = None
+            date_to = None
+            resource_window = 30
+
+        result = LogAnalyzerFactory.create(Args()).analyze(Args())
+
+        assert result == 0
+        with open(output_path) as f:
+            windowed = json.load(f)["windowedResources"]
+        assert windowed["windowMinutes"] == 30
+        assert windowed["lateRequests"] == 0
+        assert [window["start"] for window in windowed["windows"]] == [
+            "2015-05-17T08:00:00",
+            "2015-05-17T08:30:00",
+            "2015-05-17T09:00:00",
+            "2015-05-17T09:30:00",
+        ]
+        assert [item["resource"] for item in windowed["windows"][2]["resources"]] == [
+            "/index",
+            "/spike",
+        ]
+
+    def test_workflow_with_traffic_filter(
+        self, sample_log_file: str, temp_output_dir: str
+    ) -> None:
+        """--traffic human убирает ботов из всех разделов отчета."""
+        import json
+
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        output_path = os.path.join(temp_output_dir, "report.json")
+
+        class Args:
+            path = sample_log_file
+            output = output_path
+            format = "json"
+            date_from = None
+            date_to = None
+            traffic = "human"
+            group_by = "client_type"
+
+        result = LogAnalyzerFactory.create(Args()).analyze(Args())
+
+        assert result == 0
+        with open(output_path) as f:
+            report = json.load(f)
+        # Debian APT-HTTP - бот, остается один запрос Mozilla/5.0
+        assert report["totalRequestsCount"] == 1
+        assert report["resources"] == [
+            {"resource": "/api/users", "totalRequestsCount": 1}
+        ]
+        assert [group["key"] for group in report["groupBy"]["groups"]] == [
+            {"client_type": "human"}
+        ]
+
+    def test_workflow_with_resource_bytes(
+        self, sample_log_file: str, temp_output_dir: str
+    ) -> None:
+        """--resource-bytes добавляет топ ресурсов по объему ответов."""
+        from src.infrastructure.factories.log_analyzer_factory import LogAnalyzerFactory
+
+        output_path = os.path.join(temp_output_dir, "report.md")
+
+        class Args:
+            path = sample_log_file
+            output = output_path
+            format = "markdown"
+            date_from = None
+            date_to = None
+            resource_bytes = True
+
+        result = LogAnalyzerFactory.create(Args()).analyze(Args())
+
+        assert result == 0
+        with open(output_path) as f:
+            report = f.read()
+        assert "#### Трафик по ресурсам" in report
+        assert "Всего отправлено байт: 512" in report
+        assert "| `/downloads/product_2` |" in report
@@ -136,3 +136,29 @@ class TestOutputFormatters:
         result = formatter.format(test_data)
         assert formatter.get_file_extension() == extension
         assert "42" in result or "totalRequestsCount" in result
+
+    @pytest.mark.parametrize(
+        ("estimate", "expected"),
+        [
+            (None, "точный"),
+            ({"method": "sketch", "relativeError": 0.01}, "скетч, ±1.00% значения"),
+            (
+                {"method": "sample", "sampleSize": 10000, "rankError": 0.0136},
+                "выборка 10_000, ±1.36% ранга",
+            ),
+        ],
+    )
+    def test_percentile_method_in_reports(self, estimate, expected) -> None:
+        """Метод расчета 95p и граница ошибки попадают в текстовые отчеты."""
+        from src.core.implementations.formatters.adoc_formatter import AdocFormatter
+        from src.core.implementations.formatters.markdown_formatter import (
+            MarkdownFormatter,
+        )
+
+        size_info = {"average": 100, "max": 500, "p95": 450}
+        if estimate:
+            size_info["p95Estimate"] = estimate
+        test_data = {"totalRequestsCount": 42, "responseSizeInBytes": size_info}
+
+        for formatter in (MarkdownFormatter(), AdocFormatter()):
+            assert expected in formatter.format(test_data)
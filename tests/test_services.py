@@ -1,5 +1,7 @@
 from datetime import datetime
 
+import pytest
+
 
 class TestServices:
     """Дополнительные тесты сервисов."""
@@ -36,12 +38,118 @@ class TestServices:
         assert result["max"] == 500
         assert result["p95"] == 480  # Примерное значение
 
+        # Точный перцентиль через np.partition совпадает с np.percentile
+        import numpy as np
+
+        rng = np.random.default_rng(0)
+        for length in (1, 2, 7, 20, 1001):
+            values = rng.integers(0, 10**6, length)
+            for percentile in (0, 50, 95, 100):
+                assert SizeStatisticsCalculator.partition_percentile(
+                    values, percentile
+                ) == pytest.approx(np.percentile(values, percentile))
+
+        from array import array
+
+        assert calculator.calculate(array("q", sizes)) == result
+
         # Тест с пустыми данными
         empty_result = calculator.calculate([])
         assert empty_result["average"] == 0
         assert empty_result["max"] == 0
         assert empty_result["p95"] == 0
 
+    def test_percentile_modes(self) -> None:
+        """Тест методов перцентиля и границ их ошибки."""
+        import numpy as np
+
+        from src.domain.calculators.quantile_sketch import QuantileSketch
+        from src.domain.calculators.size_statistics_calculator import (
+            SizeStatisticsCalculator,
+        )
+
+        sizes = np.random.default_rng(3).lognormal(8, 2, 50_000).astype(np.int64)
+        sizes[:1000] = 0
+        exact_p95 = float(np.percentile(sizes, 95))
+
+        exact = SizeStatisticsCalculator().calculate(sizes)
+        assert exact["p95"] == round(exact_p95, 2)
+        assert "p95Estimate" not in exact
+
+        sketch_calculator = SizeStatisticsCalculator("sketch", relative_error=0.02)
+        accumulator = sketch_calculator.create_accumulator()
+        other = sketch_calculator.create_accumulator()
+        accumulator.extend(sizes[:20_000].tolist())
+        other.extend(sizes[20_000:].tolist())
+        sketch = sketch_calculator.calculate(accumulator.merge(other))
+        assert sketch["p95Estimate"] == {"method": "sketch", "relativeError": 0.02}
+        assert sketch["max"] == exact["max"]
+        assert sketch["average"] == exact["average"]
+        for percentile in (1, 50, 95, 99.9):
+            true_value = np.percentile(sizes, percentile, method="lower")
+            estimate = accumulator.sketch.quantile(percentile)
+            assert abs(estimate - true_value) <= 0.02 * true_value + 1e-9
+
+        sample = SizeStatisticsCalculator("sample", sample_size=5000).calculate(sizes)
+        rank_error = sample["p95Estimate"]["rankError"]
+        assert sample["p95Estimate"]["sampleSize"] == 5000
+        assert np.percentile(sizes, 95 - 100 * rank_error) <= sample["p95"]
+        assert sample["p95"] <= np.percentile(sizes, 95 + 100 * rank_error)
+        assert SizeStatisticsCalculator("sample").calculate([1, 2, 3]) == (
+            SizeStatisticsCalculator().calculate([1, 2, 3])
+        )
+
+        with pytest.raises(ValueError, match="метод"):
+            SizeStatisticsCalculator("median")
+        with pytest.raises(ValueError, match="ошибка"):
+            QuantileSketch(0)
+
+    def test_reservoir_sampler(self) -> None:
+        """Тест воспроизводимой потоковой выборки с пропусками и слиянием."""
+        import random
+
+        from src.domain.calculators.reservoir_sampler import ReservoirSampler
+
+        class CountingRandom(random.Random):
+            calls = 0
+
+            def random(self) -> float:
+                self.calls += 1
+                return super().random()
+
+        data = list(range(200_000))
+        rng = CountingRandom(7)
+        whole = ReservoirSampler(100, rng=rng)
+        whole.extend(data)
+        chunked = ReservoirSampler(100, rng=CountingRandom(7))
+        for start in range(0, len(data), 999):
+            chunked.extend(data[start : start + 999])
+
+        assert whole.sample == chunked.sample
+        assert len(set(whole.sample)) == 100
+        assert whole.seen == len(data)
+        assert rng.calls < 5000
+
+        seeded = ReservoirSampler(100, seed=7)
+        seeded.extend(data)
+        again = ReservoirSampler(100, seed=7)
+        again.extend(data)
+        assert seeded.sample == again.sample
+
+        left = ReservoirSampler(100, seed=1)
+        left.extend(range(1000))
+        right = ReservoirSampler(100, seed=2)
+        right.extend(range(1000, 100_000))
+        left.merge(right)
+        assert left.seen == 100_000
+        assert len(left.sample) == 100
+        assert sum(value < 1000 for value in left.sample) < 10
+
+        small = ReservoirSampler(100)
+        small.extend([1, 2])
+        small.merge(ReservoirSampler(100))
+        assert sorted(small.sample) == [1, 2]
+
     def test_data_accumulator(self) -> None:
         """Тест аккумулятора данных."""
         from src.domain.accumulators.data_accumulator import DataAccumulator
@@ -85,12 +193,1248 @@ class TestServices:
 
         accumulated_data = accumulator.accumulate(entries)
 
-        assert accumulated_data["response_sizes"] == [100, 200, 0]
+        assert accumulated_data["response_sizes"].values.tolist() == [100, 200, 0]
         assert accumulated_data["resource_frequency"]["/test1"] == 2
         assert accumulated_data["resource_frequency"]["/test2"] == 1
         assert accumulated_data["status_frequency"][200] == 2
         assert accumulated_data["status_frequency"][404] == 1
-        assert accumulated_data["date_distribution"]["2025-01-01"] == 2
-        assert accumulated_data["date_distribution"]["2025-01-02"] == 1
+        date_distribution = accumulated_data["date_distribution"]
+        assert date_distribution[datetime(2025, 1, 1).toordinal()] == 2
+        assert date_distribution[datetime(2025, 1, 2).toordinal()] == 1
         assert "HTTP/1.1" in accumulated_data["unique_protocols"]
         assert "HTTP/2.0" in accumulated_data["unique_protocols"]
+
+    def test_time_series_accumulator(self) -> None:
+        """Корзины растут в обе стороны, включают пустые и объединяются."""
+        from src.domain.accumulators.time_series_accumulator import (
+            TimeSeriesAccumulator,
+        )
+        from src.models.log_batch import LogBatch
+        from src.models.log_entry import LogEntry
+
+        def batch(*rows: tuple[datetime, int, int]) -> LogBatch:
+            return LogBatch.from_entries(
+                [
+                    LogEntry(
+                        "1.1.1.1", None, time, "GET / HTTP/1.1", status, size, "-", "A"
+                    )
+                    for time, status, size in rows
+                ]
+            )
+
+        left = TimeSeriesAccumulator("5min")
+        left.add_batch(batch((datetime(2025, 1, 1, 10, 12, 59), 200, 100)))
+        left.add_batch(
+            batch(
+                (datetime(2025, 1, 1, 10, 1), 404, 10),
+                (datetime(2025, 1, 1, 10, 4, 30), 500, 5),
+            )
+        )
+        right = TimeSeriesAccumulator("5min")
+        right.add_batch(batch((datetime(2025, 1, 1, 10, 14), 302, 1)))
+
+        buckets = left.merge(right).buckets()
+
+        assert [bucket["start"] for bucket in buckets] == [
+            "2025-01-01T10:00:00",
+            "2025-01-01T10:05:00",
+            "2025-01-01T10:10:00",
+        ]
+        assert [bucket["totalRequestsCount"] for bucket in buckets] == [2, 0, 2]
+        assert [bucket["totalBytes"] for bucket in buckets] == [15, 0, 101]
+        assert buckets[0]["statusClasses"] == {
+            "1xx": 0,
+            "2xx": 0,
+            "3xx": 0,
+            "4xx": 1,
+            "5xx": 1,
+        }
+        assert buckets[2]["statusClasses"]["3xx"] == 1
+
+        with pytest.raises(ValueError, match="гранулярностью"):
+            left.merge(TimeSeriesAccumulator("hour"))
+        with pytest.raises(ValueError, match="гранулярность"):
+            TimeSeriesAccumulator("day")
+
+    def test_hyperloglog(self) -> None:
+        """Оценка в пределах ошибки, слияние и сериализация счетчиков."""
+        from src.domain.accumulators.distinct_accumulator import DistinctAccumulator
+        from src.domain.calculators.hyperloglog import HyperLogLog
+
+        left, right = HyperLogLog(12), HyperLogLog(12)
+        values = [f"10.0.{index // 256}.{index % 256}" for index in range(30000)]
+        for start in range(0, 20000, 4096):
+            left.extend(values[start : min(start + 4096, 20000)])
+        right.extend(values[10000:])
+
+        assert abs(left.estimate() - 20000) < 4 * left.standard_error * 20000
+        merged = HyperLogLog.from_bytes(left.to_bytes()).merge(right)
+        assert abs(merged.estimate() - 30000) < 4 * merged.standard_error * 30000
+        assert HyperLogLog(14).standard_error == pytest.approx(0.0081, abs=1e-4)
+
+        small = HyperLogLog()
+        small.extend(["a", "b", "a", "c"])
+        assert small.estimate() == 3
+        assert HyperLogLog().estimate() == 0
+
+        with pytest.raises(ValueError, match="точностью"):
+            left.merge(HyperLogLog(14))
+        with pytest.raises(ValueError, match="от 4 до 18"):
+            HyperLogLog(20)
+        with pytest.raises(ValueError, match="не соответствует"):
+            HyperLogLog.from_bytes(left.to_bytes()[:-1])
+
+        distinct = DistinctAccumulator(10)
+        distinct.counters["clients"].extend(["1.1.1.1", "2.2.2.2"])
+        restored = DistinctAccumulator.from_bytes(distinct.to_bytes())
+        assert restored.summary()["clients"] == {
+            "estimate": 2,
+            "relativeStandardError": 0.0325,
+        }
+        assert restored.summary()["userAgents"]["estimate"] == 0
+
+    def test_metric_registry(self, monkeypatch) -> None:
+        """Метрики выбираются по имени, подключаются и объединяются."""
+        from collections import Counter
+
+        from src.core.abstractions.metrics import IMetric, MetricOptions
+        from src.domain.accumulators.data_accumulator import DataAccumulator
+        from src.domain.composers.statistics_composer import StatisticsComposer
+        from src.domain.services.metric_registry import MetricRegistry
+        from src.domain.services.request_parser_service import RequestParserService
+        from src.models.log_entry import LogEntry
+
+        assert MetricRegistry.parse(None) is None
+        assert MetricRegistry.parse(" codes, sizes,codes") == ("codes", "sizes")
+        with pytest.raises(ValueError, match="Неизвестные метрики: bogus"):
+            MetricRegistry.parse("codes,bogus")
+        with pytest.raises(ValueError, match="пуст"):
+            MetricRegistry.parse(" , ")
+
+        options = MetricOptions(time_series_granularity="hour", distinct_precision=10)
+        assert MetricRegistry.select(("codes",), options) == (
+            "codes",
+            "time-series",
+            "distinct",
+        )
+        assert MetricRegistry.fields(("codes", "resources"), options) == {
+            "status",
+            "request",
+        }
+
+        class AgentMetric(IMetric):
+            name = "agents"
+            fields = ("http_user_agent",)
+            state_key = "agent_frequency"
+
+            def __init__(self) -> None:
+                self.agents = Counter()
+
+            def add_batch(self, view) -> None:
+                self.agents.update(view.batch.http_user_agent)
+
+            def merge(self, other: "AgentMetric") -> "AgentMetric":
+                self.agents.update(other.agents)
+                return self
+
+            @property
+            def state(self) -> Counter:
+                return self.agents
+
+            def compose(self, total_requests: int) -> dict:
+                return {"topAgent": self.agents.most_common(1)[0][0]}
+
+        monkeypatch.setattr(MetricRegistry, "_metrics", dict(MetricRegistry._metrics))
+        MetricRegistry.register(AgentMetric)
+
+        accumulator = DataAccumulator(
+            RequestParserService(), metrics=("codes", "agents")
+        )
+        entries = [
+            LogEntry(
+                "1.1.1.1",
+                None,
+                datetime(2025, 1, 1),
+                "GET / HTTP/1.1",
+                200,
+                1,
+                "-",
+                agent,
+            )
+            for agent in ("curl", "curl", "wget")
+        ]
+        left = accumulator.accumulate(entries[:2])
+        right = accumulator.accumulate(entries[2:])
+        for metric, other in zip(left["metrics"], right["metrics"], strict=True):
+            metric.merge(other)
+
+        assert set(left) == {
+            "total_requests",
+            "metrics",
+            "status_frequency",
+            "agent_frequency",
+        }
+        assert StatisticsComposer().compose(left, 3) == {
+            "totalRequestsCount": 3,
+            "responseCodes": [{"code": 200, "totalResponsesCount": 3}],
+            "topAgent": "curl",
+        }
+
+    def test_group_by_accumulator(self) -> None:
+        """Хеш-агрегация по измерениям с лимитом групп и слиянием."""
+        from src.domain.accumulators.batch_view import BatchView
+        from src.domain.accumulators.group_by_accumulator import GroupByAccumulator
+        from src.domain.services.request_parser_service import RequestParserService
+        from src.models.log_batch import LogBatch
+        from src.models.log_entry import LogEntry
+
+        def view(*rows: tuple[str, int, int]) -> BatchView:
+            entries = [
+                LogEntry(
+                    "1.1.1.1",
+                    None,
+                    datetime(2025, 1, 1, 10),
+                    f"GET {path}?q=1 HTTP/1.1",
+                    status,
+                    size,
+                    "-",
+                    "Agent",
+                )
+                for path, status, size in rows
+            ]
+            return BatchView(LogBatch.from_entries(entries), RequestParserService())
+
+        dimensions = GroupByAccumulator.parse_dimensions("resource, status_class")
+        aggregates = GroupByAccumulator.parse_aggregates(
+            "count,sum:body_bytes_sent,max:body_bytes_sent,p50:body_bytes_sent"
+        )
+        left = GroupByAccumulator(dimensions, aggregates, max_groups=2)
+        left.add_batch(view(("/a", 200, 10), ("/a", 201, 30), ("/b", 404, 5)))
+        right = GroupByAccumulator(dimensions, aggregates, max_groups=2)
+        right.add_batch(view(("/c", 500, 7), ("/a", 200, 20), ("/d", 200, 1)))
+
+        rows = left.merge(right).rows()
+
+        assert [row["key"] for row in rows] == [
+            {"resource": "/a?q=1", "status_class": "2xx"},
+            {"resource": "/b?q=1", "status_class": "4xx"},
+            {"resource": "(other)", "status_class": "(other)"},
+        ]
+        assert rows[0]["count"] == 3
+        assert rows[0]["sum(body_bytes_sent)"] == 60
+        assert rows[0]["max(body_bytes_sent)"] == 30
+        assert rows[0]["p50(body_bytes_sent)"] == pytest.approx(20, rel=0.01)
+        assert rows[2]["count"] == 2
+        assert rows[2]["sum(body_bytes_sent)"] == 8
+
+        with pytest.raises(ValueError, match="Неизвестные измерения: client"):
+            GroupByAccumulator.parse_dimensions("client")
+        with pytest.raises(ValueError, match="числовой"):
+            GroupByAccumulator.parse_aggregates("sum:request")
+        with pytest.raises(ValueError, match="кроме count"):
+            GroupByAccumulator.parse_aggregates("max")
+        with pytest.raises(ValueError, match="Неизвестная агрегатная функция"):
+            GroupByAccumulator.parse_aggregates("avg:status")
+
+    def test_uri_normalizer(self) -> None:
+        """Пути сворачиваются в шаблоны, ресурсы пакета - через кэш."""
+        from src.domain.accumulators.batch_view import BatchView
+        from src.domain.services.request_parser_service import RequestParserService
+        from src.domain.services.uri_normalizer import UriNormalizer
+        from src.models.log_batch import LogBatch
+        from src.models.log_entry import LogEntry
+
+        normalizer = UriNormalizer(UriNormalizer.parse_rules(["version=v\\d+"]))
+
+        assert normalizer.normalize("/users/123?ts=1") == "/users/{id}"
+        assert normalizer.normalize("/users/12abc") == "/users/12abc"
+        assert (
+            normalizer.normalize(
+                "/api/v2/items/550e8400-e29b-41d4-a716-446655440000/edit"
+            )
+            == "/api/{version}/items/{uuid}/edit"
+        )
+        assert normalizer.normalize("/my%20files/0123456789abcdef#top") == (
+            "/my files/{hash}"
+        )
+        assert normalizer.normalize("?only=query") == "/"
+
+        with pytest.raises(ValueError, match="имя=регулярное_выражение"):
+            UriNormalizer.parse_rules(["no-separator"])
+        with pytest.raises(ValueError, match="Некорректное регулярное"):
+            UriNormalizer.parse_rules(["broken=("])
+        with pytest.raises(ValueError, match="Повторяющиеся"):
+            UriNormalizer.parse_rules(["id=x\\d+"])
+        with pytest.raises(ValueError, match="именованные группы"):
+            UriNormalizer.parse_rules(["foo=(?P<uuid>x)"])
+
+        batch = LogBatch.from_entries(
+            LogEntry(
+                "1.1.1.1",
+                None,
+                datetime(2025, 1, 1),
+                f"GET /users/{user} HTTP/1.1",
+                200,
+                1,
+                "-",
+                "Agent",
+            )
+            for user in (1, 2, 2)
+        )
+        view = BatchView(batch, RequestParserService(), normalizer)
+        assert view.resources == ["/users/{id}", "/users/{id}"]
+        assert view.column("resource") == ["/users/{id}"] * 3
+
+    def test_space_saving(self) -> None:
+        """Тяжелые ключи остаются в сводке, ошибка ограничена total / capacity."""
+        from src.domain.calculators.space_saving import SpaceSaving
+
+        left = SpaceSaving(capacity=3)
+        left.update({"heavy": 50, "a": 1, "b": 2})
+        left.update({"c": 3, "d": 1, "heavy": 10})
+        right = SpaceSaving(capacity=3)
+        right.update({"heavy": 5, "e": 4, "f": 4, "g": 1})
+
+        summary = left.merge(right)
+
+        assert len(summary) == 3
+        assert summary.total == 81
+        key, count, error = summary.top(1)[0]
+        assert key == "heavy"
+        assert count - error <= 65 <= count
+        assert all(error <= summary.total / 3 for _, _, error in summary.top(3))
+
+        with pytest.raises(ValueError, match="разного размера"):
+            summary.merge(SpaceSaving(capacity=5))
+
+        # Сжатая сводка: самые тяжелые ключи и минимум как граница отброшенных
+        shrunk = summary.shrink(1)
+        assert shrunk.top(1) == summary.top(1)
+        assert shrunk.total == summary.total
+        assert shrunk.floor == count
+
+    def test_top_clients_accumulator(self) -> None:
+        """Адреса упаковываются в целые, подсети сворачиваются по префиксу."""
+        from src.domain.accumulators.top_clients_accumulator import (
+            TopClientsAccumulator,
+        )
+        from src.domain.services.ip_address_packer import IpAddressPacker
+        from src.models.log_batch import LogBatch
+        from src.models.log_entry import LogEntry
+
+        batch = LogBatch.from_entries(
+            LogEntry(
+                address,
+                None,
+                datetime(2025, 1, 1),
+                "GET / HTTP/1.1",
+                200,
+                size,
+                "-",
+                "A",
+            )
+            for address, size in (
+                ("10.0.0.1", 100),
+                ("10.0.0.2", 300),
+                ("10.0.0.1", 100),
+                ("2001:db8:1:2::1", 1000),
+                ("2001:db8:1:3::1", 5),
+                ("unknown", 7),
+            )
+        )
+
+        clients = TopClientsAccumulator(capacity=10)
+        clients.add_batch(batch)
+        top = clients.top(2)
+        assert top["byRequests"][0] == {
+            "client": "10.0.0.1",
+            "totalRequestsCount": 2,
+            "error": 0,
+        }
+        assert top["byBytes"][0]["client"] == "2001:db8:1:2::1"
+        assert clients.invalid == 1
+
+        subnets = TopClientsAccumulator(capacity=10, rollup=True)
+        subnets.add_batch(batch)
+        assert subnets.merge(TopClientsAccumulator(capacity=10, rollup=True)).top(2)[
+            "byRequests"
+        ] == [
+            {"client": "10.0.0.0/24", "totalRequestsCount": 3, "error": 0},
+            {"client": "2001:db8:1::/48", "totalRequestsCount": 2, "error": 0},
+        ]
+        assert IpAddressPacker.pack("::ffff:10.0.0.1") == (
+            IpAddressPacker.pack("10.0.0.1")
+        )
+        assert IpAddressPacker.pack("unknown") is None
+        with pytest.raises(ValueError, match="подсетей"):
+            clients.merge(subnets)
+
+    def test_resource_bytes_accumulator(self) -> None:
+        """Топ ресурсов по байтам: состояния только у ключей сводки."""
+        from src.domain.accumulators.batch_view import BatchView
+        from src.domain.accumulators.resource_bytes_accumulator import (
+            ResourceBytesAccumulator,
+        )
+        from src.domain.services.request_parser_service import RequestParserService
+        from src.models.log_batch import LogBatch
+        from src.models.log_entry import LogEntry
+
+        def view(*rows: tuple[str, int]) -> BatchView:
+            return BatchView(
+                LogBatch.from_entries(
+                    LogEntry(
+                        "1.1.1.1",
+                        None,
+                        datetime(2025, 1, 1),
+                        f"GET {path} HTTP/1.1",
+                        200,
+                        size,
+                        "-",
+                        "A",
+                    )
+                    for path, size in rows
+                ),
+                RequestParserService(),
+            )
+
+        left = ResourceBytesAccumulator(capacity=2)
+        left.add_batch(view(("/video", 1000), ("/video", 3000), ("/a", 10)))
+        left.add_batch(view(("/b", 20), ("/video", 2000), ("/c", 1)))
+        right = ResourceBytesAccumulator(capacity=2)
+        right.add_batch(view(("/video", 4000), ("/d", 5)))
+
+        top = left.merge(right).top(10)
+
+        assert len(left.stats) <= 2
+        assert left.bytes.total == 10036
+        assert top[0] == {
+            "resource": "/video",
+            "totalBytes": 10000,
+            "error": 0,
+            "totalRequestsCount": 4,
+            "averageBytes": 2500.0,
+            "p95Bytes": pytest.approx(3000, rel=0.01),
+        }
+        assert top[1]["error"] > 0  # ключ вытеснял другие, оценка завышена
+
+    def test_hdr_histogram(self) -> None:
+        """Гистограмма HDR: относительная ошибка, слияние и верхняя граница."""
+        import numpy as np
+
+        from src.domain.calculators.hdr_histogram import HdrHistogram
+
+        rng = np.random.default_rng(7)
+        values = rng.lognormal(10, 1.5, 100_000).astype(np.int64)
+        left, right = HdrHistogram(), HdrHistogram()
+        left.extend(values[:60_000])
+        right.extend(values[60_000:])
+        left.merge(right)
+
+        ordered = np.sort(values)
+        for percentile in (50, 90, 99, 99.9):
+            expected = ordered[int((len(values) - 1) * percentile / 100)]
+            assert left.quantile(percentile) == pytest.approx(expected, rel=0.004)
+        assert left.count == len(values)
+        assert left.mean == pytest.approx(values.mean())
+        assert (left.min, left.max) == (values.min(), values.max())
+
+        small = HdrHistogram(highest_value=1000)
+        small.extend([0, 5, 10**9])
+        assert small.quantile(0) == 0
+        assert small.quantile(50) == 5
+        assert len(small.counts) == small.max_index + 1
+        assert small.max == 10**9
+        with pytest.raises(ValueError, match="верхней границей"):
+            small.merge(HdrHistogram())
+
+    def test_timing_accumulator(self) -> None:
+        """Время ответа: общие перцентили и гистограммы популярных ресурсов."""
+        from src.domain.accumulators.batch_view import BatchView
+        from src.domain.accumulators.timing_accumulator import TimingAccumulator
+        from src.domain.services.request_parser_service import RequestParserService
+        from src.models.log_batch import LogBatch
+        from src.models.log_entry import LogEntry
+
+        def view(*rows: tuple[str, float | None, float | None]) -> BatchView:
+            return BatchView(
+                LogBatch.from_entries(
+                    LogEntry(
+                        "1.1.1.1",
+                        None,
+                        datetime(2025, 1, 1),
+                        f"GET {path} HTTP/1.1",
+                        200,
+                        0,
+                        "-",
+                        "A",
+                        request_time,
+                        upstream_time,
+                    )
+                    for path, request_time, upstream_time in rows
+                ),
+                RequestParserService(),
+            )
+
+        left = TimingAccumulator(capacity=2)
+        left.add_batch(
+            view(("/api", 0.1, 0.09), ("/api", 0.3, None), ("/a", None, None))
+        )
+        left.add_batch(view(("/b", 0.002, 0.001), ("/api", 0.2, 0.15)))
+        right = TimingAccumulator(capacity=2)
+        right.add_batch(view(("/api", 1.5, 1.4), ("/c", 0.01, 0.01)))
+
+        left.merge(right)
+        top = left.top(10)
+
+        assert left.request_time.count == 6
+        assert left.upstream_response_time.count == 5
+        assert len(left.stats) <= 2
+        assert top[0]["resource"] == "/api"
+        assert top[0]["totalRequestsCount"] == 4
+        assert top[0]["p50"] == pytest.approx(200, rel=0.004)
+        assert top[0]["p99.9"] == pytest.approx(300, rel=0.004)
+        summary = TimingAccumulator.summary(left.request_time)
+        assert summary["max"] == 1500
+        assert summary["mean"] == pytest.approx(2112 / 6, abs=0.001)
+
+    def test_session_accumulator(self) -> None:
+        """Сессии: таймаут неактивности, вытеснение по времени и слияние."""
+        from datetime import UTC, timedelta
+
+        from src.domain.accumulators.batch_view import BatchView
+        from src.domain.accumulators.session_accumulator import SessionAccumulator
+        from src.domain.services.request_parser_service import RequestParserService
+        from src.models.log_batch import LogBatch
+        from src.models.log_entry import LogEntry
+
+        start = datetime(2025, 1, 1, 23, 50, tzinfo=UTC)
+
+        def view(*rows: tuple[str, str, int]) -> BatchView:
+            return BatchView(
+                LogBatch.from_entries(
+                    LogEntry(
+                        addr,
+                        None,
+                        start + timedelta(minutes=minute),
+                        "GET / HTTP/1.1",
+                        200,
+                        0,
+                        "-",
+                        agent,
+                    )
+                    for addr, agent, minute in rows
+                ),
+                RequestParserService(),
+            )
+
+        sessions = SessionAccumulator(timeout=30 * 60)
+        sessions.add_batch(view(("1.1.1.1", "A", 0), ("1.1.1.1", "B", 0)))
+        sessions.add_batch(view(("1.1.1.1", "A", 20), ("2.2.2.2", "A", 25)))
+        assert len(sessions.active) == 3
+
+        # Через 60 минут клиент B и первая сессия 1.1.1.1/A вытеснены
+        sessions.add_batch(view(("1.1.1.1", "A", 60), ("1.1.1.1", "A", 55)))
+        assert set(sessions.active) == {("1.1.1.1", "A")}
+        assert sessions.durations.count == 3
+        assert sessions.peak_active == 3
+
+        later = SessionAccumulator(timeout=30 * 60)
+        later.add_batch(view(("1.1.1.1", "A", 80), ("3.3.3.3", "C", 80)))
+        summary = sessions.merge(later).summary()
+
+        assert summary["totalSessions"] == 5
+        assert summary["activeAtEnd"] == 2
+        # Сессия 1.1.1.1/A с 55-й минуты продолжена в следующей части потока
+        assert summary["durationSeconds"]["max"] == 25 * 60
+        assert summary["requestsPerSession"]["max"] == 3
+        assert summary["sessionsPerDate"] == [
+            {"date": "2025-01-01", "totalSessions": 2},
+            {"date": "2025-01-02", "totalSessions": 3},
+        ]
+        with pytest.raises(ValueError, match="таймаутом"):
+            sessions.merge(SessionAccumulator(timeout=60))
+
+        # Запрос не по порядку: в пределах таймаута до начала сессии - продлевает
+        # ее назад (вместе с датой начала), дальше - не учитывается
+        unordered = SessionAccumulator(timeout=30 * 60)
+        unordered.add_batch(view(("4.4.4.4", "D", 15)))
+        unordered.add_batch(view(("4.4.4.4", "D", 5), ("4.4.4.4", "D", -16 * 24 * 60)))
+        summary = unordered.summary()
+        assert summary["totalSessions"] == 1
+        assert summary["lateRequests"] == 1
+        assert summary["durationSeconds"]["max"] == 10 * 60
+        assert summary["requestsPerSession"]["max"] == 2
+        assert summary["sessionsPerDate"] == [
+            {"date": "2025-01-01", "totalSessions": 1}
+        ]
+
+    def test_anomaly_accumulator(self) -> None:
+        """Аномалии: всплеск запросов и доли 5xx против базы EWMA."""
+        from datetime import UTC, timedelta
+
+        from src.domain.accumulators.anomaly_accumulator import AnomalyAccumulator
+        from src.domain.accumulators.batch_view import BatchView
+        from src.domain.calculators.ewma_detector import EwmaDetector
+        from src.domain.services.request_parser_service import RequestParserService
+        from src.models.log_batch import LogBatch
+        from src.models.log_entry import LogEntry
+
+        detector = EwmaDetector(window=5, threshold=3.0, min_std=1.0)
+        assert [detector.update(value) for value in (10, 11, 10, 11, 10, 11)] == [
+            None
+        ] * 6
+        assert detector.update(30) > 3
+        assert 10 < detector.baseline < 11
+
+        start = datetime(2025, 1, 1, 12, 0, tzinfo=UTC)
+
+        def counts(minute: int) -> tuple[int, int]:
+            if minute == 40:
+                return 100, 0
+            if minute == 50:
+                return 20, 15
+            return 20 + minute % 3, minute % 2
+
+        def view(minutes: range) -> BatchView:
+            return BatchView(
+                LogBatch.from_entries(
+                    LogEntry(
+                        "1.1.1.1",
+                        None,
+                        start + timedelta(minutes=minute),
+                        "GET / HTTP/1.1",
+                        500 if index < counts(minute)[1] else 200,
+                        0,
+                        "-",
+                        "A",
+                    )
+                    for minute in minutes
+                    for index in range(counts(minute)[0])
+                ),
+                RequestParserService(),
+            )
+
+        anomalies = AnomalyAccumulator(window=10)
+        for first in range(0, 60, 10):
+            anomalies.add_batch(view(range(first, first + 10)))
+        # Открыты только последние минуты в пределах lateness
+        assert len(anomalies.pending) == AnomalyAccumulator.lateness
+        anomalies.add_batch(view(range(3, 4)))
+
+        summary = anomalies.summary()
+        assert summary["lateRequests"] == 20
+        assert [
+            (item["series"], item["direction"], item["start"], item["minutes"])
+            for item in summary["intervals"]
+        ] == [
+            ("requests", "high", "2025-01-01T12:40:00", 1),
+            ("errorRate", "high", "2025-01-01T12:50:00", 1),
+        ]
+        assert summary["intervals"][1]["peakValue"] == 0.75
+        # summary не закрывает открытые минуты
+        assert len(anomalies.pending) == AnomalyAccumulator.lateness
+
+        later = AnomalyAccumulator(window=10)
+        earlier = AnomalyAccumulator(window=10)
+        earlier.add_batch(view(range(30)))
+        later.add_batch(view(range(30, 60)))
+        merged = earlier.merge(later).summary()
+        assert [item["start"] for item in merged["intervals"]] == [
+            "2025-01-01T12:40:00",
+            "2025-01-01T12:50:00",
+        ]
+        with pytest.raises(ValueError, match="окном"):
+            anomalies.merge(AnomalyAccumulator(window=5))
+
+    def test_windowed_top_accumulator(self) -> None:
+        """Топ ресурсов по окнам: закрытие окон, опоздавшие строки и слияние."""
+        from datetime import UTC, timedelta
+
+        from src.domain.accumulators.batch_view import BatchView
+        from src.domain.accumulators.windowed_top_accumulator import (
+            WindowedTopAccumulator,
+        )
+        from src.domain.services.request_parser_service import RequestParserService
+        from src.models.log_batch import LogBatch
+        from src.models.log_entry import LogEntry
+
+        start = datetime(2025, 1, 1, 12, 0, tzinfo=UTC)
+
+        def view(*rows: tuple[int, str]) -> BatchView:
+            return BatchView(
+                LogBatch.from_entries(
+                    LogEntry(
+                        "1.1.1.1",
+                        None,
+                        start + timedelta(minutes=minute),
+                        f"GET {resource} HTTP/1.1",
+                        200,
+                        0,
+                        "-",
+                        "A",
+                    )
+                    for minute, resource in rows
+                ),
+                RequestParserService(),
+            )
+
+        windows = WindowedTopAccumulator(window=600, capacity=3, top_size=2)
+        # Всплеск /hot только в первом окне
+        windows.add_batch(view(*[(1, "/hot")] * 5, (2, "/a"), (3, "/b"), (4, "/c")))
+        windows.add_batch(view((9, "/a"), (12, "/a"), (13, "/b")))
+        assert len(windows.open) == 2
+
+        # Через 5 минут после конца первое окно сжимается до top_size ключей
+        windows.add_batch(view((15, "/a"), (15, "/a")))
+        assert len(windows.open) == 1
+        assert len(next(iter(windows.closed.values()))) == 2
+
+        windows.add_batch(view((5, "/late")))
+        assert windows.late_requests == 1
+
+        later = WindowedTopAccumulator(window=600, capacity=3, top_size=2)
+        later.add_batch(view((19, "/a"), (25, "/d"), (40, "/d")))
+        summary = windows.merge(later).summary()
+
+        assert [window["start"] for window in summary] == [
+            "2025-01-01T12:00:00",
+            "2025-01-01T12:10:00",
+            "2025-01-01T12:20:00",
+            "2025-01-01T12:40:00",
+        ]
+        assert summary[0]["totalRequestsCount"] == 9
+        assert summary[0]["resources"][0] == {
+            "resource": "/hot",
+            "totalRequestsCount": 5,
+            "error": 0,
+        }
+        assert summary[1]["totalRequestsCount"] == 5
+        assert summary[1]["resources"][0]["resource"] == "/a"
+        assert summary[1]["resources"][0]["totalRequestsCount"] == 4
+        with pytest.raises(ValueError, match="окном"):
+            windows.merge(WindowedTopAccumulator(window=60))
+
+    def test_ip_network_index(self, tmp_path) -> None:
+        """Справочник сетей: CSV, бинарный кэш, поиск и измерения asn/country."""
+        from src.domain.accumulators.batch_view import BatchView
+        from src.domain.services.ip_network_index import IpNetworkIndex
+        from src.domain.services.request_parser_service import RequestParserService
+        from src.models.log_batch import LogBatch
+        from src.models.log_entry import LogEntry
+
+        csv_path = tmp_path / "networks.csv"
+        csv_path.write_text(
+            "network,asn,country\n"
+            "# комментарий\n"
+            "10.0.0.0/24,AS64500,us\n"
+            "10.0.1.0/24,64500,US\n"
+            "192.168.0.0,192.168.0.255,64501,de\n"
+            "2001:db8::/32,64502,nl\n"
+        )
+
+        index = IpNetworkIndex.load(csv_path)
+        assert len(index) == 3  # соседние сети AS64500 склеены
+        assert IpNetworkIndex.cache_path(csv_path).is_file()
+        cached = IpNetworkIndex.load(csv_path)
+        for address, label in (
+            ("10.0.1.255", ("AS64500", "US")),
+            ("10.0.2.0", None),
+            ("192.168.0.9", ("AS64501", "DE")),
+            ("2001:db8:ffff::1", ("AS64502", "NL")),
+            ("::ffff:10.0.0.1", ("AS64500", "US")),
+            ("unknown", None),
+        ):
+            assert index.lookup(address) == label
+            assert cached.lookup(address) == label
+
+        IpNetworkIndex.cache_path(csv_path).write_bytes(b"broken")
+        assert len(IpNetworkIndex.load(csv_path)) == 3
+
+        overlapping = tmp_path / "overlapping.csv"
+        overlapping.write_text("10.0.0.0/8,1,US\n10.1.0.0/16,2,DE\n")
+        with pytest.raises(ValueError, match="пересекаются"):
+            IpNetworkIndex.from_csv(overlapping)
+        broken = tmp_path / "broken.csv"
+        broken.write_text("10.0.0.0/8,1,US\nnot-a-network,2,DE\n")
+        with pytest.raises(ValueError, match="строка справочника сетей 2"):
+            IpNetworkIndex.from_csv(broken)
+
+        batch = LogBatch.from_entries(
+            LogEntry(
+                address, None, datetime(2025, 1, 1), "GET / HTTP/1.1", 200, 1, "-", "A"
+            )
+            for address in ("10.0.0.1", "8.8.8.8")
+        )
+        view = BatchView(batch, RequestParserService(), ip_index=index)
+        assert view.column("asn") == ["AS64500", "(unknown)"]
+        assert view.column("country") == ["US", "(unknown)"]
+        with pytest.raises(ValueError, match="--ip-db"):
+            BatchView(batch, RequestParserService()).column("asn")
+
+    def test_time_parser_service(self) -> None:
+        """Тест быстрого разбора времени NGINX."""
+        import pytest
+
+        from src.domain.services.time_parser_service import TimeParserService
+
+        assert TimeParserService.to_epoch("01/Jan/1970:00:01:00 +0300") == 60
+        assert TimeParserService.to_epoch(
+            "17/May/2015:08:05:32 +0000"
+        ) == TimeParserService.datetime_to_epoch(datetime(2015, 5, 17, 8, 5, 32))
+
+        with pytest.raises(ValueError):
+            TimeParserService.to_epoch("17/Foo/2015:08:05:32 +0000")
+
+    def test_time_index_service(self, tmp_path) -> None:
+        """Тест построения, сохранения и валидации индекса времени."""
+        import os
+
+        from src.domain.services.time_index_service import TimeIndexService
+
+        lines = [
+            '1.1.1.1 - - [17/May/2015:08:05:32 +0000] "GET /a HTTP/1.1" 200 1 "-" "A"',
+            '1.1.1.1 - - [17/May/2015:08:05:10 +0000] "GET /a HTTP/1.1" 200 1 "-" "A"',
+            "INVALID",
+            '1.1.1.1 - - [17/May/2015:08:07:00 +0000] "GET /b HTTP/1.1" 200 1 "-" "A"',
+            '1.1.1.1 - - [18/May/2015:00:00:00 +0000] "GET /c HTTP/1.1" 200 1 "-" "A"',
+        ]
+        log_path = tmp_path / "access.log"
+        log_path.write_text("\n".join(lines) + "\n")
+
+        service = TimeIndexService()
+        written = service.write_indexes(str(log_path))
+        assert written == [tmp_path / "access.log.idx"]
+
+        index = service.load(log_path)
+        assert index is not None
+        assert [segment.line_count for segment in index.segments] == [3, 1, 1]
+        assert index.segments[0].offset == 0
+        assert index.segments[0].max_time - index.segments[0].min_time == 22
+        assert sum(s.length for s in index.segments) == log_path.stat().st_size
+
+        # Изменение файла делает индекс недействительным
+        with log_path.open("a") as file:
+            file.write("tail\n")
+        os.utime(log_path, ns=(0, 0))
+        assert service.load(log_path) is None
+
+    def test_local_reader_uses_time_index(self, tmp_path) -> None:
+        """Тест чтения только нужных участков файла по индексу."""
+        from src.core.implementations.readers.file_reader import LocalFileReader
+        from src.domain.services.date_filter_service import DateFilterService
+        from src.domain.services.time_index_service import TimeIndexService
+
+        lines = [
+            '1.1.1.1 - - [17/May/2015:08:05:32 +0000] "GET /a HTTP/1.1" 200 1 "-" "A"',
+            '1.1.1.1 - - [18/May/2015:08:05:32 +0000] "GET /b HTTP/1.1" 200 1 "-" "A"',
+            '1.1.1.1 - - [19/May/2015:08:05:32 +0000] "GET /c HTTP/1.1" 200 1 "-" "A"',
+        ]
+        log_path = tmp_path / "access.log"
+        log_path.write_text("\n".join(lines) + "\n")
+        TimeIndexService().write_indexes(str(log_path))
+
+        time_range = DateFilterService.resolve_epoch_bounds("2015-05-18", "2015-05-18")
+        reader = LocalFileReader(time_range=time_range)
+        assert list(reader.read_files(str(log_path))) == [lines[1]]
+
+        # Файл вне диапазона пропускается целиком
+        time_range = DateFilterService.resolve_epoch_bounds("2016-01-01", None)
+        reader = LocalFileReader(time_range=time_range)
+        assert list(reader.read_files(str(log_path))) == []
+
+        # Без диапазона файл читается полностью
+        assert list(LocalFileReader().read_files(str(log_path))) == lines
+
+    def test_line_filter_service(self) -> None:
+        """Тест цепочки предикатов над сырыми строками."""
+        import pytest
+
+        from src.domain.services.line_filter_service import LineFilterService
+
+        lines = [
+            '10.0.0.5 - - [17/May/2015:08:05:32 +0000] "GET /api/users HTTP/1.1" 503 10 "-" "A"',
+            '10.0.1.5 - - [17/May/2015:08:05:33 +0000] "POST /api/users HTTP/1.1" 500 10 "-" "A"',
+            '10.0.0.6 - - [17/May/2015:08:05:34 +0000] "GET /static/a.css HTTP/1.1" 200 10 "-" "A"',
+            "INVALID LINE",
+        ]
+
+        predicate = LineFilterService.compile(statuses=["5xx"])
+        assert [predicate(line) for line in lines] == [True, True, False, False]
+
+        predicate = LineFilterService.compile(
+            statuses=["5xx", "200"],
+            path_prefixes=["/api/"],
+            networks=["10.0.0.0/24"],
+            methods=["get"],
+        )
+        assert [predicate(line) for line in lines] == [True, False, False, False]
+
+        assert LineFilterService.compile() is None
+
+        with pytest.raises(ValueError):
+            LineFilterService.compile(statuses=["5x"])
+        with pytest.raises(ValueError):
+            LineFilterService.compile(networks=["10.0.0.0/33"])
+        with pytest.raises(ValueError):
+            LineFilterService.compile(path_prefixes=["api"])
+
+    def test_malformed_line_reporter(self, caplog, tmp_path) -> None:
+        """Тест агрегированного учета некорректных строк."""
+        import logging
+
+        from src.domain.services.malformed_line_reporter import MalformedLineReporter
+
+        quarantine = tmp_path / "bad.log"
+        reporter = MalformedLineReporter(max_examples=2, quarantine_path=quarantine)
+        reporter.flush_threshold = 3
+
+        with caplog.at_level(logging.WARNING):
+            for i in range(5):
+                reporter.record(f"BAD {i}", "format_mismatch")
+            reporter.record("BAD TIME", "invalid_time")
+            reporter.finish()
+
+        # Только 2 примера + итоговая сводка
+        assert len(caplog.records) == 3
+        assert reporter.total == 6
+        assert reporter.summary() == {
+            "totalLinesCount": 6,
+            "reasons": [
+                {"reason": "format_mismatch", "totalLinesCount": 5},
+                {"reason": "invalid_time", "totalLinesCount": 1},
+            ],
+        }
+        assert quarantine.read_text().splitlines() == [
+            "BAD 0",
+            "BAD 1",
+            "BAD 2",
+            "BAD 3",
+            "BAD 4",
+            "BAD TIME",
+        ]
+
+        assert MalformedLineReporter().summary() == {}
+
+    def test_parse_batch(self) -> None:
+        """Тест пакетного парсинга с маской валидности."""
+        from src.core.implementations.parsers.log_parser import NginxLogParser
+
+        parser = NginxLogParser()
+        lines = [
+            '93.180.71.3 - - [17/May/2015:08:05:32 +0000] "GET /a HTTP/1.1" 200 100 "-" "Agent"',
+            "INVALID LINE",
+            "",
+            '93.180.71.3 - bob [17/Foo/2015:08:05:32 +0000] "GET /b HTTP/1.1" 200 1 "-" "Agent"',
+            '80.91.33.133 - bob [17/May/2015:08:05:33 +0000] "POST /c HTTP/2.0" 404 0 "-" "Agent"',
+        ]
+
+        batch = parser.parse_batch(lines)
+
+        assert len(batch) == 2
+        assert list(batch.valid) == [1, 0, 0, 0, 1]
+        assert batch.status == [200, 404]
+        assert batch.remote_user == [None, "bob"]
+        assert batch.to_entries() == parser.parse_lines(iter(lines))
+        assert parser.malformed_reporter.reasons == {
+            "format_mismatch": 2,
+            "invalid_time": 2,
+        }
+
+        batches = list(parser.parse_batches(iter(lines), batch_size=2))
+        assert [len(b) for b in batches] == [1, 0, 1]
+
+    def test_json_parse_batch(self) -> None:
+        """Тест парсинга JSON-логов с сопоставлением ключей."""
+        from src.core.implementations.parsers.json_log_parser import NginxJsonLogParser
+
+        key_map = NginxJsonLogParser.parse_key_map("status=code, remote_addr=ip")
+        parser = NginxJsonLogParser(key_map=key_map)
+        lines = [
+            (
+                '{"time_local":"17/May/2015:08:05:32 +0000","ip":"1.1.1.1",'
+                '"remote_user":"","request":"GET /a HTTP/1.1","code":"200",'
+                '"body_bytes_sent":"100","http_referer":"",'
+                '"http_user_agent":"Agent \\"x\\""}'
+            ),
+            (
+                '{"time_local":"2015-05-17T08:05:33+00:00","ip":"2.2.2.2",'
+                '"remote_user":"bob","request":"POST /b HTTP/2.0","code":404}'
+            ),
+            '{"time_local":"17/May/2015:08:05:34 +0000","ip":"3.3.3.3","request":"GET /c"}',
+            '{"time_local":"17/May/2015:08:05:34 +0000","ip":"3.3.3.3",',
+            '{"time_local":"bad","ip":"3.3.3.3","request":"GET /c","code":"200"}',
+            "",
+        ]
+
+        batch = parser.parse_batch(lines)
+
+        assert list(batch.valid) == [1, 1, 0, 0, 0, 0]
+        assert batch.remote_addr == ["1.1.1.1", "2.2.2.2"]
+        assert batch.remote_user == [None, "bob"]
+        assert batch.status == [200, 404]
+        assert batch.body_bytes_sent == [100, 0]
+        assert batch.http_referer == ["-", "-"]
+        assert batch.http_user_agent == ['Agent "x"', "-"]
+        assert batch.time_local[0].utcoffset() == batch.time_local[1].utcoffset()
+        assert batch.to_entries() == parser.parse_lines(iter(lines))
+        assert parser.parse_line(lines[0]) == batch.to_entries()[0]
+        assert parser.malformed_reporter.reasons == {
+            "missing_field": 2,
+            "invalid_json": 2,
+            "invalid_time": 2,
+        }
+
+        with pytest.raises(ValueError, match="Неизвестное поле"):
+            NginxJsonLogParser.parse_key_map("size=bytes")
+
+    def test_timed_and_template_parse_batch(self) -> None:
+        """Тайминги combined_timing и разбор по строке log_format."""
+        from src.core.implementations.parsers.template_log_parser import (
+            NginxTemplateLogParser,
+        )
+        from src.core.implementations.parsers.timed_log_parser import (
+            NginxTimedLogParser,
+        )
+
+        prefix = (
+            '1.1.1.1 - - [17/May/2015:08:05:32 +0000] "GET /a HTTP/1.1" 200 10 "-" "A"'
+        )
+        bad_date = prefix.replace("17/May/2015", "17/Foo/2015")
+        timed_lines = [
+            f"{prefix} 0.012 0.010, 0.002 : -",
+            f"{bad_date} 0.500 0.400",
+            f"{prefix} - -",
+        ]
+        timed_parser = NginxTimedLogParser()
+        timed = timed_parser.parse_batch(timed_lines)
+        assert list(timed.valid) == [1, 0, 1]
+        # Тайминги строки с некорректным временем не сдвигают колонки
+        assert timed.request_time == [0.012, None]
+        assert timed.upstream_response_time == [pytest.approx(0.012), None]
+        assert timed.to_entries() == timed_parser.parse_lines(iter(timed_lines))
+
+        template = (
+            '$remote_addr [$time_iso8601] "$request" $status $body_bytes_sent '
+            'host=$host rt=$request_time urt="$upstream_response_time"'
+        )
+        parser = NginxTemplateLogParser(template)
+        lines = [
+            (
+                '2.2.2.2 [2015-05-17T08:05:32+00:00] "GET /b HTTP/1.1" 404 5 '
+                'host=example.com rt=0.250 urt="0.200"'
+            ),
+            (
+                '2.2.2.2 [2015-05-17T08:05:33+00:00] "GET /b HTTP/1.1" 200 5 '
+                'host=example.com rt=- urt="-"'
+            ),
+            f"{prefix} 0.012 0.010",
+        ]
+
+        batch = parser.parse_batch(lines)
+
+        assert list(batch.valid) == [1, 1, 0]
+        assert batch.status == [404, 200]
+        assert batch.remote_user == [None, None]
+        assert batch.http_user_agent == ["-", "-"]
+        assert batch.request_time == [0.25, None]
+        assert batch.upstream_response_time == [0.2, None]
+        assert batch.to_entries() == parser.parse_lines(iter(lines))
+        assert parser.malformed_reporter.reasons == {"format_mismatch": 2}
+
+        with pytest.raises(ValueError, match=r"\$request, \$status"):
+            NginxTemplateLogParser("$remote_addr [$time_local]")
+
+    def test_bot_classifier(self) -> None:
+        """Боты: одно выражение по сигнатурам, кэш вердиктов и фильтр пакетов."""
+        from src.domain.accumulators.batch_view import BatchView
+        from src.domain.services.bot_classifier import BotClassifier
+        from src.domain.services.request_parser_service import RequestParserService
+        from src.models.log_batch import LogBatch
+        from src.models.log_entry import LogEntry
+
+        classifier = BotClassifier(("^internal-monitor",))
+        chrome = (
+            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+        )
+        googlebot = (
+            "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)"
+        )
+
+        assert classifier.classify(chrome) == "human"
+        assert classifier.classify(googlebot) == "bot"
+        assert classifier.classify("curl/8.4.0") == "bot"
+        assert classifier.classify("Internal-Monitor/1.0") == "bot"
+        assert classifier.classify("-") == "bot"
+        assert BotClassifier.default().classify("Internal-Monitor/1.0") == "human"
+
+        batch = LogBatch.from_entries(
+            LogEntry(
+                "1.1.1.1",
+                None,
+                datetime(2025, 1, 1),
+                "GET / HTTP/1.1",
+                200,
+                0,
+                "-",
+                agent,
+            )
+            for agent in (chrome, googlebot, chrome)
+        )
+        view = BatchView(batch, RequestParserService(), bot_classifier=classifier)
+        assert view.column("client_type") == ["human", "bot", "human"]
+        assert classifier.classify.cache_info().currsize == 5
+
+        (humans,) = classifier.filter_batches(iter([batch]), "human")
+        assert humans.http_user_agent == [chrome, chrome]
+
+        with pytest.raises(ValueError, match="сигнатуры"):
+            BotClassifier.parse_signatures(["(unclosed"])
+
+    def test_row_filters_match_line_filters(self) -> None:
+        """Тест эквивалентности фильтров по колонкам и по сырым строкам."""
+        from src.core.implementations.parsers.log_parser import NginxLogParser
+        from src.domain.services.line_filter_service import LineFilterService
+
+        lines = [
+            '10.0.0.1 - - [17/May/2015:08:05:32 +0000] "GET /api/a HTTP/1.1" 200 1 "-" "A"',
+            '10.0.0.2 - - [17/May/2015:08:05:32 +0000] "POST /api/b HTTP/1.1" 500 1 "-" "A"',
+            '10.0.1.1 - - [17/May/2015:08:05:32 +0000] "GET /static/c HTTP/1.1" 404 1 "-" "A"',
+            '10.0.0.3 - - [17/May/2015:08:05:32 +0000] "GET /api/d HTTP/1.1" 503 1 "-" "A"',
+        ]
+        filters = {
+            "statuses": ["5xx", "200"],
+            "path_prefixes": ["/api/"],
+            "networks": ["10.0.0.0/24"],
+            "methods": ["GET"],
+        }
+        parser = NginxLogParser()
+
+        expected = parser.parse_batch(
+            list(
+                LineFilterService.filter_lines(
+                    iter(lines), LineFilterService.compile(**filters)
+                )
+            )
+        )
+        (actual,) = LineFilterService.filter_batches(
+            iter([parser.parse_batch(lines)]), LineFilterService.compile_rows(**filters)
+        )
+
+        assert (
+            actual.request
+            == expected.request
+            == ["GET /api/a HTTP/1.1", "GET /api/d HTTP/1.1"]
+        )
+        assert LineFilterService.compile_rows() is None
+
+    def test_string_interner(self) -> None:
+        """Тест общих экземпляров строк и политик переполнения."""
+        from src.core.implementations.parsers.log_parser import NginxLogParser
+        from src.domain.services.string_interner import StringInterner
+        from src.models.log_batch import LogBatch
+
+        line = '10.0.0.1 - - [17/May/2015:08:05:32 +0000] "GET /a HTTP/1.1" 200 1 "-" "Agent"'
+        parser = NginxLogParser(interner=StringInterner(max_size=2))
+        (batch,) = parser.parse_batches(iter([line, line, line]))
+
+        assert batch.request[0] is batch.request[1] is batch.request[2]
+        assert batch.http_user_agent[0] is batch.http_user_agent[2]
+        assert parser.interner.sizes()["request"] == 1
+
+        frozen = StringInterner(max_size=1, fields=("request",))
+        frozen.intern_batch(LogBatch(request=["a", "b"]))
+        frozen.intern_batch(LogBatch(request=["c"]))
+        assert frozen.sizes() == {"request": 2}
+        assert frozen.intern("request", "c") == "c"
+
+        reset = StringInterner(max_size=1, overflow="reset", fields=("request",))
+        reset.intern_batch(LogBatch(request=["a", "b"]))
+        reset.intern_batch(LogBatch(request=["c"]))
+        assert reset.sizes() == {"request": 1}
+        assert reset.resets == 1
+
+        with pytest.raises(ValueError, match="политика"):
+            StringInterner(overflow="lru")
+
+    def test_compact_log_entry(self, sample_log_file) -> None:
+        """Тест компактной записи: те же атрибуты и та же статистика."""
+        from dataclasses import replace
+
+        from src.core.implementations.calculators.nginx_statistics_calculator import (
+            NginxStatisticsCalculator,
+        )
+        from src.core.implementations.parsers.log_parser import NginxLogParser
+        from src.core.implementations.readers.file_reader import LocalFileReader
+        from src.domain.services.date_filter_service import DateFilterService
+        from src.models.compact_log_entry import CompactLogEntry
+
+        lines = list(LocalFileReader().read_files(sample_log_file))
+        (batch,) = NginxLogParser().parse_batches(iter(lines))
+        entries = batch.to_entries()
+        compact = batch.to_compact_entries()
+
+        assert [entry.to_entry() for entry in compact] == entries
+        assert compact[0] == CompactLogEntry.from_entry(entries[0])
+        assert compact[0].time_epoch == 1431849932
+        assert compact[0].time_offset == 0
+        assert not hasattr(compact[0], "__dict__")
+
+        calculator = NginxStatisticsCalculator()
+        assert calculator.calculate(compact) == calculator.calculate(entries)
+        assert len(
+            DateFilterService.filter_entries(compact, "2015-05-17", None)
+        ) == len(compact)
+
+        naive = CompactLogEntry.from_entry(
+            replace(entries[0], time_local=datetime(2025, 1, 1))
+        )
+        assert naive.time_offset is None
+        assert naive.time_local == datetime(2025, 1, 1)
+
+    def test_calculate_batches_matches_calculate(self, sample_log_file) -> None:
+        """Тест эквивалентности пакетного и поэлементного расчета."""
+        from src.core.implementations.calculators.nginx_statistics_calculator import (
+            NginxStatisticsCalculator,
+        )
+        from src.core.implementations.parsers.log_parser import NginxLogParser
+        from src.core.implementations.readers.file_reader import LocalFileReader
+
+        lines = list(LocalFileReader().read_files(sample_log_file))
+        parser = NginxLogParser()
+        calculator = NginxStatisticsCalculator()
+
+        expected = calculator.calculate(parser.parse_lines(iter(lines)))
+        actual = calculator.calculate_batches(
+            parser.parse_batches(iter(lines), batch_size=1)
+        )
+
+        assert actual == expected
+        assert calculator.calculate_batches([]) == calculator.calculate([])
+
+    def test_empty_stats_follow_selected_metrics(self, sample_log_file) -> None:
+        """Тест: пустой отчет содержит те же разделы, что и непустой."""
+        from src.core.abstractions.metrics import MetricOptions
+        from src.core.implementations.calculators.nginx_statistics_calculator import (
+            NginxStatisticsCalculator,
+        )
+        from src.core.implementations.parsers.log_parser import NginxLogParser
+        from src.core.implementations.readers.file_reader import LocalFileReader
+
+        lines = list(LocalFileReader().read_files(sample_log_file))
+        calculator = NginxStatisticsCalculator(
+            options=MetricOptions(time_series_granularity="hour"),
+            metrics=("codes", "dates"),
+        )
+
+        empty = calculator.calculate([])
+        full = calculator.calculate(NginxLogParser().parse_lines(iter(lines)))
+
+        assert empty.keys() == full.keys()
+        assert empty == {
+            "totalRequestsCount": 0,
+            "responseCodes": [],
+            "requestsPerDate": [],
+            "timeSeries": {"granularity": "hour", "bucketSeconds": 3600, "buckets": []},
+        }
+        assert calculator.calculate_batches([]) == empty